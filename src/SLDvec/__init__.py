@@ -1,11 +1,18 @@
 from .constant import (
+    CURVE_FITTING_CORNER_ANGLE,
     CURVE_FITTING_ERROR_CONSTANT,
+    CURVE_FITTING_MAX_ERROR,
+    CURVE_FITTING_N_WORKERS,
+    DECIMATION_MAX_SEGMENT_LENGTH,
     MODEL_NAME,
     MODEL_NUM_CLASSES,
     MODEL_PATH,
+    MODEL_PREDICTIONS_BATCH_SIZE,
     MODEL_PREDICTIONS_N_AUGMENTATIONS,
     NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION,
     SAMPLE_RATE_MEDIAL_AXIS_COMPUTATION,
+    SVG_PRECISION,
+    VANISHING_ANGLE_N_THREADS,
     VANISHING_ANGLE_THRESHOLD_MULTIPLE,
     VANISHING_ANGLE_THRESHOLD_SINGLE,
 )
@@ -17,9 +24,16 @@ __all__ = [
     "MODEL_NUM_CLASSES",
     "MODEL_PATH",
     "MODEL_PREDICTIONS_N_AUGMENTATIONS",
+    "MODEL_PREDICTIONS_BATCH_SIZE",
     "NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION",
+    "DECIMATION_MAX_SEGMENT_LENGTH",
     "SAMPLE_RATE_MEDIAL_AXIS_COMPUTATION",
     "VANISHING_ANGLE_THRESHOLD_SINGLE",
     "VANISHING_ANGLE_THRESHOLD_MULTIPLE",
+    "VANISHING_ANGLE_N_THREADS",
     "CURVE_FITTING_ERROR_CONSTANT",
+    "CURVE_FITTING_MAX_ERROR",
+    "CURVE_FITTING_CORNER_ANGLE",
+    "CURVE_FITTING_N_WORKERS",
+    "SVG_PRECISION",
 ]
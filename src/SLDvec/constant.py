@@ -10,12 +10,20 @@ def get_asset_path(asset_name: str) -> str:
 SAMPLE_RATE_MEDIAL_AXIS_COMPUTATION = 2
 VANISHING_ANGLE_THRESHOLD_SINGLE = 0.95  # Correspond to an angle of 0.95 * 90 = 85.5 degrees
 VANISHING_ANGLE_THRESHOLD_MULTIPLE = 0.90  # Correspond to an angle of 0.90 * 90 = 81 degrees
+VANISHING_ANGLE_N_THREADS = 0  # Threads used for the connected components, 0 for one per core
 NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION = SAMPLE_RATE_MEDIAL_AXIS_COMPUTATION * 10
+DECIMATION_MAX_SEGMENT_LENGTH = 2.5  # Longest edge left by the optional medial axis decimation
 
 
 MODEL_PATH = get_asset_path("model.pth")
 MODEL_NAME = "resnet50"
 MODEL_NUM_CLASSES = 2
 MODEL_PREDICTIONS_N_AUGMENTATIONS = 16
+MODEL_PREDICTIONS_BATCH_SIZE = 64  # Number of images (crops and augmentations) per forward pass
 
 CURVE_FITTING_ERROR_CONSTANT = 1 / 1000
+CURVE_FITTING_MAX_ERROR = 0.5  # Maximum distance to the points of the "schneider" fitter, in pixels
+CURVE_FITTING_CORNER_ANGLE = 60  # Minimum change of direction at a corner, in degrees
+CURVE_FITTING_N_WORKERS = 1  # Workers fitting the strokes, 1 to fit them sequentially
+
+SVG_PRECISION = 2  # Number of decimals of the coordinates written in the SVG files
@@ -1,6 +1,19 @@
+from typing import Optional, Tuple
+
 import numpy as np
 from numba import jit
 
+# Bernstein basis of a cubic bezier curve and of its first and second derivatives, written as
+# matrices M such that B(t) = [1, t, t^2, t^3] @ M @ [P1, P2, P3, P4]
+_BERNSTEIN_MATRICES = (
+    np.array([[1, 0, 0, 0], [-3, 3, 0, 0], [3, -6, 3, 0], [-1, 3, -3, 1]], dtype=float),
+    np.array([[-3, 3, 0, 0], [6, -12, 6, 0], [-3, 9, -9, 3], [0, 0, 0, 0]], dtype=float),
+    np.array([[6, -12, 6, 0], [-6, 18, -18, 6], [0, 0, 0, 0], [0, 0, 0, 0]], dtype=float),
+)
+
+# Gauss-Legendre quadrature used to integrate the speed of the curves over each table interval
+_GAUSS_NODES, _GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(5)
+
 
 @jit(nopython=True)
 def _eval(t, P1, P2, P3, P4):
@@ -14,36 +27,100 @@ def _eval_prime(t, P1, P2, P3, P4):
     return 3 * (1 - t) ** 2 * (P2 - P1) + 6 * (1 - t) * t * (P3 - P2) + 3 * t**2 * (P4 - P3)
 
 
-@jit(nopython=True)
-def _compute_arc_length(pos):
-    diff = pos[1:] - pos[:-1]
-    distances = np.sqrt(np.sum(diff**2, axis=1))
-    arc_length = np.cumsum(distances)
-    return arc_length
-
-
-@jit(nopython=True)
-def precompute_arc_length_bezier(P1, P2, P3, P4, n=10000):
-    t = np.linspace(0, 1, n)
-    pos = _eval(t, P1, P2, P3, P4)
-
-    temporal = t
-    arc_length = np.zeros(len(t))
-    arc_length[1:] = _compute_arc_length(pos)
+def eval_segments(control_points: np.array, idx: np.array, t: np.array, order: int) -> np.array:
+    """Evaluate a series of bezier curves (or their derivatives) at local parameters.
+    Each sample gathers the control points of its own segment, so that all samples are evaluated
+    at once whatever the number of segments.
+
+    Args:
+        control_points (np.array): The control points of the curves, of shape (n, 4, 2).
+        idx (np.array): The index of the segment of each sample, of shape (m,).
+        t (np.array): The parameter of each sample in its segment, between 0 and 1, of shape (m,).
+        order (int): The order of the derivative to evaluate (0, 1 or 2).
+
+    Returns:
+        np.array: The evaluated points, of shape (m, 2).
+    """
+    powers = t[:, None] ** np.arange(4)
+    weights = powers @ _BERNSTEIN_MATRICES[order]
+    return np.einsum("mk,mkd->md", weights, control_points[idx])
+
+
+def arc_length_table(
+    control_points: np.array, n: Optional[int] = None, tol: float = 1e-4, max_step: float = 1.0
+) -> Tuple[np.array, np.array]:
+    """Compute the table mapping the parameter of a series of bezier curves to their arc length.
+    Each curve is split in intervals of equal parameter length, whose arc length is integrated
+    with a Gauss-Legendre quadrature.
+
+    If n is None, the number of intervals adapts to each curve: it is chosen so that the distance
+    between the curve and the chords of the intervals stays below tol, using the bound
+    |B''| <= 6 * max|P(i) - 2 P(i+1) + P(i+2)|, and so that no interval is longer than max_step.
+
+    Args:
+        control_points (np.array): The control points of the curves, of shape (n_curves, 4, 2).
+        n (Optional[int], optional): If set, the fixed number of samples per curve (n - 1
+            intervals). Defaults to None.
+        tol (float, optional): The maximum distance between a curve and its chords. Defaults to
+            1e-4.
+        max_step (float, optional): The maximum arc length of an interval. Defaults to 1.0.
+
+    Returns:
+        Tuple[np.array, np.array]: The parameters of the table, normalized between 0 and 1 over
+            all curves, and the corresponding arc lengths.
+    """
+    n_curves = len(control_points)
+    if n is None:
+        polygon_length = np.linalg.norm(np.diff(control_points, axis=1), axis=2).sum(axis=1)
+        second_difference = np.linalg.norm(
+            control_points[:, :-2] - 2 * control_points[:, 1:-1] + control_points[:, 2:], axis=2
+        ).max(axis=1)
+        n_intervals = np.maximum(
+            np.ceil(np.sqrt(0.75 * second_difference / tol)), np.ceil(polygon_length / max_step)
+        )
+        n_intervals = np.maximum(n_intervals, 1).astype(int)
+    else:
+        n_intervals = np.full(n_curves, max(n - 1, 1))
+
+    # Start and end parameter of each interval, in the coordinates of its curve
+    curve_idx = np.repeat(np.arange(n_curves), n_intervals)
+    interval_idx = np.arange(len(curve_idx)) - np.repeat(
+        np.cumsum(n_intervals) - n_intervals, n_intervals
+    )
+    step = 1 / n_intervals[curve_idx]
+    start = interval_idx * step
+    end = (interval_idx + 1) * step
+
+    # Integrate the speed of the curve over each interval
+    t = start[:, None] + step[:, None] * (_GAUSS_NODES[None, :] + 1) / 2
+    speed = np.linalg.norm(
+        eval_segments(control_points, np.repeat(curve_idx, len(_GAUSS_NODES)), t.reshape(-1), 1),
+        axis=1,
+    ).reshape(t.shape)
+    interval_length = step / 2 * (speed @ _GAUSS_WEIGHTS)
+
+    arc_length = np.zeros(len(curve_idx) + 1)
+    arc_length[1:] = np.cumsum(interval_length)
+    temporal = np.zeros(len(curve_idx) + 1)
+    temporal[1:] = (curve_idx + end) / n_curves
     return temporal, arc_length
 
 
 class CubicBezier:
-    def __init__(self, P1, P2, P3, P4, n=10000):
+    def __init__(self, P1, P2, P3, P4, n=None):
         self.P1 = np.array(P1).reshape(1, -1)
         self.P2 = np.array(P2).reshape(1, -1)
         self.P3 = np.array(P3).reshape(1, -1)
         self.P4 = np.array(P4).reshape(1, -1)
 
-        self.precompute_arc_length_parameterization(n)
+        # The arc length parameterization is only computed when first needed
+        self._n = n
+        self._temporal = None
+        self._arc_length = None
+        self._normalized_arc_length = None
 
     @classmethod
-    def from_list(cls, l, n=10000):
+    def from_list(cls, l, n=None):
         return cls(l[0], l[1], l[2], l[3], n=n)
 
     def eval(self, t):
@@ -66,13 +143,27 @@ class CubicBezier:
             prime, axis=1
         ) ** 3
 
-    def precompute_arc_length_parameterization(self, n=10000):
-        self.temporal, self.arc_length = precompute_arc_length_bezier(
-            self.P1, self.P2, self.P3, self.P4, n
-        )
+    def precompute_arc_length_parameterization(self, n=None):
+        control_points = np.concatenate([self.P1, self.P2, self.P3, self.P4])[None].astype(float)
+        self._temporal, self._arc_length = arc_length_table(control_points, n)
+        self._normalized_arc_length = self._arc_length / self._arc_length[-1]
+
+    @property
+    def temporal(self):
+        if self._temporal is None:
+            self.precompute_arc_length_parameterization(self._n)
+        return self._temporal
+
+    @property
+    def arc_length(self):
+        if self._arc_length is None:
+            self.precompute_arc_length_parameterization(self._n)
+        return self._arc_length
 
     def get_corresponding_time_coordinate(self, arc_parameter):
-        return np.interp(arc_parameter, self.arc_length / self.length(), self.temporal)
+        if self._normalized_arc_length is None:
+            self.precompute_arc_length_parameterization(self._n)
+        return np.interp(arc_parameter, self._normalized_arc_length, self._temporal)
 
     def eval_at_arc_length(self, a):
         t = self.get_corresponding_time_coordinate(a)
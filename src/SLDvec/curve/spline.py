@@ -1,97 +1,84 @@
 import numpy as np
 
-from SLDvec.curve.bezier import CubicBezier
+from SLDvec.curve.bezier import CubicBezier, arc_length_table, eval_segments
 
 
 class Spline:
-    def __init__(self, points, n=10000):
+    def __init__(self, points, n=None):
         """Create a MultiBezier object from a list of points.
         The list of points is a list of list of points, each list of points
-        represents a bezier curve and contains 4 controls points."""
-
-        self.beziers = np.array([CubicBezier.from_list(p, n) for p in points])
-        self.n_beziers = len(self.beziers)
-
-        self.precompute_arc_length_parameterization(n)
-
-    def eval(self, t):
-        t = np.array(t).reshape(-1, 1)
+        represents a bezier curve and contains 4 controls points.
+        The control points are stored in a single array of shape (n_beziers, 4, 2).
+        The arc length parameterization is only computed when first needed, with n samples per
+        bezier curve if n is set, or an adaptive number of samples otherwise."""
+
+        self.control_points = np.asarray(points, dtype=float).reshape(-1, 4, 2)
+        self.n_beziers = len(self.control_points)
+        self._beziers = None
+
+        self._n = n
+        self._temporal = None
+        self._arc_length = None
+        self._normalized_arc_length = None
+
+    @property
+    def beziers(self) -> np.array:
+        """The bezier curves of the spline, as an array of CubicBezier objects. They are only
+        created when accessed, the evaluation of the spline does not need them."""
+        if self._beziers is None:
+            self._beziers = np.array([CubicBezier.from_list(p) for p in self.control_points])
+        return self._beziers
+
+    def _locate(self, t):
+        """Convert global parameters (between 0 and 1) into segment indices and local parameters."""
+        t = np.array(t, dtype=float).reshape(-1)
         t[-1] -= np.finfo(float).eps
 
         t = t * self.n_beziers  # t is between 0 and n_beziers
-        idx = t.astype(int)  # get the index of the bezier curve to sample from
+        idx = np.clip(t.astype(int), 0, self.n_beziers - 1)  # index of the bezier to sample from
         t = t - idx  # get the t value in the bezier curve coordinates
+        return idx, t
 
-        res = []
-        for i in range(self.n_beziers):
-            res.extend(self.beziers[i].eval(t[idx == i]))
-        return np.array(res)
+    def eval(self, t):
+        idx, t = self._locate(t)
+        return eval_segments(self.control_points, idx, t, 0)
 
     def eval_prime(self, t):
-        t = np.array(t).reshape(-1, 1)
-        t[-1] -= np.finfo(float).eps
-
-        t = t * self.n_beziers  # t is between 0 and n_beziers
-        idx = t.astype(int)  # get the index of the bezier curve to sample from
-        t = t - idx  # get the t value in the bezier curve coordinates
-
-        res = []
-        for i in range(self.n_beziers):
-            res.extend(self.beziers[i].eval_prime(t[idx == i]))
-        return np.array(res)
+        idx, t = self._locate(t)
+        return eval_segments(self.control_points, idx, t, 1)
 
     def eval_prime_prime(self, t):
-        t = np.array(t).reshape(-1, 1)
-        t[-1] -= np.finfo(float).eps
-
-        t = t * self.n_beziers  # t is between 0 and n_beziers
-        idx = t.astype(int)  # get the index of the bezier curve to sample from
-        t = t - idx  # get the t value in the bezier curve coordinates
-
-        res = []
-        for i in range(self.n_beziers):
-            res.extend(self.beziers[i].eval_prime_prime(t[idx == i]))
-        return np.array(res)
+        idx, t = self._locate(t)
+        return eval_segments(self.control_points, idx, t, 2)
 
     def eval_curvature(self, t):
-        t = np.array(t).reshape(-1, 1)
-        t[-1] -= np.finfo(float).eps
-
-        t = t * self.n_beziers  # t is between 0 and n_beziers
-        idx = t.astype(int)  # get the index of the bezier curve to sample from
-        t = t - idx  # get the t value in the bezier curve coordinates
-
-        res = []
-        for i in range(self.n_beziers):
-            res.extend(self.beziers[i].eval_curvature(t[idx == i]))
-        return np.array(res)
-
-    @staticmethod
-    def __precompute_arc_length_parameterization(all_arc_length, all_t, n):
-        n_curve = len(all_arc_length)
-        arc_length = np.zeros(n_curve * (n - 1) + 1)
-        t = np.zeros(n_curve * (n - 1) + 1)
-
-        for i, (_arc_length, _t) in enumerate(zip(all_arc_length, all_t)):
-            offset = arc_length[i * (n - 1)]
-            arc_length[i * (n - 1) + 1 : (i + 1) * (n - 1) + 1] = _arc_length[1:] + offset
-
-            offset_t = t[i * (n - 1)]
-            t[i * (n - 1) + 1 : (i + 1) * (n - 1) + 1] = _t[1:] + offset_t
-
-        t /= t[-1]
-        return arc_length, t
-
-    def precompute_arc_length_parameterization(self, n):
-        all_arc_length = [bez.arc_length for bez in self.beziers]
-        all_t = [bez.temporal for bez in self.beziers]
-
-        self.arc_length, self.temporal = Spline.__precompute_arc_length_parameterization(
-            all_arc_length, all_t, n
-        )
+        idx, t = self._locate(t)
+        prime = eval_segments(self.control_points, idx, t, 1)
+        prime_prime = eval_segments(self.control_points, idx, t, 2)
+        return (prime_prime[:, 0] * prime[:, 1] - prime_prime[:, 1] * prime[:, 0]) / np.linalg.norm(
+            prime, axis=1
+        ) ** 3
+
+    def precompute_arc_length_parameterization(self, n=None):
+        self._temporal, self._arc_length = arc_length_table(self.control_points, n)
+        self._normalized_arc_length = self._arc_length / self._arc_length[-1]
+
+    @property
+    def temporal(self):
+        if self._temporal is None:
+            self.precompute_arc_length_parameterization(self._n)
+        return self._temporal
+
+    @property
+    def arc_length(self):
+        if self._arc_length is None:
+            self.precompute_arc_length_parameterization(self._n)
+        return self._arc_length
 
     def get_corresponding_time_coordinate(self, arc_parameter):
-        return np.interp(arc_parameter, self.arc_length / self.length(), self.temporal)
+        if self._normalized_arc_length is None:
+            self.precompute_arc_length_parameterization(self._n)
+        return np.interp(arc_parameter, self._normalized_arc_length, self._temporal)
 
     def eval_at_arc_length(self, a):
         t = self.get_corresponding_time_coordinate(a)
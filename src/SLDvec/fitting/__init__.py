@@ -1,25 +1,75 @@
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from typing import List
 
 import networkx as nx
 import numpy as np
 
+from SLDvec import CURVE_FITTING_MAX_ERROR, CURVE_FITTING_N_WORKERS
+
 from .filter import filter_points
 from .fit import fit_curve
+from .reduction import ReductionStats, reduce_all_curves, reduce_beziers
+from .schneider import fit_curve_schneider
+
+# The available curve fitters, each fitting the Bezier curves of one stroke
+FITTERS = {"spline": fit_curve, "schneider": fit_curve_schneider}
+
+
+def _get_executor(n_workers: int, use_processes: bool) -> Executor:
+    """Create the pool used to fit the strokes concurrently."""
+    if use_processes:
+        # The spawn start method is used as forking a process that already initialized torch is
+        # unsafe
+        return ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return ThreadPoolExecutor(max_workers=n_workers)
 
 
 def fit_all_curves(
-    G: nx.Graph, terminating_node: List[int], node_lists: List[List[int]]
+    G: nx.Graph,
+    terminating_node: List[int],
+    node_lists: List[List[int]],
+    n_workers: int = CURVE_FITTING_N_WORKERS,
+    use_processes: bool = False,
+    fitter: str = "spline",
+    max_error: float = CURVE_FITTING_MAX_ERROR,
 ) -> np.array:
     """Fit bezier curves to all the ordered stroke of a line drawing.
+    The strokes are independent, so that they can be fitted concurrently by a pool of workers. Only
+    the positions of the points of each stroke are sent to the workers, and the curves are returned
+    in the order of the strokes, identical to the ones of a sequential fitting.
 
     Args:
         G (nx.Graph): The graph representing the line drawing.
         terminating_node (List[int]): The list of detected terminating nodes.
         node_lists (List[List[int]]): The list of ordered nodes representing the strokes.
+        n_workers (int, optional): The number of workers fitting the strokes, 0 to use one per core
+            and 1 to fit them sequentially in the current thread. Defaults to
+            CURVE_FITTING_N_WORKERS.
+        use_processes (bool, optional): Whether the workers are processes instead of threads.
+            Processes are not limited by the GIL, but take time to start. Defaults to False.
+        fitter (str, optional): The curve fitter, "spline" to fit a smoothing B-spline and convert
+            it to Bezier curves (see fit_curve), or "schneider" to fit the Bezier curves directly
+            (see fit_curve_schneider). Defaults to "spline".
+        max_error (float, optional): The maximum distance between a point and the fitted curves,
+            only used by the "schneider" fitter. Defaults to CURVE_FITTING_MAX_ERROR.
+
+    Raises:
+        ValueError: If the fitter is unknown.
 
     Returns:
         np.array: The list of bezier curves representing the strokes.
     """
+    if fitter not in FITTERS:
+        raise ValueError(f"Unknown fitter {fitter}, expected one of {list(FITTERS)}.")
+    fit = FITTERS[fitter]
+    if fitter == "schneider":
+        fit = partial(fit, max_error=max_error)
+
     # Filter and split the strokes
     node_lists_filtered_split = [
         filter_points(G, terminating_node, node_list) for node_list in node_lists
@@ -37,6 +87,13 @@ def fit_all_curves(
         )
 
     # Fit the curves
-    bezier_spline = [fit_curve(all_ordered_point) for all_ordered_point in all_ordered_points]
+    if n_workers == 0:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(all_ordered_points))
+    if n_workers <= 1:
+        bezier_spline = [fit(all_ordered_point) for all_ordered_point in all_ordered_points]
+    else:
+        with _get_executor(n_workers, use_processes) as executor:
+            bezier_spline = list(executor.map(fit, all_ordered_points))
 
     return bezier_spline
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .schneider import chord_length_parameterize, evaluate_bezier, generate_bezier, reparameterize
+
+# Number of points sampled on each Bezier curve to measure the error of a merged curve
+_SAMPLES_PER_SEGMENT = 16
+# Number of Newton-Raphson reparameterizations when fitting a merged curve
+_MAX_REPARAMETERIZATIONS = 4
+
+
+@dataclass
+class ReductionStats:
+    """A small dataclass to store the outcome of the reduction of the Bezier curves of a stroke.
+
+    Attributes:
+        n_segments_before (int): The number of Bezier curves before the reduction.
+        n_segments_after (int): The number of Bezier curves after the reduction.
+        max_error (float): The maximum distance measured between a merged curve and the curves it
+            replaces.
+    """
+
+    n_segments_before: int
+    n_segments_after: int
+    max_error: float
+
+
+def _direction(vectors: np.ndarray) -> Optional[np.ndarray]:
+    """The first non zero vector of a list, normalized, or None if they are all zero."""
+    for vector in vectors:
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            return vector / norm
+    return None
+
+
+def _merge(beziers: np.ndarray) -> Tuple[Optional[np.ndarray], float]:
+    """Fit a single Bezier curve on consecutive Bezier curves, keeping the end points and the end
+    tangent directions.
+
+    Returns:
+        Tuple[Optional[np.ndarray], float]: The merged curve and the symmetric distance between the
+            merged curve and the original ones, measured on samples, or None and infinity if the end
+            tangents are not defined.
+    """
+    start, end = beziers[0], beziers[-1]
+    tangent_start = _direction([start[1] - start[0], start[2] - start[0], start[3] - start[0]])
+    tangent_end = _direction([end[2] - end[3], end[1] - end[3], end[0] - end[3]])
+    if tangent_start is None or tangent_end is None:
+        return None, np.inf
+
+    u = np.linspace(0, 1, _SAMPLES_PER_SEGMENT + 1)[:-1]
+    samples = np.concatenate([evaluate_bezier(bezier, u) for bezier in beziers] + [end[3:]])
+
+    u = chord_length_parameterize(samples)
+    merged = generate_bezier(samples, u, tangent_start, tangent_end)
+    for _ in range(_MAX_REPARAMETERIZATIONS):
+        u = reparameterize(merged, samples, u)
+        merged = generate_bezier(samples, u, tangent_start, tangent_end)
+
+    # The distance is measured both ways, so that the merged curve can not leave the original ones
+    # between two samples of the original curves
+    merged_samples = evaluate_bezier(merged, np.linspace(0, 1, len(samples)))
+    error = max(
+        np.max(np.linalg.norm(evaluate_bezier(merged, u) - samples, axis=1)),
+        np.max(cKDTree(samples).query(merged_samples)[0]),
+    )
+    return merged, error
+
+
+def reduce_beziers(beziers: np.ndarray, tolerance: float) -> Tuple[np.ndarray, ReductionStats]:
+    """Greedily merge consecutive Bezier curves of a stroke while the merged curve stays closer than
+    tolerance to the curves it replaces.
+    The end points and the tangent directions at the ends of each merged run are kept, so that the
+    joints between the remaining curves are as continuous as before (G1 joints stay G1, and the
+    closing point of a periodic stroke stays as adjusted by fit_curve). Curves are never merged
+    across the closing point.
+
+    Args:
+        beziers (np.ndarray): The Bezier curves of the stroke, of shape (N, 4, 2).
+        tolerance (float): The maximum distance between a merged curve and the curves it replaces,
+            in pixels.
+
+    Returns:
+        Tuple[np.ndarray, ReductionStats]: The reduced Bezier curves and the statistics of the
+            reduction.
+    """
+    beziers = np.asarray(beziers, dtype=float)
+    reduced = []
+    max_error = 0.0
+
+    first = 0
+    while first < len(beziers):
+        # Extend the run of merged curves as long as the error stays below the tolerance
+        current, current_error = beziers[first], 0.0
+        last = first + 1
+        while last < len(beziers):
+            merged, error = _merge(beziers[first : last + 1])
+            if error > tolerance:
+                break
+            current, current_error = merged, error
+            last += 1
+        reduced.append(current)
+        max_error = max(max_error, current_error)
+        first = last
+
+    reduced = np.array(reduced).reshape(-1, 4, 2)
+    return reduced, ReductionStats(len(beziers), len(reduced), max_error)
+
+
+def reduce_all_curves(
+    bezier_splines: List[np.ndarray], tolerance: float
+) -> Tuple[List[np.ndarray], List[ReductionStats]]:
+    """Reduce the number of Bezier curves of all the strokes, see reduce_beziers. The input curves
+    are not modified.
+
+    Args:
+        bezier_splines (List[np.ndarray]): The Bezier curves of each stroke, as returned by
+            fit_all_curves.
+        tolerance (float): The maximum distance between a merged curve and the curves it replaces,
+            in pixels.
+
+    Returns:
+        Tuple[List[np.ndarray], List[ReductionStats]]: The reduced Bezier curves of each stroke and
+            the statistics of the reduction of each stroke.
+    """
+    results = [reduce_beziers(beziers, tolerance) for beziers in bezier_splines]
+    return [beziers for beziers, _ in results], [stats for _, stats in results]
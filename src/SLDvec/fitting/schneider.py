@@ -0,0 +1,284 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from SLDvec import CURVE_FITTING_CORNER_ANGLE, CURVE_FITTING_MAX_ERROR
+
+# Half length of the window along the curve used to measure the direction of the curve around a
+# point, in pixels. The medial axis is noisy at the scale of a pixel, so consecutive points can not
+# be used directly.
+_DIRECTION_WINDOW = 5.0
+# Number of Newton-Raphson reparameterizations tried before splitting a segment
+_MAX_REPARAMETERIZATIONS = 4
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def _arc_length(points: np.ndarray) -> np.ndarray:
+    """The length of the polyline from its first point to each of its points."""
+    return np.concatenate([[0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))])
+
+
+def _bernstein(u: np.ndarray) -> np.ndarray:
+    """The cubic Bernstein polynomials evaluated at u, of shape (len(u), 4)."""
+    u = u[:, None]
+    return np.hstack([(1 - u) ** 3, 3 * u * (1 - u) ** 2, 3 * u**2 * (1 - u), u**3])
+
+
+def evaluate_bezier(bezier: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Evaluate a cubic Bezier curve of shape (4, 2) at the parameters u, of shape (N,)."""
+    return _bernstein(u) @ bezier
+
+
+def _window_indices(arc_length: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For each point, the indices of the points about _DIRECTION_WINDOW before and after it."""
+    before = np.searchsorted(arc_length, arc_length - _DIRECTION_WINDOW, side="right") - 1
+    after = np.searchsorted(arc_length, arc_length + _DIRECTION_WINDOW, side="left")
+    return np.clip(before, 0, len(arc_length) - 1), np.clip(after, 0, len(arc_length) - 1)
+
+
+def find_corners(points: np.ndarray, corner_angle: float = CURVE_FITTING_CORNER_ANGLE) -> List[int]:
+    """Find the corners of a polyline, where the direction of the curve changes by more than
+    corner_angle within a few pixels.
+
+    Args:
+        points (np.ndarray): The points of the polyline, of shape (N, 2), without consecutive
+            duplicates.
+        corner_angle (float, optional): The minimum change of direction of a corner, in degrees.
+            Defaults to CURVE_FITTING_CORNER_ANGLE.
+
+    Returns:
+        List[int]: The indices of the corners, in increasing order. The first and last points are
+            never corners.
+    """
+    if len(points) < 3:
+        return []
+    arc_length = _arc_length(points)
+    before, after = _window_indices(arc_length)
+    incoming = points - points[before]
+    outgoing = points[after] - points
+    cross = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0]
+    dot = np.einsum("ij,ij->i", incoming, outgoing)
+    turn = np.degrees(np.abs(np.arctan2(cross, dot)))
+
+    # The windows of the first and last points are truncated, their direction is not reliable
+    is_corner = (turn > corner_angle) & (before > 0) & (after < len(points) - 1)
+
+    # Keep the sharpest point of each run of consecutive corner points
+    corners = []
+    run_starts = np.flatnonzero(is_corner & ~np.concatenate([[False], is_corner[:-1]]))
+    run_ends = np.flatnonzero(is_corner & ~np.concatenate([is_corner[1:], [False]]))
+    for start, end in zip(run_starts, run_ends):
+        corners.append(int(start + np.argmax(turn[start : end + 1])))
+    return corners
+
+
+def generate_bezier(
+    points: np.ndarray, u: np.ndarray, tangent_start: np.ndarray, tangent_end: np.ndarray
+) -> np.ndarray:
+    """Least squares fit of the inner control points of a cubic Bezier curve, with fixed end points
+    and end tangent directions (Schneider, Graphics Gems 1990)."""
+    start, end = points[0], points[-1]
+    basis = _bernstein(u)
+    A1 = basis[:, 1:2] * tangent_start
+    A2 = basis[:, 2:3] * tangent_end
+
+    C = np.array(
+        [
+            [np.einsum("ij,ij->", A1, A1), np.einsum("ij,ij->", A1, A2)],
+            [np.einsum("ij,ij->", A1, A2), np.einsum("ij,ij->", A2, A2)],
+        ]
+    )
+    residual = points - np.outer(basis[:, 0] + basis[:, 1], start)
+    residual -= np.outer(basis[:, 2] + basis[:, 3], end)
+    X = np.array([np.einsum("ij,ij->", A1, residual), np.einsum("ij,ij->", A2, residual)])
+
+    segment_length = np.linalg.norm(end - start)
+    epsilon = 1e-6 * segment_length
+    det = C[0, 0] * C[1, 1] - C[0, 1] * C[1, 0]
+    alpha_start = alpha_end = 0.0
+    if abs(det) > 1e-12:
+        alpha_start = (X[0] * C[1, 1] - X[1] * C[0, 1]) / det
+        alpha_end = (C[0, 0] * X[1] - C[1, 0] * X[0]) / det
+
+    # Fall back to the heuristic of Wu and Barsky if the system is degenerate or if a control point
+    # lies behind its end point
+    if alpha_start < epsilon or alpha_end < epsilon:
+        alpha_start = alpha_end = segment_length / 3
+
+    return np.array(
+        [start, start + alpha_start * tangent_start, end + alpha_end * tangent_end, end]
+    )
+
+
+def reparameterize(bezier: np.ndarray, points: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Improve the parameters of the points with one Newton-Raphson step on the distance between
+    each point and the curve."""
+    first = 3 * np.diff(bezier, axis=0)
+    second = 2 * np.diff(first, axis=0)
+
+    v = u[:, None]
+    diff = evaluate_bezier(bezier, u) - points
+    d1 = (1 - v) ** 2 * first[0] + 2 * v * (1 - v) * first[1] + v**2 * first[2]
+    d2 = (1 - v) * second[0] + v * second[1]
+
+    numerator = np.einsum("ij,ij->i", diff, d1)
+    denominator = np.einsum("ij,ij->i", d1, d1) + np.einsum("ij,ij->i", diff, d2)
+    step = np.divide(numerator, denominator, out=np.zeros_like(u), where=denominator != 0)
+    return np.clip(u - step, 0, 1)
+
+
+def chord_length_parameterize(points: np.ndarray) -> np.ndarray:
+    """Parameters between 0 and 1 of the points of a polyline, proportional to the arc length."""
+    arc_length = _arc_length(points)
+    return arc_length / arc_length[-1] if arc_length[-1] > 0 else arc_length
+
+
+def _tangent_at(
+    points: np.ndarray, arc_length: np.ndarray, index: int, forward: bool
+) -> np.ndarray:
+    """The direction of the curve at a point, measured over _DIRECTION_WINDOW pixels."""
+    if forward:
+        other = min(
+            np.searchsorted(arc_length, arc_length[index] + _DIRECTION_WINDOW), len(points) - 1
+        )
+    else:
+        other = max(np.searchsorted(arc_length, arc_length[index] - _DIRECTION_WINDOW) - 1, 0)
+    if other == index:
+        other = index + 1 if forward else index - 1
+    return _normalize(points[other] - points[index])
+
+
+def fit_cubic_beziers(
+    points: np.ndarray,
+    max_error: float,
+    tangent_start: np.ndarray,
+    tangent_end: np.ndarray,
+) -> List[np.ndarray]:
+    """Fit a series of G1 continuous cubic Bezier curves on an ordered list of points, with
+    Schneider's algorithm: a single curve is fitted by least squares, and the points are split at
+    the point of maximum error until every point is closer than max_error to the curve.
+
+    Args:
+        points (np.ndarray): The ordered points, of shape (N, 2), without consecutive duplicates.
+        max_error (float): The maximum distance between a point and the fitted curves.
+        tangent_start (np.ndarray): The unit direction of the curve leaving the first point.
+        tangent_end (np.ndarray): The unit direction of the curve leaving the last point backward.
+
+    Returns:
+        List[np.ndarray]: The Bezier curves, each of shape (4, 2).
+    """
+    arc_length = _arc_length(points)
+    squared_max_error = max_error**2
+
+    # Segments still to fit, as (first, last, tangent at first, tangent at last). The right half of
+    # a split is pushed first so that the curves are produced in order.
+    beziers = []
+    stack = [(0, len(points) - 1, tangent_start, tangent_end)]
+    while stack:
+        first, last, t_first, t_last = stack.pop()
+        segment = points[first : last + 1]
+        if len(segment) == 2:
+            length = np.linalg.norm(segment[1] - segment[0]) / 3
+            beziers.append(
+                np.array(
+                    [
+                        segment[0],
+                        segment[0] + t_first * length,
+                        segment[1] + t_last * length,
+                        segment[1],
+                    ]
+                )
+            )
+            continue
+
+        u = chord_length_parameterize(segment)
+        bezier = generate_bezier(segment, u, t_first, t_last)
+        errors = np.sum((evaluate_bezier(bezier, u) - segment) ** 2, axis=1)
+        if errors.max() > squared_max_error and errors.max() < 4 * squared_max_error:
+            # The curve is close, try to improve the parameterization before splitting
+            for _ in range(_MAX_REPARAMETERIZATIONS):
+                u = reparameterize(bezier, segment, u)
+                bezier = generate_bezier(segment, u, t_first, t_last)
+                errors = np.sum((evaluate_bezier(bezier, u) - segment) ** 2, axis=1)
+                if errors.max() <= squared_max_error:
+                    break
+
+        if errors.max() <= squared_max_error:
+            beziers.append(bezier)
+            continue
+
+        split = first + int(np.clip(np.argmax(errors), 1, len(segment) - 2))
+        t_center = _normalize(
+            _tangent_at(points, arc_length, split, forward=False)
+            - _tangent_at(points, arc_length, split, forward=True)
+        )
+        if not t_center.any():
+            t_center = _tangent_at(points, arc_length, split, forward=False)
+        stack.append((split, last, -t_center, t_last))
+        stack.append((first, split, t_first, t_center))
+
+    return beziers
+
+
+def _remove_consecutive_duplicates(points: np.ndarray) -> np.ndarray:
+    keep = np.concatenate([[True], np.any(np.diff(points, axis=0) != 0, axis=1)])
+    return points[keep]
+
+
+def fit_curve_schneider(
+    lists_ordered_points: List[np.array],
+    max_error: float = CURVE_FITTING_MAX_ERROR,
+    corner_angle: float = CURVE_FITTING_CORNER_ANGLE,
+) -> np.array:
+    """Fit a series of Bezier curves on a list of ordered points, directly with Schneider's
+    algorithm instead of fitting a B-spline first (see fit_curve). The curves are split at the
+    corners of the points, and are G1 continuous everywhere else, including where a periodic curve
+    closes.
+
+    Args:
+        lists_ordered_points (List[np.array]): The ordered points of each part of the curve.
+        max_error (float, optional): The maximum distance between a point and the fitted curves, in
+            pixels. Defaults to CURVE_FITTING_MAX_ERROR.
+        corner_angle (float, optional): The minimum change of direction of a corner, in degrees.
+            Defaults to CURVE_FITTING_CORNER_ANGLE.
+
+    Returns:
+        np.array: The Bezier curves, of shape (N, 4, 2).
+    """
+    parts = [
+        _remove_consecutive_duplicates(np.asarray(p, dtype=float)) for p in lists_ordered_points
+    ]
+    parts = [p for p in parts if len(p) >= 2]
+    if not parts:
+        return np.zeros((0, 4, 2))
+
+    # A periodic curve gets the same tangent on both sides of the closing point
+    periodic = len(parts[0]) > 2 and bool((parts[0][0] == parts[-1][-1]).all())
+    if periodic:
+        closing = np.concatenate([parts[-1][:-1], parts[0]])
+        closing_length = _arc_length(closing)
+        index = len(parts[-1]) - 1
+        t_closing = _normalize(
+            _tangent_at(closing, closing_length, index, forward=True)
+            - _tangent_at(closing, closing_length, index, forward=False)
+        )
+
+    beziers = []
+    for i, part in enumerate(parts):
+        bounds = [0] + find_corners(part, corner_angle) + [len(part) - 1]
+        for j, (first, last) in enumerate(zip(bounds[:-1], bounds[1:])):
+            section = part[first : last + 1]
+            section_length = _arc_length(section)
+            t_first = _tangent_at(section, section_length, 0, forward=True)
+            t_last = _tangent_at(section, section_length, len(section) - 1, forward=False)
+            if periodic and i == 0 and j == 0:
+                t_first = t_closing
+            if periodic and i == len(parts) - 1 and j == len(bounds) - 2:
+                t_last = -t_closing
+            beziers.extend(fit_cubic_beziers(section, max_error, t_first, t_last))
+
+    return np.array(beziers)
@@ -42,7 +42,7 @@ def add_intermediate_points_end(points: np.array) -> np.array:
 def add_random_noise_to_duplicate(points: np.array, noise: float = 1e-6, seed: int = 0) -> np.array:
     """Add random noise to the points that are duplicate.
     This is done to avoid numerical issue when fitting the curve, as the spline fitting algorithm
-    does not like duplicate points.
+    does not like duplicate points. The first and last points are never moved.
 
     Args:
         points (np.array): The list of points positions.
@@ -52,8 +52,14 @@ def add_random_noise_to_duplicate(points: np.array, noise: float = 1e-6, seed: i
     Returns:
         np.array: The list of points positions with noise added to duplicate points.
     """
-    np.random.seed(seed)
-    for i in range(1, len(points) - 1):
-        if np.all(points[i] == points[:i], axis=-1).any():
-            points[i] += np.random.randn(2) * noise
+    if len(points) < 3:
+        return points
+
+    # A point is a duplicate if the same position appears earlier in the list
+    _, first_index, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+    duplicate = first_index[inverse.reshape(-1)] < np.arange(len(points))
+    duplicate[[0, -1]] = False
+
+    rng = np.random.default_rng(seed)
+    points[duplicate] += rng.standard_normal((np.count_nonzero(duplicate), 2)) * noise
     return points
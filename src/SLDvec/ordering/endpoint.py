@@ -5,6 +5,8 @@ import networkx as nx
 import numpy as np
 
 from SLDvec.utils.networkx import (
+    get_chain_index,
+    get_junction_table,
     get_opposite_angle,
     get_path_from_degree_1_node_to_crossroad,
     get_path_to_crossroad_node,
@@ -25,8 +27,9 @@ def get_degree_3_node_infos(G: nx.Graph, degree_3_nodes: List[int]) -> dict:
     """
     # We first check the nodes with a degree of 3
     degree_3_node_info = {}
+    table = get_junction_table(G)
     for node in degree_3_nodes:
-        max_angle, small_angle_diff = get_Y_shape_angle_metric(G, node)
+        max_angle, small_angle_diff = get_Y_shape_angle_metric(G, node, table)
         degree_3_node_info[node] = [max_angle, small_angle_diff]
     return degree_3_node_info
 
@@ -109,11 +112,13 @@ def find_terminating_node(G: nx.Graph, force_single_line: bool) -> List[int]:
 
     # Find the terminating nodes
     terminating = []
+    index = get_chain_index(G)
+    table = get_junction_table(G)
 
     # We first check the nodes with a degree of 1
     odd_degree_close_to_degree_1_node = defaultdict(list)
     for node in degree_1_nodes:
-        branch_to_crossroad = get_path_from_degree_1_node_to_crossroad(G, node)
+        branch_to_crossroad = get_path_from_degree_1_node_to_crossroad(G, node, index)
         closest_crossroad = branch_to_crossroad[-1]
         if G.degree(closest_crossroad) % 2 == 0 or closest_crossroad in degree_1_nodes:
             # If the node has degree 1, it is terminating
@@ -132,7 +137,7 @@ def find_terminating_node(G: nx.Graph, force_single_line: bool) -> List[int]:
         if len(degree_1s) == 2:
             # 2 degree 1 nodes are connected to the same crossroad. The one with the smallest
             # opposite angle is added to the list of terminating nodes
-            opposite_angle = get_opposite_angle(G, crossroad)
+            opposite_angle = get_opposite_angle(G, crossroad, table)
             if (
                 opposite_angle[degree_1s[0]["corresponding_crossroad_neighbor"]]
                 > opposite_angle[degree_1s[1]["corresponding_crossroad_neighbor"]]
@@ -144,7 +149,7 @@ def find_terminating_node(G: nx.Graph, force_single_line: bool) -> List[int]:
             # This case basically means that we have a crossroad with 3 single neighbor nodes
             # connected to it. So the entire graph is a star graph, we simply need to add two ending
             # nodes from these single neighbor nodes
-            opposite_angle = get_opposite_angle(G, crossroad)
+            opposite_angle = get_opposite_angle(G, crossroad, table)
             min_angle_node = min(opposite_angle, key=opposite_angle.get)
             for degree_1 in degree_1s:
                 if degree_1["corresponding_crossroad_neighbor"] != min_angle_node:
@@ -154,7 +159,9 @@ def find_terminating_node(G: nx.Graph, force_single_line: bool) -> List[int]:
     for node in degree_3_nodes:
         connected_to_degree_1 = False
         for neighbor in G.neighbors(node):
-            branch_to_crossroad = get_path_to_crossroad_node(G, node=node, direction=neighbor)
+            branch_to_crossroad = get_path_to_crossroad_node(
+                G, node=node, direction=neighbor, index=index
+            )
             if G.degree(branch_to_crossroad[-1]) == 1:
                 connected_to_degree_1 = True
                 break
@@ -171,7 +178,7 @@ def find_terminating_node(G: nx.Graph, force_single_line: bool) -> List[int]:
                 terminating = [node] + terminating
             # Degree 1 node linked to this node are also terminating
             for neighbor in G.neighbors(node):
-                path = get_path_to_crossroad_node(G, node=node, direction=neighbor)
+                path = get_path_to_crossroad_node(G, node=node, direction=neighbor, index=index)
                 if G.degree(path[-1]) == 1 and path[-1] not in terminating:
                     terminating.append(path[-1])
 
@@ -1,4 +1,5 @@
-from typing import Tuple, Union
+from itertools import islice
+from typing import Iterator, List, Tuple, Union
 
 import numpy as np
 import timm
@@ -7,7 +8,13 @@ from PIL import Image
 from scipy.special import softmax
 from torchvision.transforms import v2
 
-from SLDvec import MODEL_NAME, MODEL_NUM_CLASSES, MODEL_PATH, MODEL_PREDICTIONS_N_AUGMENTATIONS
+from SLDvec import (
+    MODEL_NAME,
+    MODEL_NUM_CLASSES,
+    MODEL_PATH,
+    MODEL_PREDICTIONS_BATCH_SIZE,
+    MODEL_PREDICTIONS_N_AUGMENTATIONS,
+)
 
 
 def get_predictor() -> timm.models:
@@ -87,21 +94,33 @@ class ModelPredictor:
         Returns:
             Tuple(str, float, float): The predicted intersection type and the 2 confidence metrics.
         """
-        if isinstance(image, np.ndarray):
-            image = convert_img_to_PIL(image)
+        return self.predict_batch([image])[0]
 
-        # Create copies of the image with different augmentations, and predict the intersection type
-        image = self.transform(image)
-        augmented_image = [
-            self.augmentation_transform(image) for _ in range(MODEL_PREDICTIONS_N_AUGMENTATIONS)
-        ]
-        image = torch.stack([image] + augmented_image)
-        image = image.to(self.device)
-        with torch.no_grad():
-            output = self.model(image)
+    def _augmented_images(
+        self, images: List[Union[np.array, Image.Image]]
+    ) -> Iterator[torch.Tensor]:
+        """Yield, for each image in turn, the transformed image followed by its
+        MODEL_PREDICTIONS_N_AUGMENTATIONS augmented copies."""
+        for image in images:
+            if isinstance(image, np.ndarray):
+                image = convert_img_to_PIL(image)
+
+            image = self.transform(image)
+            yield image
+            for _ in range(MODEL_PREDICTIONS_N_AUGMENTATIONS):
+                yield self.augmentation_transform(image)
+
+    def _aggregate(self, output: np.array) -> Tuple[str, float, float]:
+        """Aggregate the predictions made on an image and its augmented copies.
+
+        Args:
+            output (np.array): The output of the model for the image and its augmented copies.
 
+        Returns:
+            Tuple(str, float, float): The predicted intersection type and the 2 confidence metrics.
+        """
         # Aggregate the predictions, by taking the most frequent prediction
-        preds = torch.argmax(output, dim=1).cpu().numpy()
+        preds = np.argmax(output, axis=1)
         pred = np.percentile(preds, 50)
         label = self.index_to_class[pred]
 
@@ -110,6 +129,47 @@ class ModelPredictor:
         # confidence2 represents the average confidence (when looking at the softmax distribution
         # of the output) of the most frequent prediction
         confidence1 = sum(preds == pred) / len(preds)
-        confidences = softmax(output.cpu().numpy(), axis=1)
+        confidences = softmax(output, axis=1)
         confidence2 = confidences[:, int(pred)].mean()
         return label, confidence1, confidence2
+
+    def predict_batch(
+        self,
+        images: List[Union[np.array, Image.Image]],
+        batch_size: int = MODEL_PREDICTIONS_BATCH_SIZE,
+    ) -> List[Tuple[str, float, float]]:
+        """Predict the type of intersection of several images.
+        The images and all their augmented copies are stacked into micro-batches of batch_size
+        images, so that the model runs a few large forward passes instead of one per image.
+        The result for each image is the same as the one of `__call__`.
+
+        Args:
+            images (List[Union[np.array, Image]]): The images to predict the intersection type of.
+            batch_size (int, optional): The maximum number of images per forward pass. Defaults to
+                MODEL_PREDICTIONS_BATCH_SIZE.
+
+        Returns:
+            List[Tuple(str, float, float)]: For each image, the predicted intersection type and the
+                2 confidence metrics.
+        """
+        if len(images) == 0:
+            return []
+
+        # Run the model on micro-batches of the images and their augmented copies
+        outputs = []
+        augmented_images = self._augmented_images(images)
+        while True:
+            batch = list(islice(augmented_images, batch_size))
+            if len(batch) == 0:
+                break
+            batch = torch.stack(batch).to(self.device)
+            with torch.no_grad():
+                outputs.append(self.model(batch).cpu().numpy())
+        outputs = np.concatenate(outputs)
+
+        # Split the outputs back per image and aggregate them
+        n_predictions = 1 + MODEL_PREDICTIONS_N_AUGMENTATIONS
+        return [
+            self._aggregate(outputs[i * n_predictions : (i + 1) * n_predictions])
+            for i in range(len(images))
+        ]
@@ -1,7 +1,35 @@
+from typing import Optional
+
 import networkx as nx
 import numpy as np
 
-from SLDvec.utils.networkx import get_path_to_crossroad_node
+from SLDvec.utils.networkx import (
+    ChainIndex,
+    SpatialIndex,
+    get_chain_index,
+    get_path_to_crossroad_node,
+    get_spatial_index,
+)
+
+
+def get_adjacent_nodes(G: nx.Graph, crossroad_node: int, index: Optional[ChainIndex] = None) -> set:
+    """Given a graph and a crossroad node in the graph, return the crossroad node and all the nodes
+    connected to it through a chain of degree 2 nodes.
+
+    Args:
+        G (nx.Graph): The input graph.
+        crossroad_node (int): The crossroad node in the graph.
+        index (Optional[ChainIndex], optional): The chain index of the graph. Defaults to
+            get_chain_index(G).
+
+    Returns:
+        set: The adjacent nodes, including the crossroad node itself.
+    """
+    index = index if index is not None else get_chain_index(G)
+    adjacent_nodes = {crossroad_node}
+    for n in G.neighbors(crossroad_node):
+        adjacent_nodes.update(get_path_to_crossroad_node(G, crossroad_node, n, index))
+    return adjacent_nodes
 
 
 def get_all_non_adjacent_node(G: nx.Graph, crossroad_node: int) -> np.array:
@@ -16,43 +44,45 @@ def get_all_non_adjacent_node(G: nx.Graph, crossroad_node: int) -> np.array:
     Returns:
         np.array: The position of all the non-adjacent nodes.
     """
-    neighbors = list(G.neighbors(crossroad_node))
-    adjacent_nodes = [get_path_to_crossroad_node(G, crossroad_node, n) for n in neighbors]
-    adjacent_nodes = [x for sublist in adjacent_nodes for x in sublist]
-    non_adjacent_nodes = []
-    for node in G.nodes():
-        if node not in adjacent_nodes and node != crossroad_node:
-            non_adjacent_nodes.append(node)
-    return np.array(non_adjacent_nodes)
-
-
-def get_distance(G: nx.Graph, crossroad_node: int) -> float:
-    """Given a graph and a crossroad node in the graph, return the Manhattan distance to the closest
-    node that is not adjacent to the crossroad node.
-    If there are no non-adjacent nodes, return the Manhattan distance to the farthest node in the
+    adjacent_nodes = get_adjacent_nodes(G, crossroad_node)
+    return np.array([node for node in G.nodes() if node not in adjacent_nodes])
+
+
+def get_distance(
+    G: nx.Graph,
+    crossroad_node: int,
+    index: Optional[ChainIndex] = None,
+    spatial_index: Optional[SpatialIndex] = None,
+) -> float:
+    """Given a graph and a crossroad node in the graph, return the Chebyshev distance (maximum of
+    the absolute coordinate differences) to the closest node that is not adjacent to the crossroad
+    node.
+    If there are no non-adjacent nodes, return the Chebyshev distance to the farthest node in the
     graph.
 
     Args:
         G (nx.Graph): The input graph.
         crossroad_node (int): The crossroad node in the graph.
+        index (Optional[ChainIndex], optional): The chain index of the graph. Defaults to
+            get_chain_index(G).
+        spatial_index (Optional[SpatialIndex], optional): The spatial index of the graph. Defaults
+            to get_spatial_index(G).
 
     Returns:
-        float: The Manhattan distance from the crossroad node to the closest non-adjacent node.
+        float: The Chebyshev distance from the crossroad node to the closest non-adjacent node.
     """
-    non_adjacent_nodes = get_all_non_adjacent_node(G, crossroad_node)
-    non_adjacent_pos = np.array([G.nodes[node]["pos"] for node in non_adjacent_nodes])
-    pos = G.nodes[crossroad_node]["pos"]
-    if len(non_adjacent_pos) > 0:
-        distance = np.max(np.abs(non_adjacent_pos - pos), axis=1)  # Manhattan distance
-        # distance = np.linalg.norm(non_adjacent_pos - pos, axis=1)  # Euclidean distance
-        return np.min(distance)
-    else:
-        all_nodes_pos = np.array([G.nodes[n]["pos"] for n in G.nodes()])
-        distance = np.max(np.abs(all_nodes_pos - pos), axis=1)
-        return np.max(distance)
-
-
-def get_crop(G: nx.Graph, image: np.array, node: int) -> np.array:
+    adjacent_nodes = get_adjacent_nodes(G, crossroad_node, index)
+    spatial_index = spatial_index if spatial_index is not None else get_spatial_index(G)
+    return spatial_index.nearest_distance(G.nodes[crossroad_node]["pos"], adjacent_nodes)
+
+
+def get_crop(
+    G: nx.Graph,
+    image: np.array,
+    node: int,
+    index: Optional[ChainIndex] = None,
+    spatial_index: Optional[SpatialIndex] = None,
+) -> np.array:
     """Given a graph, an image and a node in the graph, return the crop of the image centered on the
     node and with a size proportional to the distance to the closest non-adjacent node.
 
@@ -60,12 +90,16 @@ def get_crop(G: nx.Graph, image: np.array, node: int) -> np.array:
         G (nx.Graph): The input graph.
         image (np.array): The input image.
         node (int): The node in the graph.
+        index (Optional[ChainIndex], optional): The chain index of the graph, to pass when cropping
+            many nodes of the same graph. Defaults to get_chain_index(G).
+        spatial_index (Optional[SpatialIndex], optional): The spatial index of the graph, to pass
+            when cropping many nodes of the same graph. Defaults to get_spatial_index(G).
 
     Returns:
         np.array: The crop of the image centered on the node.
     """
     pos = G.nodes[node]["pos"].astype(int)
-    min_distance = int(get_distance(G, node) * 0.9)
+    min_distance = int(get_distance(G, node, index, spatial_index) * 0.9)
     x_min, y_min = pos - min_distance
     x_max, y_max = pos + min_distance
     x_min = np.clip(x_min, 0, image.shape[1])
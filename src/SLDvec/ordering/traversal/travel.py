@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional, Set, Tuple
 
 import networkx as nx
 import numpy as np
@@ -7,174 +7,397 @@ from SLDvec.utils.networkx import (
     annotate_crossroad_linked_to_single_neighbor_node,
     find_T_bar_directions,
     find_T_foot_direction,
+    get_junction_table,
+    get_spatial_index,
 )
 
-from .neighbor_order import ClockwiseNeighborCycle, get_next_node
-
-
-def travel_graph_starting_from(G: nx.Graph, start_from: int, end_nodes: List[int]) -> List[int]:
-    # Initialize the list of nodes to visit with the starting node
-    travel_node_list = []
-    travel_node_list.append(start_from)
-    G.nodes[start_from]["visited"] = True
-
-    # Depending on the number of neighbors of the starting node, the second node to visit needs to
-    # be chosen carefully
-    if len(list(G.neighbors(start_from))) == 3:
-        # If the start node has 3 neighbors, it is a T-shaped node, the next node is in the
-        # direction of the foot of the T
-        next_node = find_T_foot_direction(start_from, G)
-        travel_node_list.append(next_node)
-        G.nodes[next_node]["visited"] = True
-        G.nodes[start_from]["visited_neighbor"] = set([next_node])
-    elif len(list(G.neighbors(start_from))) == 2:
-        # If the start node has 2 neighbors, it is either a loop component, or actually not the
-        # beginning of a stroke. Either way, the next node is the first not already visited neighbor
-        neighbors = list(G.neighbors(start_from))
-        for n in neighbors:
-            if not G.nodes[n]["visited"]:
-                travel_node_list.append(n)
-                G.nodes[n]["visited"] = True
-                break
+from .neighbor_order import ClockwiseNeighborCycle
 
-    # Travel the graph until an end node is reached (or an error occurs)
-    terminate = False
-    while not terminate:
-        current_node = travel_node_list[-1]
-        current_neighbors = list(G.neighbors(current_node))
 
-        if len(current_neighbors) == 1:
-            if current_node in end_nodes:
-                terminate = True
-                break
+class TraversalGraph:
+    """Array based view of a graph, used to order its nodes into strokes.
 
-            next_node = current_neighbors[0]
+    Nodes are referred to by their row, that is their position in G.nodes. The adjacency is stored
+    in CSR format: the neighbors of row i are indices[indptr[i]:indptr[i + 1]], in the order of
+    G.neighbors. The traversal state (visited nodes, visited neighbors of the crossroad nodes) is
+    kept in plain containers instead of node attributes.
 
-            travel_node_list.append(next_node)
-            G.nodes[next_node]["visited"] = True
+    The successors of the even degree crossroad nodes are precomputed once for both the crossing
+    and the tangent intersection types, so that the graph can be traversed again cheaply after the
+    type of some intersections changed. If incremental is set, the state at the beginning of each
+    stroke is also saved, so that update_intersection_types only travels again the strokes that can
+    be affected by a change. Otherwise, only the initial state is saved, and
+    update_intersection_types travels the whole graph again.
 
-        elif len(current_neighbors) == 2:
-            if current_node in end_nodes:
-                # The curve is a loop
-                terminate = True
-                break
+    Attributes:
+        nodes (List[int]): The nodes of the graph, in the order of G.nodes.
+        row (Dict[int, int]): The row of each node.
+        degree (List[int]): The degree of each row.
+        indptr (List[int]): The offset of the neighbors of each row in indices.
+        indices (List[int]): The rows of the neighbors of all the rows.
+        incremental (bool): Whether the state at the beginning of each stroke is saved.
+    """
 
-            # One of the neighbor is the previous node, the other is the next node
-            # If it's not the case, return the current list
-            if travel_node_list[-2] not in current_neighbors:
-                # NOTE: this shouldn't happen, it is there to avoid errors and always return
-                return travel_node_list
-            else:
-                current_neighbors.remove(travel_node_list[-2])
-                next_node = current_neighbors[0]
+    def __init__(self, G: nx.Graph, incremental: bool = False):
+        self.G = G
+        self.incremental = incremental
+        self.nodes: List[int] = list(G.nodes())
+        self.row: Dict[int, int] = {node: i for i, node in enumerate(self.nodes)}
+
+        neighbors = [[self.row[n] for n in G.neighbors(node)] for node in self.nodes]
+        self.degree: List[int] = [len(n) for n in neighbors]
+        self.indptr: List[int] = np.cumsum([0] + self.degree).tolist()
+        self.indices: List[int] = [n for node_neighbors in neighbors for n in node_neighbors]
+
+        self._crossroads = [row for row, degree in enumerate(self.degree) if degree > 2]
+        self._degree_4 = [row for row in self._crossroads if self.degree[row] == 4]
+
+        # Successor tables of the even degree crossroad nodes: previous row -> next row. Crossing
+        # goes to the opposite neighbor in the clockwise order, tangent to the most continuous one.
+        self._crossing: Dict[int, Dict[int, int]] = {}
+        self._tangent: Dict[int, Dict[int, int]] = {}
+        self._junction_table = get_junction_table(G)
+        for row in self._crossroads:
+            degree = self.degree[row]
+            if degree % 2 != 0:
+                continue
+            cycle = ClockwiseNeighborCycle(self.nodes[row], G, self._junction_table)
+            order = [self.row[n] for n in cycle.order.tolist()]
+            self._crossing[row] = {
+                order[i]: order[(i + degree // 2) % degree] for i in range(degree)
+            }
+            if degree == 4:
+                self._tangent[row] = {
+                    self.row[a]: self.row[b] for a, b in cycle.tangent_order.items()
+                }
+
+        # Directions of the degree 3 crossroad nodes, computed when first needed
+        self._T_foot: Dict[int, int] = {}
+        self._T_bar: Dict[int, List[int]] = {}
+        self._close_to_crossroad: Optional[Set[int]] = None
+
+    def neighbors(self, row: int) -> List[int]:
+        """Return the rows of the neighbors of a row."""
+        return self.indices[self.indptr[row] : self.indptr[row + 1]]
+
+    def _get_T_foot(self, row: int) -> int:
+        if row not in self._T_foot:
+            self._T_foot[row] = self.row[
+                find_T_foot_direction(self.nodes[row], self.G, self._junction_table)
+            ]
+        return self._T_foot[row]
+
+    def _get_T_bar(self, row: int) -> List[int]:
+        if row not in self._T_bar:
+            bar = find_T_bar_directions(self.nodes[row], self.G, self._junction_table)
+            self._T_bar[row] = [self.row[n] for n in bar]
+        return self._T_bar[row]
+
+    def _get_close_to_crossroad(self) -> Set[int]:
+        """Return the rows of the nodes that are inside the circle of a neighbor of a crossroad
+        node, of radius equal to the distance to the border of the shape."""
+        if self._close_to_crossroad is None:
+            spatial_index = get_spatial_index(self.G)
+            self._close_to_crossroad = set()
+            for row in self._crossroads:
+                for n in self.neighbors(row):
+                    node_data = self.G.nodes[self.nodes[n]]
+                    if "dist" not in node_data:
+                        print(f"Node {self.nodes[n]} has no dist, continue")
+                        continue
+                    close = spatial_index.within_radius(node_data["pos"], node_data["dist"])
+                    self._close_to_crossroad.update(self.row[node] for node in close)
+        return self._close_to_crossroad
+
+    def _visit(self, row: int) -> None:
+        if not self._visited[row]:
+            self._visited[row] = 1
+            self._n_visited += 1
+
+    def _add_end_node(self, row: int) -> None:
+        self._end.append(row)
+        self._end_set.add(row)
+
+    def _remove_end_node(self, row: int) -> None:
+        self._end.remove(row)
+        if row not in self._end:
+            self._end_set.discard(row)
+
+    def _sample_new_starting_degree_2_node(self) -> int:
+        """Select an unvisited degree 2 node, away from the crossroad nodes, as a new starting
+        point for the traversal."""
+        close_to_crossroad = self._get_close_to_crossroad()
+        # Nodes skipped once are never selected later, as nodes never become unvisited
+        while self._sample_cursor < len(self.nodes):
+            row = self._sample_cursor
+            if self.degree[row] == 2 and not self._visited[row] and row not in close_to_crossroad:
+                return row
+            self._sample_cursor += 1
+        raise IndexError("There is no degree 2 node left to start a new stroke from.")
+
+    def _travel_starting_from(self, start_from: int) -> List[int]:
+        """Travel the graph from a row until an end node is reached (or an error occurs).
+
+        Args:
+            start_from (int): The row to start from.
+
+        Returns:
+            List[int]: The rows of the travelled nodes, in order.
+        """
+        visited_neighbor = self._visited_neighbor
+
+        # Initialize the list of nodes to visit with the starting node
+        travel = [start_from]
+        self._visit(start_from)
+
+        # Depending on the number of neighbors of the starting node, the second node to visit needs
+        # to be chosen carefully
+        if self.degree[start_from] == 3:
+            # If the start node has 3 neighbors, it is a T-shaped node, the next node is in the
+            # direction of the foot of the T
+            next_node = self._get_T_foot(start_from)
+            travel.append(next_node)
+            self._visit(next_node)
+            visited_neighbor[start_from] = {next_node}
+        elif self.degree[start_from] == 2:
+            # If the start node has 2 neighbors, it is either a loop component, or actually not the
+            # beginning of a stroke. Either way, the next node is the first not already visited
+            # neighbor
+            for n in self.neighbors(start_from):
+                if not self._visited[n]:
+                    travel.append(n)
+                    self._visit(n)
+                    break
+
+        while True:
+            current_node = travel[-1]
+            degree = self.degree[current_node]
 
-            travel_node_list.append(next_node)
-            G.nodes[next_node]["visited"] = True
+            if degree == 1:
+                if current_node in self._end_set:
+                    break
+                next_node = self.indices[self.indptr[current_node]]
 
-        elif len(current_neighbors) == 3:
-            if "direction_to_single" in G.nodes[current_node]:
-                # If the "direction_to_single" attribute is present, the node is traversed twice.
-                if G.nodes[current_node]["visited_neighbor"] == set():
-                    previous_node = travel_node_list[-2]
-                    G.nodes[current_node]["visited_neighbor"].add(previous_node)
+            elif degree == 2:
+                if current_node in self._end_set:
+                    # The curve is a loop
+                    break
 
-                    next_node = G.nodes[current_node]["direction_to_single"]
-                    G.nodes[current_node]["visited_neighbor"].add(next_node)
+                # One of the neighbor is the previous node, the other is the next node
+                # If it's not the case, return the current list
+                previous_node = travel[-2]
+                a, b = self.neighbors(current_node)
+                if previous_node == a:
+                    next_node = b
+                elif previous_node == b:
+                    next_node = a
                 else:
-                    for v in G.nodes[current_node]["visited_neighbor"]:
-                        current_neighbors.remove(v)
-
-                    if len(current_neighbors) != 1:
-                        # NOTE: this shouldn't happen, it is there to avoid errors and always return
-                        return travel_node_list
-                    next_node = current_neighbors[0]
-                    G.nodes[current_node]["visited_neighbor"].add(next_node)
-            else:
-                # Otherwise the node is not traversed twice and is thus en ending node.
-                previous_node = travel_node_list[-2]
-                G.nodes[current_node]["visited_neighbor"].add(previous_node)
+                    # NOTE: this shouldn't happen, it is there to avoid errors and always return
+                    return travel
+
+            elif degree == 3:
+                if current_node in self._direction_to_single:
+                    # If the "direction_to_single" attribute is present, the node is traversed
+                    # twice.
+                    if not visited_neighbor[current_node]:
+                        visited_neighbor[current_node].add(travel[-2])
+                        next_node = self._direction_to_single[current_node]
+                    else:
+                        remaining = [
+                            n
+                            for n in self.neighbors(current_node)
+                            if n not in visited_neighbor[current_node]
+                        ]
+                        if len(remaining) != 1:
+                            # NOTE: this shouldn't happen, it is there to avoid errors and always
+                            # return
+                            return travel
+                        next_node = remaining[0]
+                else:
+                    # Otherwise the node is not traversed twice and is thus en ending node.
+                    previous_node = travel[-2]
+                    visited_neighbor[current_node].add(previous_node)
 
-                best_continous_tangent = find_T_bar_directions(current_node, G)
-                try:
+                    best_continous_tangent = list(self._get_T_bar(current_node))
+                    if previous_node not in best_continous_tangent:
+                        break
                     best_continous_tangent.remove(previous_node)
                     next_node = best_continous_tangent[0]
-                except ValueError:
-                    terminate = True
-                    break
-
-                G.nodes[current_node]["visited_neighbor"].add(next_node)
-
-            travel_node_list.append(next_node)
-            G.nodes[next_node]["visited"] = True
 
-        elif len(current_neighbors) == 4:
-            previous_node = travel_node_list[-2]
-            next_node = get_next_node(current_node, previous_node, G)
+                visited_neighbor[current_node].add(next_node)
 
-            if next_node in G.nodes[current_node]["visited_neighbor"]:
-                # NOTE: this shouldn't happen, it is there to avoid errors and always return
-                return travel_node_list
-
-            G.nodes[current_node]["visited_neighbor"].add(previous_node)
-            G.nodes[current_node]["visited_neighbor"].add(next_node)
-
-            travel_node_list.append(next_node)
-            G.nodes[next_node]["visited"] = True
-
-        elif len(current_neighbors) % 2 == 0:
-            # If the node has an even number of neighbors, we always cross the node
-            next_node = travel_node_list[-2]
-            neighbor_cycle = G.nodes[current_node]["neighbor_cycle"]
-            for _ in range(len(current_neighbors) // 2):
-                next_node = neighbor_cycle.next(next_node)
-
-            travel_node_list.append(next_node)
-            G.nodes[next_node]["visited"] = True
-
-        else:
-            # If the node has an odd number of neighbors higher than 3, we stop the traversal
-            return travel_node_list
-
-    return travel_node_list
+            elif degree == 4:
+                previous_node = travel[-2]
+                self._first_stroke.setdefault(current_node, len(self._checkpoints) - 1)
+                if self._intersection_type[current_node] is None:
+                    raise KeyError(f"The node {self.nodes[current_node]} has no intersection_type.")
+                if self._intersection_type[current_node] == "crossing":
+                    next_node = self._crossing[current_node][previous_node]
+                else:
+                    next_node = self._tangent[current_node][previous_node]
 
+                if next_node in visited_neighbor[current_node]:
+                    # NOTE: this shouldn't happen, it is there to avoid errors and always return
+                    return travel
 
-def sample_new_starting_degree_2_node(G: nx.Graph) -> int:
-    """Given a graph, select an unvisited degree 2 node as a new starting point for the traversal..
+                visited_neighbor[current_node].add(previous_node)
+                visited_neighbor[current_node].add(next_node)
 
-    Args:
-        G (nx.Graph): The input graph.
+            elif degree % 2 == 0:
+                # If the node has an even number of neighbors, we always cross the node
+                next_node = self._crossing[current_node][travel[-2]]
 
-    Returns:
-        int: The index of the selected node.
-    """
-    possible_sample = [n for n in G.nodes if G.degree(n) == 2 and not G.nodes[n]["visited"]]
-
-    all_node_pos = np.array([G.nodes[n]["pos"] for n in G.nodes()])
-    impossible_sample = set()
-    for node in G.nodes:
-        if G.degree(node) > 2:
-            for n in G.neighbors(node):
-                if "dist" in G.nodes[n]:
-                    dist = G.nodes[n]["dist"]
-                else:
-                    print(f"Node {n} has no dist, continue")
-                    continue
-                # First find all the nodes that are close enough, that is the node inside the square
-                infinite_norm = np.max(np.abs(all_node_pos - G.nodes[n]["pos"][None, :]), axis=1)
-                close_enough = np.where(infinite_norm < dist)[0]
+            else:
+                # If the node has an odd number of neighbors higher than 3, we stop the traversal
+                return travel
+
+            travel.append(next_node)
+            self._visit(next_node)
+
+        return travel
+
+    def order_curve(self, end_node: List[int]) -> List[List[int]]:
+        """Travel the graph and order the nodes until all nodes have been visited.
+
+        The intersection types of the degree 4 nodes and the end nodes are read from the graph at
+        each call.
+
+        Args:
+            end_node (List[int]): The list of detected end nodes.
+
+        Returns:
+            List[List[int]]: A list containing all ordered strokes. An ordered stroke is a list of
+                ordered nodes.
+        """
+        G = self.G
+
+        # Initialize the traversal state
+        for row in self._crossroads:
+            G.nodes[self.nodes[row]].pop("direction_to_single", None)
+            G.nodes[self.nodes[row]].pop("is_direct_neighbor_single_neighbor_node", None)
+        annotate_crossroad_linked_to_single_neighbor_node(G, end_node)
+        self._direction_to_single = {
+            row: self.row[G.nodes[self.nodes[row]]["direction_to_single"]]
+            for row in self._crossroads
+            if "direction_to_single" in G.nodes[self.nodes[row]]
+        }
+        self._intersection_type = {
+            row: G.nodes[self.nodes[row]].get("intersection_type") for row in self._degree_4
+        }
+        self._visited_neighbor = {row: set() for row in self._crossroads}
+        self._visited = bytearray(len(self.nodes))
+        self._n_visited = 0
+        self._sample_cursor = 0
+        self._sampling = False
+        self._end = []
+        self._end_set = set()
+        for node in end_node:
+            self._add_end_node(self.row[node])
+
+        self._node_lists: List[List[int]] = []
+        self._checkpoints: List[Tuple] = []
+        self._first_stroke: Dict[int, int] = {}
+        return self._travel_remaining_strokes()
+
+    def update_intersection_types(self, nodes: List[int]) -> List[List[int]]:
+        """Order the nodes again after the intersection type of some degree 4 nodes changed in the
+        graph, since the last call to order_curve or update_intersection_types.
+
+        The strokes travelled before the first one going through a changed node do not depend on
+        its type, so the traversal is resumed from that stroke instead of starting over. The result
+        is the same as calling order_curve again with the same end nodes.
+
+        Args:
+            nodes (List[int]): The nodes whose "intersection_type" attribute changed.
+
+        Returns:
+            List[List[int]]: A list containing all ordered strokes. An ordered stroke is a list of
+                ordered nodes.
+        """
+        rows = [self.row[node] for node in nodes]
+        for row in rows:
+            self._intersection_type[row] = self.G.nodes[self.nodes[row]].get("intersection_type")
+
+        first_stroke = min(
+            (self._first_stroke[row] for row in rows if row in self._first_stroke),
+            default=len(self._checkpoints),
+        )
+        if first_stroke < len(self._checkpoints):
+            self._restore_checkpoint(first_stroke)
+        return self._travel_remaining_strokes()
+
+    def _save_checkpoint(self) -> None:
+        self._checkpoints.append(
+            (
+                self._sampling,
+                bytes(self._visited),
+                self._n_visited,
+                {row: set(v) for row, v in self._visited_neighbor.items() if v},
+                list(self._end),
+                self._sample_cursor,
+            )
+        )
+
+    def _restore_checkpoint(self, stroke: int) -> None:
+        """Bring the traversal back to the state it had before travelling a stroke."""
+        sampling, visited, n_visited, visited_neighbor, end, sample_cursor = self._checkpoints[
+            stroke
+        ]
+        self._sampling = sampling
+        self._visited = bytearray(visited)
+        self._n_visited = n_visited
+        self._visited_neighbor = {
+            row: set(visited_neighbor.get(row, ())) for row in self._crossroads
+        }
+        self._end = list(end)
+        self._end_set = set(end)
+        self._sample_cursor = sample_cursor
+
+        del self._checkpoints[stroke:]
+        del self._node_lists[stroke:]
+        self._first_stroke = {row: s for row, s in self._first_stroke.items() if s < stroke}
+
+    def _travel_remaining_strokes(self) -> List[List[int]]:
+        node_lists = self._node_lists
+        while True:
+            # Travel the graph starting from the detected end nodes, then, while all nodes have not
+            # been visited, start from a random node
+            if not self._sampling and len(self._end) <= 1:
+                self._sampling = True
+            if self._sampling and self._n_visited == len(self.nodes):
+                break
 
-                # Then remove the nodes that are inside the circle
-                l2_norm = np.linalg.norm(
-                    all_node_pos[close_enough] - G.nodes[n]["pos"][None, :], axis=1
-                )
-                close = close_enough[l2_norm < dist]
-                impossible_sample.update(close)
+            # Saving the state is O(N), so it is only done before each stroke when needed
+            if self.incremental or not self._checkpoints:
+                self._save_checkpoint()
+            if not self._sampling:
+                start_from = self._end[0]
+                self._remove_end_node(start_from)
+                node_lists.append(self._travel_starting_from(start_from))
+                if node_lists[-1][-1] in self._end_set:
+                    self._remove_end_node(node_lists[-1][-1])
+                continue
+
+            # Select a node that has not been visited yet, and travel starting from it
+            start_from = self._sample_new_starting_degree_2_node()
+            self._add_end_node(start_from)
+            self._visit(start_from)
+            node_lists.append(self._travel_starting_from(start_from))
+
+            if node_lists[-1][-1] == start_from:
+                # There is a loop
+                self._remove_end_node(start_from)
+            else:
+                # No loop, travel again from the same starting node but in the other direction
+                if node_lists[-1][-1] in self._end_set:
+                    self._remove_end_node(node_lists[-1][-1])
+                new = self._travel_starting_from(start_from)[::-1][:-1]
+                node_lists[-1] = new + node_lists[-1]
 
-    for sample in impossible_sample:
-        while sample in possible_sample:
-            possible_sample.remove(sample)
+                if new[0] in self._end_set:
+                    self._remove_end_node(new[0])
 
-    return possible_sample[0]
+        return [[self.nodes[row] for row in node_list] for node_list in node_lists]
 
 
 def order_curve(G: nx.Graph, end_node: List[int]) -> List[List[int]]:
@@ -188,50 +411,4 @@ def order_curve(G: nx.Graph, end_node: List[int]) -> List[List[int]]:
         List[List[int]]: A list containing all ordered strokes. An ordered stroke is a list of
             ordered nodes.
     """
-    # Initialize attributes of the nodes
-    for node in G.nodes():
-        if G.degree(node) > 2:
-            G.nodes[node]["visited_neighbor"] = set()
-            G.nodes[node].pop("direction_to_single", None)
-            G.nodes[node].pop("is_direct_neighbor_single_neighbor_node", None)
-        if G.degree(node) > 2 and G.degree(node) % 2 == 0:
-            G.nodes[node]["neighbor_cycle"] = ClockwiseNeighborCycle(node, G)
-    annotate_crossroad_linked_to_single_neighbor_node(G, end_node)
-    nx.set_node_attributes(G, False, "visited")
-
-    # Travel the graph starting from the detected end nodes
-    node_lists = []
-    while len(end_node) > 1:
-        start_from = end_node.pop(0)
-        node_lists.append(travel_graph_starting_from(G, start_from, end_node))
-        if node_lists[-1][-1] in end_node:
-            end_node.remove(node_lists[-1][-1])
-
-        visited_nodes = np.array(list(nx.get_node_attributes(G, "visited", default=False).values()))
-        # print(f"Number of visited nodes: {np.sum(visited_nodes)} / {len(G.nodes)}")
-
-    # While all nodes have not been visited, start from a random node
-    visited_nodes = np.array(list(nx.get_node_attributes(G, "visited", default=False).values()))
-    while visited_nodes.sum() != len(G.nodes):
-        # Select a node that has not been visited yet, and travel starting from it
-        start_from = sample_new_starting_degree_2_node(G)
-        end_node.append(start_from)
-        G.nodes[start_from]["visited"] = True
-        node_lists.append(travel_graph_starting_from(G, start_from, end_node))
-
-        if node_lists[-1][-1] == start_from:
-            # There is a loop
-            end_node.remove(start_from)
-        else:
-            # No loop, travel again from the same starting node but in the other direction
-            if node_lists[-1][-1] in end_node:
-                end_node.remove(node_lists[-1][-1])
-            new = travel_graph_starting_from(G, start_from, end_node)[::-1][:-1]
-            node_lists[-1] = new + node_lists[-1]
-
-            if new[0] in end_node:
-                end_node.remove(new[0])
-
-        visited_nodes = np.array(list(nx.get_node_attributes(G, "visited", default=False).values()))
-        # print(f"Number of visited nodes: {np.sum(visited_nodes)} / {len(G.nodes)}")
-    return node_lists
+    return TraversalGraph(G).order_curve(end_node)
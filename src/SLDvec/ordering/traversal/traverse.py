@@ -1,12 +1,12 @@
-import copy
 from typing import List
 
 import networkx as nx
 import numpy as np
 
 from SLDvec.ordering.intersection import ModelPredictor, get_crop
+from SLDvec.utils.networkx import get_chain_index, get_spatial_index
 
-from .travel import order_curve
+from .travel import TraversalGraph
 
 
 def traverse_graph(
@@ -31,19 +31,23 @@ def traverse_graph(
     Returns:
         List[List[int]]: The list of ordered nodes. Each list in this list represents a stroke.
     """
-    # Predict all intersections of degree 4
-    for node in G.nodes():
-        if G.degree(node) == 4:
-            if "intersection_type" not in G.nodes[node]:
-                crop = get_crop(G, image, node)
-                intersection_type, confidence1, confidence2 = model(crop)
-                G.nodes[node]["intersection_type"] = intersection_type
-                G.nodes[node]["intersection_confidence_1"] = confidence1
-                G.nodes[node]["intersection_confidence_2"] = confidence2
+    # Predict all intersections of degree 4, in a single batched call to the model
+    to_predict = [
+        node
+        for node in G.nodes()
+        if G.degree(node) == 4 and "intersection_type" not in G.nodes[node]
+    ]
+    index, spatial_index = get_chain_index(G), get_spatial_index(G)
+    crops = [get_crop(G, image, node, index, spatial_index) for node in to_predict]
+    predictions = model.predict_batch(crops)
+    for node, (intersection_type, confidence1, confidence2) in zip(to_predict, predictions):
+        G.nodes[node]["intersection_type"] = intersection_type
+        G.nodes[node]["intersection_confidence_1"] = confidence1
+        G.nodes[node]["intersection_confidence_2"] = confidence2
 
     # Order the nodes
-    end_node = terminating_node.copy()
-    ordered_node_lists = order_curve(G, end_node)
+    traversal = TraversalGraph(G, incremental=force_single_line)
+    ordered_node_lists = traversal.order_curve(terminating_node)
 
     # If we don't want to force the output to be made of a single line, we return the result
     if not force_single_line:
@@ -78,9 +82,10 @@ def traverse_graph(
             )
 
             # The nodes are switched one by one, starting with the ones with the lowest confidence
-            # until the graph is ordered in a single stroke, or all the nodes have been switched
-            best_ordered_node_lists = copy.deepcopy(ordered_node_lists)
-            best_stroke_number = len(best_ordered_node_lists)
+            # until the graph is ordered in a single stroke, or all the nodes have been switched.
+            # Only the stroke number is compared, and the traversal is resumed from the first
+            # stroke going through the switched node instead of starting over.
+            best_stroke_number = len(ordered_node_lists)
             switch_back_node = []
             for node in degree_4_node_common_to_multiple_curves:
                 if G.nodes[node]["intersection_type"] == "crossing":
@@ -88,15 +93,13 @@ def traverse_graph(
                 else:
                     G.nodes[node]["intersection_type"] = "crossing"
 
-                end_node = terminating_node.copy()
-                ordered_node_lists = order_curve(G, end_node)
+                ordered_node_lists = traversal.update_intersection_types([node])
                 switch_back_node.append(node)
                 if len(ordered_node_lists) == 1:
                     return ordered_node_lists
 
                 if len(ordered_node_lists) <= best_stroke_number:
                     best_stroke_number = len(ordered_node_lists)
-                    best_ordered_node_lists = copy.deepcopy(ordered_node_lists)
                     switch_back_node = []
 
             # This nodes were not switched in the best result, so we switch them back
@@ -106,4 +109,4 @@ def traverse_graph(
                 else:
                     G.nodes[node]["intersection_type"] = "crossing"
 
-            return best_ordered_node_lists
+            return traversal.update_intersection_types(switch_back_node)
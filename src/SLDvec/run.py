@@ -3,20 +3,21 @@ import threading
 import time
 from itertools import cycle
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Union
 
 import networkx as nx
 
-from SLDvec.fitting import fit_all_curves
+from SLDvec.fitting import fit_all_curves, reduce_all_curves
 from SLDvec.ordering import ModelPredictor, get_stroke_order
 from SLDvec.preprocessing import binarize_image, load_image, potrace_vectorize
-from SLDvec.skeleton import get_medial_axis
-from SLDvec.utils.svg import export_svg as export
+from SLDvec.skeleton import decimate_degree_2_chains, get_medial_axis
+from SLDvec.utils.export import export_curves, get_output_suffix
 
 
 class LoadingIndicator:
-    def __init__(self):
+    def __init__(self, enabled: bool = True):
         self.spinner = cycle(["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"])
+        self.enabled = enabled
         self.running = False
         self.current_status = ""
 
@@ -34,6 +35,8 @@ class LoadingIndicator:
 
     def start(self, initial_status: str = ""):
         """Start the loading animation."""
+        if not self.enabled:
+            return
         self.running = True
         self.current_status = initial_status
         self.thread = threading.Thread(target=self.animate)
@@ -41,6 +44,8 @@ class LoadingIndicator:
 
     def stop(self):
         """Stop the loading animation."""
+        if not self.enabled:
+            return
         self.running = False
         self.thread.join()
         sys.stdout.flush()
@@ -48,28 +53,47 @@ class LoadingIndicator:
     def complete(self, status: str):
         """Complete the loading animation and print a final status message."""
         self.stop()
-        print(status)
+        if self.enabled:
+            print(status)
 
 
 def run(
-    image_path: Path,
-    output_path: Path,
+    image_path: Union[Path, IO[bytes]],
+    output_path: Union[Path, IO[bytes]],
     intersection_predictor: ModelPredictor,
     thresh: Optional[float] = None,
     multiple_lines: bool = False,
+    verbose: bool = True,
+    decimation_tolerance: Optional[float] = None,
+    reduction_tolerance: Optional[float] = None,
+    output_format: str = "svg",
 ):
-    """Run the method on a single image. Save the result as an SVG file.
+    """Run the method on a single image. Save the result as an SVG file, or in one of the other
+    output formats.
 
     Args:
-        image_path (Path): Path to the input image.
-        output_path (Path): Path to the output SVG file.
+        image_path (Union[Path, IO[bytes]]): Path to the input image, or a binary buffer containing
+            the encoded image.
+        output_path (Union[Path, IO[bytes]]): Path to the output file, or a binary buffer.
         intersection_predictor (ModelPredictor): The model to use for intersection classification.
         thresh (Optional[float], optional): To set the threshold. Defaults to None.
         multiple_lines (bool, optional): Wheter the input image contains multiple lines. Defaults
             to False.
+        verbose (bool, optional): Whether to print the progress of the method, and the statistics of
+            the reduction of each stroke if reduction_tolerance is set. Defaults to True.
+        decimation_tolerance (Optional[float], optional): If set, the degree 2 chains of the medial
+            axis are simplified with this tolerance in pixels before ordering. Defaults to None.
+        reduction_tolerance (Optional[float], optional): If set, consecutive Bezier curves are
+            merged when the merged curve stays within this tolerance in pixels. Defaults to None.
+        output_format (str, optional): The output format, "svg", "svgz", "npz" or "bin" (see
+            export_curves). Defaults to "svg".
     """
-    loading = LoadingIndicator()
-    print(f"⏳ Vectorizing : {image_path}")
+    # Check the output format before spending time on the vectorization
+    get_output_suffix(output_format)
+
+    loading = LoadingIndicator(enabled=verbose)
+    if verbose:
+        print(f"⏳ Vectorizing : {image_path}")
 
     try:
         # Load the image
@@ -91,6 +115,10 @@ def run(
             simplified_medial_axis = simplified_medial_axis.subgraph(
                 max(nx.connected_components(simplified_medial_axis), key=len)
             )
+        if decimation_tolerance is not None:
+            simplified_medial_axis = decimate_degree_2_chains(
+                simplified_medial_axis, decimation_tolerance
+            )
         node_lists, terminating_node = get_stroke_order(
             G=simplified_medial_axis,
             image=image,
@@ -106,13 +134,32 @@ def run(
         )
         loading.stop()
 
-        # Export the SVG
-        loading.start("Exporting the SVG...")
-        dwg = export(orig_image_shape, scale_ratio, splines, output_path)
-        dwg.save()
-        loading.complete("\tSuccessfully vectorized the line drawing.")
-
-        print(f"\033[F \033[F✅ Successfully vectorized: {image_path}")
+        # Merge the Bezier curves that can be merged
+        status = "\tSuccessfully vectorized the line drawing."
+        reduction_stats = []
+        if reduction_tolerance is not None:
+            loading.start("Reducing the curves...")
+            splines, reduction_stats = reduce_all_curves(splines, reduction_tolerance)
+            n_before = sum(stats.n_segments_before for stats in reduction_stats)
+            n_after = sum(stats.n_segments_after for stats in reduction_stats)
+            status = (
+                "\tSuccessfully vectorized the line drawing, "
+                f"reduced from {n_before} to {n_after} Bezier curves."
+            )
+            loading.stop()
+
+        # Export the curves
+        loading.start(f"Exporting the {output_format.upper()} file...")
+        export_curves(orig_image_shape, scale_ratio, splines, output_path, output_format)
+        loading.complete(status)
+
+        if verbose:
+            print(f"\033[F \033[F✅ Successfully vectorized: {image_path}")
+            for i, stats in enumerate(reduction_stats):
+                print(
+                    f"\tStroke {i}: {stats.n_segments_before} -> {stats.n_segments_after} Bezier "
+                    f"curves (max error {stats.max_error:.2f} px)"
+                )
 
     except Exception as e:
         loading.complete(f"\tAn error occurred: {e}")
@@ -1,21 +1,65 @@
+from typing import Optional, Tuple
+
 import networkx as nx
 
+from .decimation import decimate_degree_2_chains
 from .medial_axis import medial_axis_wrapper
 from .simplification import merge_3_neighbords_node
-from .vanishing_angle import vanishing_angle_wrapper
+from .vanishing_angle import (
+    compute_vanishing_angles,
+    get_vanishing_angle_threshold,
+    prune_vanishing_angle,
+    vanishing_angle_wrapper,
+)
 
 
-def get_medial_axis(curves, multiple_lines: bool = False):
-    # Compute the Medial Axis
+def get_medial_axis_hierarchy(curves) -> Tuple[nx.Graph, nx.Graph]:
+    """Compute the medial axis of the curves and the vanishing angle of each of its edges.
+    This is the expensive part of get_medial_axis, and does not depend on the pruning threshold:
+    the returned hierarchy can be simplified with any threshold using simplify_medial_axis.
+
+    Returns:
+        Tuple[nx.Graph, nx.Graph]: The medial axis, and a copy of it with nodes renamed to ordered
+            integers and the vanishing angle of each edge.
+    """
     G = medial_axis_wrapper(curves=curves)
-    G_simplified = G.copy()
+    G_hierarchy = compute_vanishing_angles(G.copy())
+    return G, G_hierarchy
+
+
+def simplify_medial_axis(
+    G_hierarchy: nx.Graph, multiple_lines: bool = False, threshold: Optional[float] = None
+) -> nx.Graph:
+    """Prune a medial axis hierarchy and merge its 3 neighbors nodes. The hierarchy is not modified.
+
+    Args:
+        G_hierarchy (nx.Graph): The hierarchy returned by get_medial_axis_hierarchy.
+        multiple_lines (bool, optional): Used to choose the threshold if it is not set. Defaults to
+            False.
+        threshold (Optional[float], optional): The vanishing angle threshold. Defaults to None.
 
-    # Compute the vanishing angle and filter the graph arccordingly
-    G_simplified = vanishing_angle_wrapper(G_simplified, multiple_lines=multiple_lines)
+    Returns:
+        nx.Graph: The simplified medial axis.
+    """
+    if threshold is None:
+        threshold = get_vanishing_angle_threshold(multiple_lines)
+
+    # Filter the graph according to the vanishing angle
+    G_simplified = prune_vanishing_angle(G_hierarchy, threshold)
 
     # Merge 3 neighbors node
     G_simplified = merge_3_neighbords_node(G_simplified)
 
     G_simplified = nx.convert_node_labels_to_integers(G_simplified)
 
+    return G_simplified
+
+
+def get_medial_axis(curves, multiple_lines: bool = False):
+    # Compute the Medial Axis and the vanishing angles
+    G, G_hierarchy = get_medial_axis_hierarchy(curves)
+
+    # Filter the graph arccordingly and simplify it
+    G_simplified = simplify_medial_axis(G_hierarchy, multiple_lines=multiple_lines)
+
     return G, G_simplified
@@ -0,0 +1,154 @@
+from typing import List, Set
+
+import networkx as nx
+import numpy as np
+
+from SLDvec import DECIMATION_MAX_SEGMENT_LENGTH, NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION
+from SLDvec.utils.networkx import get_chain_index, get_spatial_index
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float, max_length: float) -> np.ndarray:
+    """Simplify a polyline with the Douglas-Peucker algorithm.
+    The first and last points are always kept, and every removed point is closer than tolerance to
+    the segment joining the two kept points around it. Segments longer than max_length are split
+    again at their middle point, so that the simplified polyline stays dense enough for the spline
+    fitting.
+
+    Args:
+        points (np.ndarray): The points of the polyline, of shape (N, 2).
+        tolerance (float): The maximum distance between a removed point and the simplified polyline.
+        max_length (float): The maximum length of a segment of the simplified polyline, unless it
+            joins two consecutive points.
+
+    Returns:
+        np.ndarray: A boolean mask of shape (N,), True for the points to keep.
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+
+    # Segments still to simplify, as (first, last) indices. A stack avoids deep recursions on the
+    # long chains of the medial axis.
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        segment = end - start
+        length = np.hypot(segment[0], segment[1])
+        inner = points[first + 1 : last] - start
+        if length > 0:
+            # Distance to the closest point of the segment, the projection being clamped to its ends
+            t = np.clip((inner @ segment) / (length * length), 0.0, 1.0)
+            offset = inner - t[:, None] * segment
+        else:
+            offset = inner
+        distances = np.hypot(offset[:, 0], offset[:, 1])
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+        elif length > max_length:
+            split = (first + last) // 2
+        else:
+            continue
+        keep[split] = True
+        stack.append((first, split))
+        stack.append((split, last))
+    return keep
+
+
+def get_protected_nodes(G: nx.Graph) -> Set[int]:
+    """Return the degree 2 nodes that the other steps of the method read around crossroad nodes,
+    and that should therefore never be removed by the decimation:
+    - the nodes used to compute the tangents at the end of each chain (see get_tangent),
+    - the nodes inside the circle of a neighbor of a crossroad node, of radius equal to the distance
+        to the border of the shape (see filter_points).
+
+    Args:
+        G (nx.Graph): The graph to decimate.
+
+    Returns:
+        Set[int]: The protected nodes.
+    """
+    protected = set()
+
+    index = get_chain_index(G)
+    for chain, cyclic in zip(index.chains, index.cyclic):
+        if not cyclic:
+            protected.update(chain[:NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION])
+            protected.update(chain[-NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION:])
+
+    spatial_index = get_spatial_index(G)
+    for node, degree in G.degree():
+        if degree <= 2:
+            continue
+        for n in G.neighbors(node):
+            dist = G.nodes[n]["dist"] if "dist" in G.nodes[n] else 0
+            protected.update(spatial_index.within_radius(G.nodes[n]["pos"], dist))
+
+    return protected
+
+
+def _get_anchored_runs(chain: List[int], cyclic: bool, protected: Set[int]) -> List[List[int]]:
+    """Split a chain into runs of nodes that can be decimated, each run starting and ending with a
+    node that is kept."""
+    if cyclic:
+        # A cycle is anchored at four nodes, so that it stays a cycle of at least four nodes
+        if len(chain) < 8:
+            return []
+        anchors = {chain[i * len(chain) // 4] for i in range(4)}
+        chain = chain + [chain[0]]
+    else:
+        anchors = {chain[0], chain[-1]}
+
+    runs = []
+    current = [chain[0]]
+    for node in chain[1:]:
+        current.append(node)
+        if node in anchors or node in protected:
+            if len(current) > 2:
+                runs.append(current)
+            current = [node]
+    return runs
+
+
+def decimate_degree_2_chains(
+    G_: nx.Graph, tolerance: float, max_length: float = DECIMATION_MAX_SEGMENT_LENGTH
+) -> nx.Graph:
+    """Remove degree 2 nodes of the graph with the Douglas-Peucker algorithm, to reduce the number of
+    nodes the ordering and the fitting have to go through.
+    Crossroad nodes, end nodes and the protected nodes around crossroad nodes (see
+    get_protected_nodes) are kept, and every removed node is closer than tolerance to the edge that
+    replaces it.
+
+    Args:
+        G_ (nx.Graph): The graph to decimate. Each node should have a "pos" attribute.
+        tolerance (float): The maximum distance between a removed node and the simplified graph, in
+            pixels. No node is removed if it is not positive.
+        max_length (float, optional): The maximum length of the new edges, in pixels. Defaults to
+            DECIMATION_MAX_SEGMENT_LENGTH.
+
+    Returns:
+        nx.Graph: A copy of the original graph with the degree 2 chains decimated.
+    """
+    G = G_.copy()
+    if not tolerance > 0:
+        return G
+
+    protected = get_protected_nodes(G)
+    index = get_chain_index(G)
+
+    to_remove = []
+    new_edges = []
+    for chain, cyclic in zip(index.chains, index.cyclic):
+        for run in _get_anchored_runs(chain, cyclic, protected):
+            points = np.array([G.nodes[n]["pos"] for n in run], dtype=float)
+            keep = douglas_peucker(points, tolerance, max_length)
+            kept = [n for n, k in zip(run, keep) if k]
+            to_remove.extend(n for n, k in zip(run, keep) if not k)
+            new_edges.extend(zip(kept[:-1], kept[1:]))
+
+    G.remove_nodes_from(to_remove)
+    G.add_edges_from(new_edges)
+    return G
@@ -36,20 +36,24 @@ def medial_axis_wrapper(
     voronoi = Voronoi(all_points)
 
     # Extract the medial axis from the voronoi diagram
-    nodes, edges = medialAxis(
+    node_ids, positions, dists, edge_index, object_angles = medialAxis(
+        ridge_points=voronoi.ridge_points,
+        ridge_vertices=np.asarray(voronoi.ridge_vertices, dtype=np.intc),
         points=voronoi.points,
         vertices=voronoi.vertices,
-        ridge_points=voronoi.ridge_points,
-        ridge_vertices=voronoi.ridge_vertices,
-        sample=sample_points,
+        contour_sizes=np.array([len(v) - 1 for v in sample_points], dtype=np.intc),
     )
 
     # Convert the medial axis to a networkx graph
     G = nx.Graph()
-    for idx, n in nodes.items():
-        G.add_node(idx, pos=np.array(n.pos), dist=n.dist, uuid=uuid.uuid4())
-    for idx, e in edges.items():
-        G.add_edge(e.node1, e.node2, object_angle=e.object_angle)
+    G.add_nodes_from(
+        (idx, dict(pos=pos, dist=dist, uuid=uuid.uuid4()))
+        for idx, pos, dist in zip(node_ids.tolist(), positions, dists.tolist())
+    )
+    G.add_edges_from(
+        (u, v, dict(object_angle=angle))
+        for (u, v), angle in zip(edge_index.tolist(), object_angles.tolist())
+    )
     G.graph["ghost"] = dict()
 
     return G
@@ -10,60 +10,108 @@
 #include "utils.h"
 
 /**
- * @brief Helper function to find the root parent of a node in the disjoint set
- * @details Recursively finds and returns the root parent of a node while performing
- *          path compression for optimization.
- *
- * @param parent Reference to unordered map storing parent relationships
- * @param x Node index whose root parent needs to be found
- * @return int Index of the root parent
+ * @brief Disjoint-set forest over the integers 0 to n - 1
+ * @details Uses path compression in find and union by rank, so that any sequence of operations
+ *          runs in quasi-linear time.
  */
-inline int merge(std::unordered_map<int, int> &parent, int x)
+struct DisjointSet
 {
-    if (parent[x] == x)
+    std::vector<int> parent; ///< Parent of each element, roots are their own parent
+    std::vector<int> rank;   ///< Upper bound on the height of the tree of each root
+
+    explicit DisjointSet(int n) : parent(n), rank(n, 0)
     {
-        return x;
+        for (int i = 0; i < n; i++)
+        {
+            parent[i] = i;
+        }
     }
-    return merge(parent, parent[x]);
-}
+
+    /**
+     * @brief Finds the root of the set containing an element
+     * @details All the elements on the path to the root are re-attached directly to it.
+     *
+     * @param x Element whose root needs to be found
+     * @return int Root of the set containing x
+     */
+    int find(int x)
+    {
+        int root = x;
+        while (parent[root] != root)
+        {
+            root = parent[root];
+        }
+        while (parent[x] != root)
+        {
+            int next = parent[x];
+            parent[x] = root;
+            x = next;
+        }
+        return root;
+    }
+
+    /**
+     * @brief Merges the sets containing two elements
+     *
+     * @param x First element
+     * @param y Second element
+     */
+    void merge(int x, int y)
+    {
+        x = find(x);
+        y = find(y);
+        if (x == y)
+        {
+            return;
+        }
+        if (rank[x] < rank[y])
+        {
+            std::swap(x, y);
+        }
+        parent[y] = x;
+        if (rank[x] == rank[y])
+        {
+            rank[x]++;
+        }
+    }
+};
 
 /**
  * @brief Identifies all connected components in an undirected graph
- * @details Implementation based on union-find algorithm with path compression.
- *          Source: https://www.geeksforgeeks.org/connected-components-in-an-undirected-graph/
+ * @details Implementation based on a union-find with path compression and union by rank. The
+ *          node indices are first mapped to consecutive integers so that the disjoint set can be
+ *          stored in flat arrays.
  *
  * @param nodes Reference to unordered map containing node information keyed by node index
- * @param edges Reference to unordered map containing edge information keyed by edge identifier
+ * @param edges Reference to unordered map containing edge information keyed by packed edge key
  * @return std::unordered_map<int, std::list<int>> Map of component parent indices to lists of node indices in that component
  */
-std::unordered_map<int, std::list<int>> connectedComponent(std::unordered_map<int, NodeInfo> &nodes, std::unordered_map<std::string, EdgeInfo> &edges)
+std::unordered_map<int, std::list<int>> connectedComponent(std::unordered_map<int, NodeInfo> &nodes, std::unordered_map<std::int64_t, EdgeInfo> &edges)
 {
-    std::unordered_map<int, int> parent;
+    std::vector<int> node_ids;
+    std::unordered_map<int, int> dense_index;
+    node_ids.reserve(nodes.size());
+    dense_index.reserve(nodes.size());
     for (auto const &[idx, node] : nodes)
     {
-        parent[idx] = idx;
+        dense_index[idx] = node_ids.size();
+        node_ids.push_back(idx);
     }
 
-    // Loop to set parent of each nodes
+    DisjointSet sets(node_ids.size());
     for (auto const &[key, edge] : edges)
     {
-        parent[merge(parent, edge.node1)] = merge(parent, edge.node2);
-    }
-
-    // Loop to merge all component
-    for (auto const &[idx, node] : nodes)
-    {
-        parent[idx] = merge(parent, parent[idx]);
+        sets.merge(dense_index.at(edge.node1), dense_index.at(edge.node2));
     }
 
     // map to store the parent and the different connected component
     std::unordered_map<int, std::list<int>> connected_component;
-    for (auto const &[idx, node] : nodes)
+    for (std::size_t i = 0; i < node_ids.size(); i++)
     {
-        connected_component[parent[idx]].push_back(idx);
+        connected_component[node_ids[sets.find(i)]].push_back(node_ids[i]);
     }
 
     return connected_component;
 }
 
-#endif // CONNECTED_COMPONENT_H
\ No newline at end of file
+#endif // CONNECTED_COMPONENT_H
@@ -0,0 +1,143 @@
+// crossing_number.h
+#ifndef CROSSING_NUMBER_H
+#define CROSSING_NUMBER_H
+
+#include <vector>
+#include <cmath>
+#include <algorithm>
+
+/**
+ * @brief Point-in-shape test for a set of closed curves, using the even-odd rule.
+ *
+ * A point is inside the shape if a horizontal ray starting from it crosses the curves an odd
+ * number of times. This has the same parity as the sum of the winding numbers of the curves
+ * around the point, but only needs one comparison per segment instead of one atan2.
+ *
+ * The segments are bucketed into horizontal rows covering the bounding box of the shape, so
+ * that a query only tests the segments whose vertical extent overlaps the row of the point.
+ *
+ * @example
+ *     std::vector<std::vector<std::pair<double, double>>> curves = {{
+ *         {0.0, 0.0}, {1.0, 0.0}, {1.0, 1.0}, {0.0, 1.0}, {0.0, 0.0}
+ *     }};
+ *     CrossingNumberIndex shape(curves);
+ *     bool inside = shape.contains({0.5, 0.5}); // true
+ */
+class CrossingNumberIndex
+{
+public:
+    /**
+     * @brief Builds the index of a set of closed curves
+     *
+     * @param curves The points sampled on each curve. Each curve should be closed (i.e., the
+     *               last point is equal to the first one).
+     */
+    explicit CrossingNumberIndex(const std::vector<std::vector<std::pair<double, double>>> &curves)
+    {
+        for (const std::vector<std::pair<double, double>> &curvePoints : curves)
+        {
+            for (std::size_t j = 0; j + 1 < curvePoints.size(); ++j)
+            {
+                segments.push_back({curvePoints[j].first, curvePoints[j].second,
+                                    curvePoints[j + 1].first, curvePoints[j + 1].second});
+            }
+        }
+        if (segments.empty())
+        {
+            return;
+        }
+
+        yMin = INFINITY;
+        yMax = xMax = -INFINITY;
+        for (const Segment &s : segments)
+        {
+            yMin = std::min({yMin, s.y1, s.y2});
+            yMax = std::max({yMax, s.y1, s.y2});
+            xMax = std::max({xMax, s.x1, s.x2});
+        }
+
+        // About sqrt(n) rows, so that each row holds about sqrt(n) segments
+        nRows = std::max(1, (int)std::sqrt((double)segments.size()));
+        rowHeight = (yMax - yMin) / nRows;
+
+        // Count the segments of each row, then fill them in a compressed layout
+        rowStart.assign(nRows + 1, 0);
+        for (const Segment &s : segments)
+        {
+            for (int r = row(std::min(s.y1, s.y2)); r <= row(std::max(s.y1, s.y2)); ++r)
+            {
+                rowStart[r + 1]++;
+            }
+        }
+        for (int r = 0; r < nRows; ++r)
+        {
+            rowStart[r + 1] += rowStart[r];
+        }
+        rowSegments.resize(rowStart[nRows]);
+        std::vector<int> fill(rowStart.begin(), rowStart.end() - 1);
+        for (std::size_t i = 0; i < segments.size(); ++i)
+        {
+            const Segment &s = segments[i];
+            for (int r = row(std::min(s.y1, s.y2)); r <= row(std::max(s.y1, s.y2)); ++r)
+            {
+                rowSegments[fill[r]++] = i;
+            }
+        }
+    }
+
+    /**
+     * @brief Checks whether a point is inside the shape
+     *
+     * @param targetPoint The (x,y) coordinates of the point to test.
+     * @return true if the point is inside an odd number of curves.
+     */
+    bool contains(const std::pair<double, double> &targetPoint) const
+    {
+        const double x = targetPoint.first;
+        const double y = targetPoint.second;
+        if (segments.empty() || y < yMin || y > yMax || x > xMax)
+        {
+            return false;
+        }
+
+        bool inside = false;
+        const int r = row(y);
+        for (int k = rowStart[r]; k < rowStart[r + 1]; ++k)
+        {
+            const Segment &s = segments[rowSegments[k]];
+            // Half-open test on y so that a ray through a vertex is only counted once
+            if ((s.y1 > y) != (s.y2 > y))
+            {
+                double xCross = s.x1 + (y - s.y1) * (s.x2 - s.x1) / (s.y2 - s.y1);
+                if (x < xCross)
+                {
+                    inside = !inside;
+                }
+            }
+        }
+        return inside;
+    }
+
+private:
+    struct Segment
+    {
+        double x1, y1, x2, y2;
+    };
+
+    std::vector<Segment> segments; ///< All the segments of all the curves
+    std::vector<int> rowStart;     ///< Offset of the segments of each row in rowSegments
+    std::vector<int> rowSegments;  ///< Indices of the segments overlapping each row
+    int nRows = 0;
+    double yMin = 0, yMax = 0, xMax = 0, rowHeight = 0;
+
+    int row(double y) const
+    {
+        if (rowHeight <= 0)
+        {
+            return 0;
+        }
+        return std::clamp((int)((y - yMin) / rowHeight), 0, nRows - 1);
+    }
+};
+
+#endif // CROSSING_NUMBER_H
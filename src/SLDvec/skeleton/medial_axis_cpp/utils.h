@@ -6,6 +6,7 @@
 #include <cmath>
 #include <algorithm>
 #include <tuple>
+#include <cstdint>
 #include <unordered_set>
 
 /**
@@ -35,6 +36,23 @@ struct EdgeInfo
     double objectAngle; ///< Angle of the object associated with this edge
 };
 
+/**
+ * @brief Packs the two node indices of an undirected edge into a single integer key
+ *
+ * The key does not depend on the order of the two indices, so that an edge can be looked up
+ * from either of its nodes.
+ *
+ * @param node1 Index of the first node
+ * @param node2 Index of the second node
+ * @return std::int64_t Key of the edge
+ */
+inline std::int64_t edgeKey(int node1, int node2)
+{
+    std::int64_t low = std::min(node1, node2);
+    std::int64_t high = std::max(node1, node2);
+    return (high << 32) | low;
+}
+
 /**
  * @brief Normalize a given 2D vector
  *
@@ -1,28 +1,46 @@
 // voronoi_pruning.cpp
 #include <vector>
+#include <algorithm>
+#include <cstdint>
 #include <unordered_set>
 #include <unordered_map>
 #include "utils.h"
-#include "winding_number.h"
+#include "crossing_number.h"
 #include "connected_component.h"
 
 #include <pybind11/pybind11.h>
-#include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 namespace py = pybind11;
 
-bool are_adjacent(const int &idx_p1, const int &idx_p2, const std::pair<int, int> &range)
+using PointArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+using IndexArray = py::array_t<int, py::array::c_style | py::array::forcecast>;
+
+/**
+ * @brief Checks whether two sample points are consecutive on the same contour
+ * @details Runs in constant time whatever the number of contours, using the contour of each
+ *          sample point.
+ *
+ * @param idx_p1 Index of the first sample point
+ * @param idx_p2 Index of the second sample point
+ * @param contour_id Index of the contour of each sample point
+ * @param ranges Index of the first and last sample point of each contour
+ * @return true If the points are next to each other on their contour, including the closing
+ *         segment between the last and the first point
+ */
+bool are_adjacent(
+    const int &idx_p1,
+    const int &idx_p2,
+    const std::vector<int> &contour_id,
+    const std::vector<std::pair<int, int>> &ranges)
 {
-    // First verify that the two points are in the same range
-    if (idx_p1 < range.first || idx_p1 > range.second)
-    {
-        return false;
-    }
-    if (idx_p2 < range.first || idx_p2 > range.second)
+    // First verify that the two points are on the same contour
+    if (contour_id[idx_p1] != contour_id[idx_p2])
     {
         return false;
     }
     // Then check if they are adjacent
     // That is either the first and last point of the range
+    const std::pair<int, int> &range = ranges[contour_id[idx_p1]];
     if (idx_p1 == range.first && idx_p2 == range.second)
     {
         return true;
@@ -39,88 +57,99 @@ bool are_adjacent(const int &idx_p1, const int &idx_p2, const std::pair<int, int
     return false;
 }
 
-std::tuple<std::unordered_map<int, NodeInfo>, std::unordered_map<std::string, EdgeInfo>> voronoiPruning(
-    const std::vector<std::pair<int, int>> &ridge_points,
-    const std::vector<std::pair<int, int>> &ridge_vertices,
-    const std::vector<std::pair<double, double>> &points,
-    const std::vector<std::pair<double, double>> &vertices,
-    const std::vector<std::vector<std::pair<double, double>>> &sample)
+/**
+ * @brief Splits the sample points into closed contours
+ *
+ * @param points The sample points of all contours, concatenated, of shape (n_points, 2)
+ * @param contour_sizes The number of sample points of each contour
+ * @return std::vector<std::vector<std::pair<double, double>>> The points of each contour, with the
+ *         first point repeated at the end to close it
+ */
+std::vector<std::vector<std::pair<double, double>>> getContours(const PointArray &points, const IndexArray &contour_sizes)
 {
-    std::vector<int> sample_size(sample.size(), 0);
-    for (size_t i = 0; i < sample.size(); i++)
-    {
-        sample_size[i] = sample[i].size() - 1;
-    }
-
-    std::vector<int> cum_sample_size = cumSum(sample_size);
+    auto p = points.unchecked<2>();
+    auto sizes = contour_sizes.unchecked<1>();
 
-    std::vector<std::pair<int, int>> ranges(sample.size());
-    for (size_t i = 0; i < sample.size(); i++)
+    std::vector<std::vector<std::pair<double, double>>> contours(sizes.shape(0));
+    int offset = 0;
+    for (py::ssize_t i = 0; i < sizes.shape(0); i++)
     {
-        if (i == 0)
+        contours[i].reserve(sizes(i) + 1);
+        for (int j = offset; j < offset + sizes(i); j++)
         {
-            ranges[i] = {0, cum_sample_size[i] - 1};
-        }
-        else
-        {
-            ranges[i] = {cum_sample_size[i - 1], cum_sample_size[i] - 1};
+            contours[i].push_back({p(j, 0), p(j, 1)});
         }
+        contours[i].push_back({p(offset, 0), p(offset, 1)});
+        offset += sizes(i);
+    }
+    return contours;
+}
+
+std::tuple<std::unordered_map<int, NodeInfo>, std::unordered_map<std::int64_t, EdgeInfo>> voronoiPruning(
+    const IndexArray &ridge_points,
+    const IndexArray &ridge_vertices,
+    const PointArray &points,
+    const PointArray &vertices,
+    const IndexArray &contour_sizes)
+{
+    auto r_points = ridge_points.unchecked<2>();
+    auto r_vertices = ridge_vertices.unchecked<2>();
+    auto p = points.unchecked<2>();
+    auto v = vertices.unchecked<2>();
+    auto sizes = contour_sizes.unchecked<1>();
+
+    std::vector<std::pair<int, int>> ranges(sizes.shape(0));
+    std::vector<int> contour_id(p.shape(0));
+    int offset = 0;
+    for (py::ssize_t i = 0; i < sizes.shape(0); i++)
+    {
+        ranges[i] = {offset, offset + sizes(i) - 1};
+        std::fill(contour_id.begin() + offset, contour_id.begin() + offset + sizes(i), i);
+        offset += sizes(i);
     }
 
     std::unordered_map<int, NodeInfo> nodes;
-    std::unordered_map<std::string, EdgeInfo> edges;
+    std::unordered_map<std::int64_t, EdgeInfo> edges;
 
-    for (size_t i = 0; i < ridge_points.size(); i++)
+    for (py::ssize_t i = 0; i < r_points.shape(0); i++)
     {
-        const std::pair<int, int> &pointidx = ridge_points[i];
-        const std::pair<int, int> &vertexidx = ridge_vertices[i];
-
-        int pointidx1 = pointidx.first;
-        int pointidx2 = pointidx.second;
-        int vertexidx1 = vertexidx.first;
-        int vertexidx2 = vertexidx.second;
+        int pointidx1 = r_points(i, 0);
+        int pointidx2 = r_points(i, 1);
+        int vertexidx1 = r_vertices(i, 0);
+        int vertexidx2 = r_vertices(i, 1);
 
-        bool skip = false;
-        for (const std::pair<int, int> &range : ranges)
-        {
-            if (are_adjacent(pointidx1, pointidx2, range))
-            {
-                skip = true;
-                break;
-            }
-        }
-        if (skip)
+        if (are_adjacent(pointidx1, pointidx2, contour_id, ranges))
         {
             continue;
         }
 
-        const std::pair<double, double> &v1_pos = vertices[vertexidx1];
-        const std::pair<double, double> &v2_pos = vertices[vertexidx2];
-
         // Check that both vertex indices are positive (not -1)
         // This is to ignore infinite segments as they can't be in the medial axis
         if (vertexidx1 >= 0 && vertexidx2 >= 0)
         {
+            const std::pair<double, double> v1_pos = {v(vertexidx1, 0), v(vertexidx1, 1)};
+            const std::pair<double, double> v2_pos = {v(vertexidx2, 0), v(vertexidx2, 1)};
+            const std::pair<double, double> p1_pos = {p(pointidx1, 0), p(pointidx1, 1)};
+            const std::pair<double, double> p2_pos = {p(pointidx2, 0), p(pointidx2, 1)};
 
             // Compute the object angle and add the edge
             std::pair<double, double> midpoint = {
                 (v1_pos.first + v2_pos.first) / 2,
                 (v1_pos.second + v2_pos.second) / 2};
             std::pair<double, double> v1 = {
-                points[pointidx1].first - midpoint.first,
-                points[pointidx1].second - midpoint.second};
+                p1_pos.first - midpoint.first,
+                p1_pos.second - midpoint.second};
             std::pair<double, double> v2 = {
-                points[pointidx2].first - midpoint.first,
-                points[pointidx2].second - midpoint.second};
+                p2_pos.first - midpoint.first,
+                p2_pos.second - midpoint.second};
             double object_angle = angleBetween(v1, v2) / 2;
 
-            std::string edge = std::to_string(vertexidx1) + "-" + std::to_string(vertexidx2);
-            edges[edge] = EdgeInfo{vertexidx1, vertexidx2, object_angle};
+            edges[edgeKey(vertexidx1, vertexidx2)] = EdgeInfo{vertexidx1, vertexidx2, object_angle};
 
             // Add the vertices if not already added
             if (nodes.find(vertexidx1) == nodes.end())
             {
-                double dist = distance(v1_pos, points[pointidx1]);
+                double dist = distance(v1_pos, p1_pos);
                 nodes[vertexidx1] = NodeInfo{vertexidx1, v1_pos, dist, {vertexidx2}};
             }
             else
@@ -130,7 +159,7 @@ std::tuple<std::unordered_map<int, NodeInfo>, std::unordered_map<std::string, Ed
 
             if (nodes.find(vertexidx2) == nodes.end())
             {
-                double dist = distance(v2_pos, points[pointidx1]);
+                double dist = distance(v2_pos, p1_pos);
                 nodes[vertexidx2] = NodeInfo{vertexidx2, v2_pos, dist, {vertexidx1}};
             }
             else
@@ -145,41 +174,26 @@ std::tuple<std::unordered_map<int, NodeInfo>, std::unordered_map<std::string, Ed
 
 void medialAxisSelection(
     std::unordered_map<int, NodeInfo> &nodes,
-    std::unordered_map<std::string, EdgeInfo> &edges,
-    const std::vector<std::vector<std::pair<double, double>>> &sample)
+    std::unordered_map<std::int64_t, EdgeInfo> &edges,
+    const std::vector<std::vector<std::pair<double, double>>> &contours)
 {
 
     std::unordered_map<int, std::list<int>> connected_component = connectedComponent(nodes, edges);
+    const CrossingNumberIndex shape(contours);
 
     for (auto node_comp : connected_component)
     {
         std::pair<double, double> representative_p = nodes[node_comp.first].position;
 
-        float w = 0;
-        for (std::vector<std::pair<double, double>> curve_points : sample)
-        {
-            w += windingNumber(curve_points, representative_p);
-        }
-
-        // float error = round(w) - w; // Check that the winding number is close to an interger to make sure the curves are closed
-        int w_ = (int)round(w);
-
-        if (w_ % 2 == 0)
+        // Components outside of the shape are removed
+        if (!shape.contains(representative_p))
         {
             for (int node : node_comp.second)
             {
-                std::unordered_set<int> connected_nodes = nodes[node].connectedNodes;
-                for (int c : connected_nodes)
+                for (int c : nodes[node].connectedNodes)
                 {
                     nodes[c].connectedNodes.erase(node);
-
-                    // Remove the edge from the edge list (try both names)
-                    std::string e = std::to_string(node) + "-" + std::to_string(c);
-                    if (edges.find(e) == edges.end())
-                    {
-                        e = std::to_string(c) + "-" + std::to_string(node);
-                    }
-                    edges.erase(e);
+                    edges.erase(edgeKey(node, c));
                 }
                 nodes.erase(node);
             }
@@ -187,41 +201,111 @@ void medialAxisSelection(
     }
 }
 
-std::tuple<std::unordered_map<int, NodeInfo>, std::unordered_map<std::string, EdgeInfo>> medialAxis(
-    const std::vector<std::pair<int, int>> &ridge_points,
-    const std::vector<std::pair<int, int>> &ridge_vertices,
-    const std::vector<std::pair<double, double>> &points,
-    const std::vector<std::pair<double, double>> &vertices,
-    const std::vector<std::vector<std::pair<double, double>>> &sample)
+/**
+ * @brief Converts the nodes and edges of the medial axis to flat NumPy arrays
+ *
+ * Nodes are kept in the iteration order of the map, which is the order in which they were
+ * previously handed to Python and therefore the order in which they are added to the graph.
+ * Edges are sorted by key.
+ *
+ * @return py::tuple The node indices (n,), positions (n, 2), distances to the outline (n,), the
+ *         edges as pairs of node indices (m, 2) and their object angles (m,)
+ */
+py::tuple toArrays(
+    const std::unordered_map<int, NodeInfo> &nodes,
+    const std::unordered_map<std::int64_t, EdgeInfo> &edges)
 {
+    std::vector<int> node_order;
+    node_order.reserve(nodes.size());
+    for (auto const &[idx, node] : nodes)
+    {
+        node_order.push_back(idx);
+    }
 
-    auto [nodes, edges] = voronoiPruning(ridge_points, ridge_vertices, points, vertices, sample);
+    std::vector<std::int64_t> edge_order;
+    edge_order.reserve(edges.size());
+    for (auto const &[key, edge] : edges)
+    {
+        edge_order.push_back(key);
+    }
+    std::sort(edge_order.begin(), edge_order.end());
+
+    py::ssize_t n_nodes = node_order.size();
+    py::ssize_t n_edges = edge_order.size();
+    py::array_t<std::int64_t> node_ids(n_nodes);
+    py::array_t<double> positions({n_nodes, (py::ssize_t)2});
+    py::array_t<double> dists(n_nodes);
+    py::array_t<std::int64_t> edge_index({n_edges, (py::ssize_t)2});
+    py::array_t<double> object_angles(n_edges);
+
+    auto ids = node_ids.mutable_unchecked<1>();
+    auto pos = positions.mutable_unchecked<2>();
+    auto dist = dists.mutable_unchecked<1>();
+    for (py::ssize_t i = 0; i < n_nodes; i++)
+    {
+        const NodeInfo &node = nodes.at(node_order[i]);
+        ids(i) = node.index;
+        pos(i, 0) = node.position.first;
+        pos(i, 1) = node.position.second;
+        dist(i) = node.distance;
+    }
 
-    medialAxisSelection(nodes, edges, sample);
+    auto index = edge_index.mutable_unchecked<2>();
+    auto angle = object_angles.mutable_unchecked<1>();
+    for (py::ssize_t i = 0; i < n_edges; i++)
+    {
+        const EdgeInfo &edge = edges.at(edge_order[i]);
+        index(i, 0) = edge.node1;
+        index(i, 1) = edge.node2;
+        angle(i) = edge.objectAngle;
+    }
 
-    return {nodes, edges};
+    return py::make_tuple(node_ids, positions, dists, edge_index, object_angles);
 }
 
-PYBIND11_MODULE(voronoi_pruning, m)
+py::tuple voronoiPruningArrays(
+    const IndexArray &ridge_points,
+    const IndexArray &ridge_vertices,
+    const PointArray &points,
+    const PointArray &vertices,
+    const IndexArray &contour_sizes)
+{
+    auto [nodes, edges] = voronoiPruning(ridge_points, ridge_vertices, points, vertices, contour_sizes);
+    return toArrays(nodes, edges);
+}
+
+py::tuple medialAxis(
+    const IndexArray &ridge_points,
+    const IndexArray &ridge_vertices,
+    const PointArray &points,
+    const PointArray &vertices,
+    const IndexArray &contour_sizes)
 {
-    m.doc() = "A C++ fast implementation of Voronoi pruning to obtain the medial axis"; // optional module docstring
 
-    py::class_<NodeInfo>(m, "NodeInfo")
-        .def(py::init<int, std::pair<double, double>, double, std::unordered_set<int>>())
-        .def_readwrite("idx", &NodeInfo::index)
-        .def_readwrite("pos", &NodeInfo::position)
-        .def_readwrite("dist", &NodeInfo::distance)
-        .def_readwrite("connected", &NodeInfo::connectedNodes);
+    auto [nodes, edges] = voronoiPruning(ridge_points, ridge_vertices, points, vertices, contour_sizes);
 
-    py::class_<EdgeInfo>(m, "EdgeInfo")
-        .def(py::init<int, int, double>())
-        .def_readwrite("node1", &EdgeInfo::node1)
-        .def_readwrite("node2", &EdgeInfo::node2)
-        .def_readwrite("object_angle", &EdgeInfo::objectAngle);
+    medialAxisSelection(nodes, edges, getContours(points, contour_sizes));
 
-    m.def("voronoiPruning", &voronoiPruning, "A function which computes the Voronoi pruning to obtain the medial axis",
-          py::arg("ridge_points"), py::arg("ridge_vertices"), py::arg("points"), py::arg("vertices"), py::arg("sample"));
+    return toArrays(nodes, edges);
+}
+
+PYBIND11_MODULE(voronoi_pruning, m)
+{
+    m.doc() = "A C++ fast implementation of Voronoi pruning to obtain the medial axis"; // optional module docstring
 
-    m.def("medialAxis", &medialAxis, "A function which extracts the medial axis from the Voronoi diagram",
-          py::arg("ridge_points"), py::arg("ridge_vertices"), py::arg("points"), py::arg("vertices"), py::arg("sample"));
+    m.def("voronoiPruning", &voronoiPruningArrays, "A function which computes the Voronoi pruning to obtain the medial axis",
+          py::arg("ridge_points"), py::arg("ridge_vertices"), py::arg("points"), py::arg("vertices"), py::arg("contour_sizes"));
+
+    m.def("medialAxis", &medialAxis,
+          "A function which extracts the medial axis from the Voronoi diagram\n\n"
+          "Args:\n"
+          "    ridge_points (np.ndarray): (n_ridges, 2) indices of the points separated by each ridge\n"
+          "    ridge_vertices (np.ndarray): (n_ridges, 2) indices of the vertices of each ridge\n"
+          "    points (np.ndarray): (n_points, 2) sample points of all contours, concatenated\n"
+          "    vertices (np.ndarray): (n_vertices, 2) Voronoi vertices\n"
+          "    contour_sizes (np.ndarray): (n_contours,) number of sample points of each contour\n\n"
+          "Returns:\n"
+          "    Tuple[np.ndarray, ...]: node indices (n,), positions (n, 2), distances to the outline (n,),\n"
+          "        edges as pairs of node indices (m, 2) and object angles (m,)",
+          py::arg("ridge_points"), py::arg("ridge_vertices"), py::arg("points"), py::arg("vertices"), py::arg("contour_sizes"));
 }
@@ -4,13 +4,18 @@ import networkx as nx
 
 from SLDvec.utils.networkx import (
     BranchInfo,
+    JunctionTable,
     find_Y_foot_direction,
     get_all_branches_info,
+    get_chain_index,
+    get_junction_table,
     merge_branch,
 )
 
 
-def get_target_merge_node(nodes_branch_info: List[BranchInfo], G: nx.Graph) -> Optional[BranchInfo]:
+def get_target_merge_node(
+    nodes_branch_info: List[BranchInfo], G: nx.Graph, table: Optional[JunctionTable] = None
+) -> Optional[BranchInfo]:
     """Return the branch to follow to merge a node, or None if the node should not be merged.
 
     Args:
@@ -18,6 +23,8 @@ def get_target_merge_node(nodes_branch_info: List[BranchInfo], G: nx.Graph) -> O
             informations about a branch going out of a node.
 
         G (nx.Graph): The graph to analyze.
+        table (Optional[JunctionTable], optional): The junction table of the graph. Defaults to
+            get_junction_table(G).
 
     Raises:
         ValueError: If multiple branches have the same distance to the border of the shape, or if
@@ -33,7 +40,7 @@ def get_target_merge_node(nodes_branch_info: List[BranchInfo], G: nx.Graph) -> O
     # probably a node traversed twice and should not be merged.
     if any([1 == x.endbranch_n_neighbors for x in nodes_branch_info]):
         degree_3_node_of_interest = nodes_branch_info[0].branch[0]
-        y_foot_direction = find_Y_foot_direction(G, degree_3_node_of_interest)
+        y_foot_direction = find_Y_foot_direction(G, degree_3_node_of_interest, table)
         y_foot_branch_direction = [
             branch_info
             for branch_info in nodes_branch_info
@@ -80,10 +87,11 @@ def merge_3_neighbords_node(G_: nx.Graph) -> nx.Graph:
 
     # For each node with 3 neighbors, get the information about the branches and the target to merge
     merge_node_along_branch_dict = {}
+    index, table = get_chain_index(G), get_junction_table(G)
     for node in G.nodes():
         if G.degree(node) == 3:
-            node_info = get_all_branches_info(G, node)
-            merge_node_along_branch_dict[node] = get_target_merge_node(node_info, G)
+            node_info = get_all_branches_info(G, node, index)
+            merge_node_along_branch_dict[node] = get_target_merge_node(node_info, G, table)
 
     # Merge the pairs of nodes that match (i.e. they are both the target of each other)
     already_merged = []
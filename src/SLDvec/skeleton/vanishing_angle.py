@@ -1,24 +1,31 @@
+import copy
+
 import networkx as nx
 
-from SLDvec import VANISHING_ANGLE_THRESHOLD_MULTIPLE, VANISHING_ANGLE_THRESHOLD_SINGLE
+from SLDvec import (
+    VANISHING_ANGLE_N_THREADS,
+    VANISHING_ANGLE_THRESHOLD_MULTIPLE,
+    VANISHING_ANGLE_THRESHOLD_SINGLE,
+)
 from SLDvec.skeleton.vanishing_angle_cpp.vanishing_angle import vanishingAngle  # type: ignore
 
 
-def vanishing_angle_wrapper(G: nx.Graph, multiple_lines: bool) -> nx.Graph:
-    """Compute the vanishing angles of the edges of a graph based on [1] and filter the edges based
-    on a threshold.
-    The threshold is set to VANISHING_ANGLE_THRESHOLD_SINGLE (0.95 or 85.5 degree) if multiple_line
-    is False, and VANISHING_ANGLE_THRESHOLD_MULTIPLE (0.90 or 81 degree) otherwise.
+def compute_vanishing_angles(G: nx.Graph, n_threads: int = VANISHING_ANGLE_N_THREADS) -> nx.Graph:
+    """Compute the vanishing angles of the edges of a graph based on [1], without filtering them.
+    The vanishing angle of an edge is the threshold above which the edge is pruned, so the
+    returned graph holds the whole pruning hierarchy and can be filtered with any threshold using
+    prune_vanishing_angle.
 
     [1] Rong, P., & Ju, T. (2023). Variational Pruning of Medial Axes of Planar Shapes. https://doi.org/10.1111/cgf.14902
 
     Args:
-        G (nx.Graph): The graph to compute the vanishing angles and filter the edges.
-        multiple_line (bool): Wheter to use the single line threshold or the multiple line
-            threshold.
+        G (nx.Graph): The graph to compute the vanishing angles of.
+        n_threads (int, optional): The number of threads used to process the connected components
+            of the graph, 0 to use one per core. Defaults to VANISHING_ANGLE_N_THREADS.
+
     Returns:
-        nx.Graph: The filtered graph, with the edges removed if their vanishing angle is below
-            the threshold.
+        nx.Graph: A copy of the graph with nodes renamed to ordered integers, and a
+            "vanishing_angle" attribute on each edge.
     """
     # Rename the nodes to ordered integers
     G = nx.convert_node_labels_to_integers(G)
@@ -35,25 +42,72 @@ def vanishing_angle_wrapper(G: nx.Graph, multiple_lines: bool) -> nx.Graph:
         angles.append(edge[2]["object_angle"])
 
     # Compute the vanishing angles
-    VA_tresholds = vanishingAngle(points, edge_ids, angles)
+    VA_tresholds = vanishingAngle(points, edge_ids, angles, n_threads=n_threads)
+    for i, edge in enumerate(G.edges(data=True)):
+        edge[2]["vanishing_angle"] = VA_tresholds[i]
+
+    return G
+
+
+def prune_vanishing_angle(G: nx.Graph, threshold: float) -> nx.Graph:
+    """Remove the edges of a graph whose vanishing angle is below a threshold, as well as the nodes
+    left isolated. The input graph, as returned by compute_vanishing_angles, is not modified so
+    that it can be pruned again with another threshold.
+
+    Args:
+        G (nx.Graph): The graph, with a "vanishing_angle" attribute on each edge.
+        threshold (float): The vanishing angle threshold, between 0 and 1 (1 being 90 degrees).
+
+    Returns:
+        nx.Graph: The filtered graph.
+    """
+    G_pruned = G.copy()
+    # The graph attributes (e.g. the ghost nodes) are modified by the later simplification steps
+    G_pruned.graph = copy.deepcopy(G.graph)
+
+    edges_to_remove = [
+        (edge[0], edge[1])
+        for edge in G_pruned.edges(data=True)
+        if edge[2]["vanishing_angle"] < threshold
+    ]
+    G_pruned.remove_edges_from(edges_to_remove)
 
-    ### Remove edges with vanishing angle below a threshold
-    vanishing_angle_threshold = (
+    # Remove nodes with degree 0 (isolated nodes)
+    degree_0_nodes = [n for n in G_pruned.nodes if G_pruned.degree(n) == 0]
+    G_pruned.remove_nodes_from(degree_0_nodes)
+
+    return G_pruned
+
+
+def get_vanishing_angle_threshold(multiple_lines: bool) -> float:
+    """Return VANISHING_ANGLE_THRESHOLD_SINGLE (0.95 or 85.5 degree) if multiple_line is False, and
+    VANISHING_ANGLE_THRESHOLD_MULTIPLE (0.90 or 81 degree) otherwise."""
+    return (
         VANISHING_ANGLE_THRESHOLD_SINGLE
         if not multiple_lines
         else VANISHING_ANGLE_THRESHOLD_MULTIPLE
     )
-    edges_to_remove = []
-    for i, edge in enumerate(G.edges(data=True)):
-        edge[2]["vanishing_angle"] = VA_tresholds[i]
-        if edge[2]["vanishing_angle"] < vanishing_angle_threshold:
-            edges_to_remove.append((edge[0], edge[1]))
 
-    for edge_0, edge_1 in edges_to_remove:
-        G.remove_edge(edge_0, edge_1)
 
-    # Remove nodes with degree 0 (isolated nodes)
-    degree_0_nodes = [n for n in G.nodes if G.degree(n) == 0]
-    G.remove_nodes_from(degree_0_nodes)
+def vanishing_angle_wrapper(
+    G: nx.Graph, multiple_lines: bool, n_threads: int = VANISHING_ANGLE_N_THREADS
+) -> nx.Graph:
+    """Compute the vanishing angles of the edges of a graph based on [1] and filter the edges based
+    on a threshold.
+    The threshold is set to VANISHING_ANGLE_THRESHOLD_SINGLE (0.95 or 85.5 degree) if multiple_line
+    is False, and VANISHING_ANGLE_THRESHOLD_MULTIPLE (0.90 or 81 degree) otherwise.
 
-    return G
+    [1] Rong, P., & Ju, T. (2023). Variational Pruning of Medial Axes of Planar Shapes. https://doi.org/10.1111/cgf.14902
+
+    Args:
+        G (nx.Graph): The graph to compute the vanishing angles and filter the edges.
+        multiple_line (bool): Wheter to use the single line threshold or the multiple line
+            threshold.
+        n_threads (int, optional): The number of threads used to process the connected components
+            of the graph, 0 to use one per core. Defaults to VANISHING_ANGLE_N_THREADS.
+    Returns:
+        nx.Graph: The filtered graph, with the edges removed if their vanishing angle is below
+            the threshold.
+    """
+    G = compute_vanishing_angles(G, n_threads=n_threads)
+    return prune_vanishing_angle(G, get_vanishing_angle_threshold(multiple_lines))
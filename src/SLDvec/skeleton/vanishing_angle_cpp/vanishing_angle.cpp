@@ -1,5 +1,8 @@
 #include <vector>
 #include <iostream>
+#include <atomic>
+#include <thread>
+#include <exception>
 #include "algorithm.h"
 #include "node_path_graph.h"
 
@@ -7,38 +10,101 @@
 #include <pybind11/stl.h>
 namespace py = pybind11;
 
+/**
+ * @brief Compute the drop thresholds of the paths of a single connected component
+ *
+ * The thresholds are written to the paths of the initial graph with the same path index, which
+ * are distinct for every component, so that components can be processed concurrently.
+ *
+ * @param component The connected component to process
+ * @param initial_graph The graph the component was extracted from
+ */
+void processComponent(NodePathGraph &component, NodePathGraph &initial_graph)
+{
+    DynamicTree dynamic_tree = component.to_dynamic_tree_junction();
+    Algorithm new_algo = Algorithm(dynamic_tree);
+    new_algo.execute(dynamic_tree);
+
+    for (std::shared_ptr<DynamicTreeNode> node : new_algo.tree.nodes)
+    {
+        if (node->path_index >= 0)
+        {
+            initial_graph.paths[node->path_index]->drop_threshold = node->drop_threshold;
+        }
+    }
+}
+
 /**
  * @brief Compute vanishing angles for a medial axis
  *
  * This function processes a medial axis graph defined by points, edges, and angles
  * to compute vanishing angles that represent the significance of each edge.
+ * The connected components of the graph are independent and are processed by a pool of
+ * threads. The GIL is released during the computation.
  *
  * @param points Vector of 2D points representing node positions
  * @param edges Vector of integer pairs representing edge connections
  * @param angle Vector of angles corresponding to each edge
+ * @param n_threads Number of threads used to process the components, 0 to use one per core
  * @return std::vector<float> Vector of vanishing angles for each edge
  */
 std::vector<float> vanishingAngle(
     const std::vector<std::vector<double>> &points,
     const std::vector<std::vector<int>> &edges,
-    const std::vector<double> &angle)
+    const std::vector<double> &angle,
+    int n_threads)
 {
+    py::gil_scoped_release release;
 
     NodePathGraph initial_graph = NodePathGraph(points, edges, angle);
     std::vector<NodePathGraph> components = initial_graph.to_components();
 
-    for (NodePathGraph &component : components)
+    if (n_threads <= 0)
     {
+        n_threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    n_threads = std::min<std::size_t>(n_threads, components.size());
 
-        DynamicTree dynamic_tree = component.to_dynamic_tree_junction();
-        Algorithm new_algo = Algorithm(dynamic_tree);
-        new_algo.execute(dynamic_tree);
-
-        for (std::shared_ptr<DynamicTreeNode> node : new_algo.tree.nodes)
+    if (n_threads <= 1)
+    {
+        for (NodePathGraph &component : components)
+        {
+            processComponent(component, initial_graph);
+        }
+    }
+    else
+    {
+        // Each thread takes the next unprocessed component until there are none left
+        std::atomic<std::size_t> next_component(0);
+        std::vector<std::exception_ptr> errors(n_threads);
+        std::vector<std::thread> workers;
+        for (int t = 0; t < n_threads; t++)
+        {
+            workers.emplace_back(
+                [&, t]()
+                {
+                    try
+                    {
+                        for (std::size_t i = next_component++; i < components.size(); i = next_component++)
+                        {
+                            processComponent(components[i], initial_graph);
+                        }
+                    }
+                    catch (...)
+                    {
+                        errors[t] = std::current_exception();
+                    }
+                });
+        }
+        for (std::thread &worker : workers)
+        {
+            worker.join();
+        }
+        for (const std::exception_ptr &error : errors)
         {
-            if (node->path_index >= 0)
+            if (error)
             {
-                initial_graph.paths[node->path_index]->drop_threshold = node->drop_threshold;
+                std::rethrow_exception(error);
             }
         }
     }
@@ -68,10 +134,12 @@ PYBIND11_MODULE(vanishing_angle, m)
           "    points (List[List[float]]): List of 2D points representing node positions\n"
           "    edges (List[List[int]]): List of integer pairs representing edge connections\n"
           "    angle (List[float]): List of angles corresponding to each edge\n"
-          "    timed (bool, optional): Enable timing measurements. Defaults to False\n\n"
+          "    n_threads (int, optional): Number of threads used to process the connected components,\n"
+          "        0 to use one per core. Defaults to 0\n\n"
           "Returns:\n"
           "    List[float]: List of vanishing angles for each edge",
           py::arg("points"),
           py::arg("edges"),
-          py::arg("angle"));
+          py::arg("angle"),
+          py::arg("n_threads") = 0);
 }
\ No newline at end of file
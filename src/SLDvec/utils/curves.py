@@ -0,0 +1,231 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, List, Tuple, Union
+
+import numpy as np
+
+# Header of the flat binary files, followed by the control points (float32, shape (M, 4, 2)), the
+# stroke offsets (uint32, shape (S + 1,)) and the closed flags (uint8, shape (S,)). All the values
+# are little-endian and the control points start on an 8 bytes boundary, so that each block can be
+# memory-mapped directly.
+FLAT_MAGIC = b"SLDVEC\x00\x00"
+FLAT_VERSION = 1
+FLAT_HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("n_strokes", "<u4"),
+        ("n_curves", "<u4"),
+        ("height", "<u4"),
+        ("width", "<u4"),
+        ("reserved", "<u4"),
+        ("scale_ratio", "<f8"),
+    ]
+)
+
+
+@dataclass
+class CurveArrays:
+    """The Bezier curves of a vectorized drawing packed in flat arrays, for the tools that need the
+    control points without parsing an SVG.
+
+    Attributes:
+        control_points (np.ndarray): The control points of all the Bezier curves, stroke after
+            stroke, in the coordinates of the original image (as in the SVG), as float32 of shape
+            (M, 4, 2).
+        stroke_offsets (np.ndarray): The index of the first curve of each stroke, followed by the
+            total number of curves, of shape (S + 1,). The curves of stroke i are
+            control_points[stroke_offsets[i] : stroke_offsets[i + 1]].
+        closed (np.ndarray): Whether each stroke is closed, as booleans of shape (S,).
+        image_shape (Tuple[int, int]): The shape (height, width) of the original image.
+        scale_ratio (float): The ratio by which the image was scaled during the vectorization.
+    """
+
+    control_points: np.ndarray
+    stroke_offsets: np.ndarray
+    closed: np.ndarray
+    image_shape: Tuple[int, int]
+    scale_ratio: float
+
+    @property
+    def n_strokes(self) -> int:
+        return len(self.closed)
+
+    def stroke(self, i: int) -> np.ndarray:
+        """The control points of the Bezier curves of the i-th stroke, of shape (N, 4, 2)."""
+        return self.control_points[self.stroke_offsets[i] : self.stroke_offsets[i + 1]]
+
+    def strokes(self) -> List[np.ndarray]:
+        """The control points of the Bezier curves of each stroke."""
+        return [self.stroke(i) for i in range(self.n_strokes)]
+
+
+def pack_curves(
+    orig_image_shape: Tuple[int, int], scale_ratio: float, bezier_splines: List[np.ndarray]
+) -> CurveArrays:
+    """Pack the Bezier curves of all the strokes in flat arrays. The bezier splines are not modified.
+
+    Args:
+        orig_image_shape (Tuple[int, int]): The shape of the original image.
+        scale_ratio (float): The ratio by which the bezier splines were scaled.
+        bezier_splines (List[np.ndarray]): The Bezier curves of each stroke, each of shape (N, 4, 2).
+
+    Returns:
+        CurveArrays: The packed curves.
+    """
+    strokes = [np.asarray(beziers, dtype=float).reshape(-1, 4, 2) for beziers in bezier_splines]
+    lengths = [len(beziers) for beziers in strokes]
+    stroke_offsets = np.zeros(len(strokes) + 1, dtype=np.uint32)
+    np.cumsum(lengths, out=stroke_offsets[1:])
+
+    # The closed flags are computed before the conversion to float32, as in the SVG export
+    closed = np.array(
+        [len(b) > 0 and bool((b[0][0] == b[-1][-1]).all()) for b in strokes], dtype=bool
+    )
+    if strokes:
+        control_points = (np.concatenate(strokes) / scale_ratio).astype(np.float32)
+    else:
+        control_points = np.zeros((0, 4, 2), dtype=np.float32)
+
+    return CurveArrays(
+        control_points=control_points,
+        stroke_offsets=stroke_offsets,
+        closed=closed,
+        image_shape=(int(orig_image_shape[0]), int(orig_image_shape[1])),
+        scale_ratio=float(scale_ratio),
+    )
+
+
+def write_npz(
+    orig_image_shape: Tuple[int, int],
+    scale_ratio: float,
+    bezier_splines: List[np.ndarray],
+    output: Union[str, Path, IO[bytes]],
+    compress: bool = False,
+) -> None:
+    """Write the Bezier curves of a drawing to a NumPy .npz archive, with one array per field of
+    CurveArrays. It can be read back with read_curves, or directly with np.load.
+
+    Args:
+        orig_image_shape (Tuple[int, int]): The shape of the original image.
+        scale_ratio (float): The ratio by which the bezier splines were scaled.
+        bezier_splines (List[np.ndarray]): The Bezier curves of each stroke, each of shape (N, 4, 2).
+        output (Union[str, Path, IO[bytes]]): The path of the file to write, or a binary buffer.
+        compress (bool, optional): Whether to compress the archive. Defaults to False.
+    """
+    curves = pack_curves(orig_image_shape, scale_ratio, bezier_splines)
+    save = np.savez_compressed if compress else np.savez
+    arrays = dict(
+        control_points=curves.control_points,
+        stroke_offsets=curves.stroke_offsets,
+        closed=curves.closed,
+        image_shape=np.array(curves.image_shape, dtype=np.uint32),
+        scale_ratio=np.float64(curves.scale_ratio),
+    )
+    if isinstance(output, (str, Path)):
+        # The file is opened here, as np.savez appends .npz to the paths that lack it
+        with open(output, "wb") as f:
+            save(f, **arrays)
+    else:
+        save(output, **arrays)
+
+
+def write_flat(
+    orig_image_shape: Tuple[int, int],
+    scale_ratio: float,
+    bezier_splines: List[np.ndarray],
+    output: Union[str, Path, IO[bytes]],
+) -> None:
+    """Write the Bezier curves of a drawing to a flat binary file, that can be memory-mapped (see
+    FLAT_HEADER_DTYPE for the layout, and read_curves to read it back).
+
+    Args:
+        orig_image_shape (Tuple[int, int]): The shape of the original image.
+        scale_ratio (float): The ratio by which the bezier splines were scaled.
+        bezier_splines (List[np.ndarray]): The Bezier curves of each stroke, each of shape (N, 4, 2).
+        output (Union[str, Path, IO[bytes]]): The path of the file to write, or a binary buffer.
+    """
+    curves = pack_curves(orig_image_shape, scale_ratio, bezier_splines)
+    header = np.zeros((), dtype=FLAT_HEADER_DTYPE)
+    header["magic"] = FLAT_MAGIC
+    header["version"] = FLAT_VERSION
+    header["n_strokes"] = curves.n_strokes
+    header["n_curves"] = len(curves.control_points)
+    header["height"], header["width"] = curves.image_shape
+    header["scale_ratio"] = curves.scale_ratio
+
+    blocks = [
+        header.tobytes(),
+        curves.control_points.astype("<f4").tobytes(),
+        curves.stroke_offsets.astype("<u4").tobytes(),
+        curves.closed.astype(np.uint8).tobytes(),
+    ]
+    if isinstance(output, (str, Path)):
+        with open(output, "wb") as f:
+            f.writelines(blocks)
+    else:
+        output.writelines(blocks)
+
+
+def _read_flat(path: Union[str, Path], mmap: bool) -> CurveArrays:
+    header = np.fromfile(path, dtype=FLAT_HEADER_DTYPE, count=1)[0]
+    if header["version"] != FLAT_VERSION:
+        raise ValueError(f"Unsupported version {header['version']} of the curve file {path}.")
+
+    n_strokes, n_curves = int(header["n_strokes"]), int(header["n_curves"])
+    offset = FLAT_HEADER_DTYPE.itemsize
+    blocks = []
+    for dtype, shape in [
+        ("<f4", (n_curves, 4, 2)),
+        ("<u4", (n_strokes + 1,)),
+        ("u1", (n_strokes,)),
+    ]:
+        count = int(np.prod(shape))
+        if mmap and count > 0:
+            block = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        else:
+            block = np.fromfile(path, dtype=dtype, count=count, offset=offset).reshape(shape)
+        blocks.append(block)
+        offset += count * np.dtype(dtype).itemsize
+    control_points, stroke_offsets, closed = blocks
+
+    return CurveArrays(
+        control_points=control_points,
+        stroke_offsets=stroke_offsets,
+        closed=closed.view(bool),
+        image_shape=(int(header["height"]), int(header["width"])),
+        scale_ratio=float(header["scale_ratio"]),
+    )
+
+
+def read_curves(path: Union[str, Path], mmap: bool = True) -> CurveArrays:
+    """Read the Bezier curves written by write_npz or write_flat. The format is detected from the
+    content of the file.
+
+    Args:
+        path (Union[str, Path]): The path of the file to read.
+        mmap (bool, optional): Whether to memory-map the arrays of a flat file instead of reading
+            them. Ignored for .npz archives. Defaults to True.
+
+    Raises:
+        ValueError: If the file is neither a .npz archive nor a flat curve file, or if its version
+            is not supported.
+
+    Returns:
+        CurveArrays: The curves of the drawing.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(FLAT_MAGIC))
+
+    if magic == FLAT_MAGIC:
+        return _read_flat(path, mmap)
+    if magic.startswith(b"PK"):
+        with np.load(path) as archive:
+            return CurveArrays(
+                control_points=archive["control_points"],
+                stroke_offsets=archive["stroke_offsets"],
+                closed=archive["closed"],
+                image_shape=tuple(int(x) for x in archive["image_shape"]),
+                scale_ratio=float(archive["scale_ratio"]),
+            )
+    raise ValueError(f"{path} is not a curve file.")
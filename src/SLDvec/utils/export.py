@@ -0,0 +1,56 @@
+from functools import partial
+from pathlib import Path
+from typing import IO, List, Tuple, Union
+
+import numpy as np
+
+from SLDvec_formats import OUTPUT_SUFFIXES
+
+from .curves import write_flat, write_npz
+from .svg import write_svg
+
+# The function writing each output format, the extension of their files being in OUTPUT_SUFFIXES
+OUTPUT_FORMATS = {
+    "svg": partial(write_svg, compress=False),
+    "svgz": partial(write_svg, compress=True),
+    "npz": write_npz,
+    "bin": write_flat,
+}
+
+
+def get_output_suffix(output_format: str) -> str:
+    """Return the extension of the files of an output format, see OUTPUT_SUFFIXES.
+
+    Raises:
+        ValueError: If the output format is unknown.
+    """
+    if output_format not in OUTPUT_SUFFIXES:
+        raise ValueError(
+            f"Unknown output format {output_format!r}, expected one of {list(OUTPUT_SUFFIXES)}."
+        )
+    return OUTPUT_SUFFIXES[output_format]
+
+
+def export_curves(
+    orig_image_shape: Tuple[int, int],
+    scale_ratio: float,
+    bezier_splines: List[np.ndarray],
+    output: Union[Path, IO[bytes]],
+    output_format: str = "svg",
+) -> None:
+    """Write the Bezier curves of a drawing to a file or a binary buffer, in one of the
+    OUTPUT_FORMATS.
+
+    Args:
+        orig_image_shape (Tuple[int, int]): The shape of the original image.
+        scale_ratio (float): The ratio by which the bezier splines were scaled.
+        bezier_splines (List[np.ndarray]): The Bezier curves of each stroke, each of shape (N, 4, 2).
+        output (Union[Path, IO[bytes]]): The path of the file to write, or a binary buffer.
+        output_format (str, optional): The output format, "svg", "svgz" (gzipped SVG), "npz" (NumPy
+            archive, see write_npz) or "bin" (flat binary file, see write_flat). Defaults to "svg".
+
+    Raises:
+        ValueError: If the output format is unknown.
+    """
+    get_output_suffix(output_format)
+    OUTPUT_FORMATS[output_format](orig_image_shape, scale_ratio, bezier_splines, output)
@@ -3,13 +3,27 @@ from .branch import (
     annotate_crossroad_linked_to_single_neighbor_node,
     get_all_branches_info,
 )
+from .cache import invalidate_graph_indices
+from .chain import ChainIndex, get_chain_index, invalidate_chain_index
+from .junction import JunctionTable, get_junction_table, invalidate_junction_table
 from .merge import merge_branch
 from .path import get_path_from_degree_1_node_to_crossroad, get_path_to_crossroad_node
+from .spatial import SpatialIndex, get_spatial_index, invalidate_spatial_index
 from .t_intersection import find_T_bar_directions, find_T_foot_direction
 from .tangent import get_tangent
 from .y_intersection import find_Y_foot_direction, get_opposite_angle, get_Y_shape_angle_metric
 
 __all__ = [
+    "ChainIndex",
+    "get_chain_index",
+    "invalidate_chain_index",
+    "JunctionTable",
+    "get_junction_table",
+    "invalidate_junction_table",
+    "invalidate_graph_indices",
+    "SpatialIndex",
+    "get_spatial_index",
+    "invalidate_spatial_index",
     "merge_branch",
     "get_path_from_degree_1_node_to_crossroad",
     "get_path_to_crossroad_node",
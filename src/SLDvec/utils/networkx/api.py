@@ -1,5 +1,7 @@
 import networkx as nx
 
+from SLDvec.utils.networkx.chain import get_chain_index
+
 
 def get_all_branches(G_orig: nx.Graph) -> list:
     """Create a list where each entry corresponf to a node and contains the index of the branch
@@ -12,25 +14,22 @@ def get_all_branches(G_orig: nx.Graph) -> list:
     Returns:
         list: The list of branches index.
     """
-    G = G_orig.copy()
-
-    # Remove all nodes with degree more than 2 from the graph
-    to_remove = []
-    for node in G.nodes:
-        if G.degree(node) > 2:
-            to_remove.append(node)
-    G.remove_nodes_from(to_remove)
-
-    # Loop over all connected components and get the branches
-    branches = []
-    for component in nx.connected_components(G):
-        component = G.subgraph(component)
-        branches.append(list(component.nodes))
-
+    # Each branch is made of the nodes of a chain of degree 2 nodes, with its degree 1 ends
     branch_idx = [-1] * len(G_orig.nodes)
-    for i, branch in enumerate(branches):
+    n_branches = 0
+    for chain in get_chain_index(G_orig).chains:
+        branch = [node for node in chain if G_orig.degree(node) <= 2]
+        if len(branch) == 0:
+            continue
         for node in branch:
-            branch_idx[node] = i
+            branch_idx[node] = n_branches
+        n_branches += 1
+
+    # Isolated nodes are branches of their own
+    for node in G_orig.nodes:
+        if G_orig.degree(node) == 0:
+            branch_idx[node] = n_branches
+            n_branches += 1
     return branch_idx
 
 
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 import networkx as nx
 import numpy as np
 
+from SLDvec.utils.networkx.chain import ChainIndex, get_chain_index
 from SLDvec.utils.networkx.path import (
     get_path_from_degree_1_node_to_crossroad,
     get_path_to_crossroad_node,
@@ -26,7 +27,9 @@ class BranchInfo:
     endbranch_n_neighbors: int
 
 
-def get_all_branches_info(G: nx.Graph, node: int) -> List[BranchInfo]:
+def get_all_branches_info(
+    G: nx.Graph, node: int, index: Optional[ChainIndex] = None
+) -> List[BranchInfo]:
     """Get informations about all branches going out of a node.
     A branch is a path from the specified node (usually a crossroad node) and a crossroad node.
     A crossroad node a node with a degree different from 2.
@@ -34,19 +37,22 @@ def get_all_branches_info(G: nx.Graph, node: int) -> List[BranchInfo]:
     Args:
         G (nx.Graph): The graph to analyze.
         node (int): The node to analyze.
+        index (Optional[ChainIndex], optional): The chain index of the graph, to pass when calling
+            this function many times on the same graph. Defaults to get_chain_index(G).
 
     Returns:
         List[BranchInfo]: The informations about all branches.
     """
+    index = index if index is not None else get_chain_index(G)
     branches_info = []
     for n in G.neighbors(node):
-        branch = get_path_to_crossroad_node(G, node, n)
+        branch = get_path_to_crossroad_node(G, node, n, index)
         endbranch_n_neighbors = G.degree(branch[-1])
 
         if branch[-1] == node:
             min_distance_along_branch = 0
         else:
-            min_distance_along_branch = min(G.nodes[x]["dist"] for x in branch)
+            min_distance_along_branch = index.min_distance(G, node, n)
 
         branches_info.append(
             BranchInfo(
@@ -82,9 +88,11 @@ def annotate_crossroad_linked_to_single_neighbor_node(G: nx.Graph, ending_nodes:
     Args:
         G (nx.Graph): The graph to annotate.
     """
+    index = get_chain_index(G)
+
     # For each ending points of degree 1, we find the nearest crossroad node and get its neighbor
     ending_nodes_crossroad_neighbor = [
-        get_path_from_degree_1_node_to_crossroad(G, node)[-2]
+        get_path_from_degree_1_node_to_crossroad(G, node, index)[-2]
         for node in ending_nodes
         if G.degree(node) == 1
     ]
@@ -93,7 +101,7 @@ def annotate_crossroad_linked_to_single_neighbor_node(G: nx.Graph, ending_nodes:
     nx.set_node_attributes(G, False, "is_direct_neighbor_single_neighbor_node")
     for node in G.nodes():
         if G.degree(node) == 1 and node not in ending_nodes:
-            path = get_path_from_degree_1_node_to_crossroad(G, node)
+            path = get_path_from_degree_1_node_to_crossroad(G, node, index)
             G.nodes[path[-1]]["is_direct_neighbor_single_neighbor_node"] = True
             if "direction_to_single" not in G.nodes[path[-1]]:
                 G.nodes[path[-1]]["direction_to_single"] = path[-2]
@@ -0,0 +1,17 @@
+import networkx as nx
+
+from SLDvec.utils.networkx.chain import invalidate_chain_index
+from SLDvec.utils.networkx.junction import invalidate_junction_table
+from SLDvec.utils.networkx.spatial import invalidate_spatial_index
+
+
+def invalidate_graph_indices(G: nx.Graph) -> None:
+    """Drop everything cached for a graph: its chain index, spatial index and junction table.
+    This should be called after editing a graph in place.
+
+    Args:
+        G (nx.Graph): The edited graph.
+    """
+    invalidate_chain_index(G)
+    invalidate_spatial_index(G)
+    invalidate_junction_table(G)
@@ -0,0 +1,187 @@
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+# The chain index of each graph, dropped automatically when the graph is garbage collected
+_CHAIN_INDICES: "weakref.WeakKeyDictionary[nx.Graph, ChainIndex]" = weakref.WeakKeyDictionary()
+
+
+class ChainIndex:
+    """Index of the chains of degree 2 nodes of a graph.
+
+    A chain starts at a crossroad node (a node with a degree different from 2), goes through degree
+    2 nodes only and ends at the next crossroad node, which can be the starting node itself if the
+    chain is a loop. Components made of degree 2 nodes only are stored as cyclic chains.
+    Every path that follows degree 2 nodes from a node in a given direction is a slice of one chain,
+    so that it can be read from the index instead of walking the graph node by node.
+
+    The index is built in O(N) and is only valid as long as the edges of the graph are not modified.
+    Use get_chain_index to get the index of a graph, which builds it again when needed.
+
+    Attributes:
+        chains (List[List[int]]): The nodes of each chain.
+        cyclic (List[bool]): Whether each chain is made of degree 2 nodes only. The first node of a
+            cyclic chain is not repeated at the end.
+    """
+
+    def __init__(self, G: nx.Graph):
+        self.signature = (G.number_of_nodes(), G.number_of_edges())
+        self.chains: List[List[int]] = []
+        self.cyclic: List[bool] = []
+
+        # (crossroad node, direction) -> (chain index, whether the chain starts at the node)
+        self._start: Dict[Tuple[int, int], Tuple[int, bool]] = {}
+        # degree 2 node -> (chain index, position of the node in the chain)
+        self._position: Dict[int, Tuple[int, int]] = {}
+        self._min_distance: Dict[int, float] = {}
+        self._length: Dict[int, float] = {}
+
+        neighbors = {node: list(nbrs) for node, nbrs in G.adjacency()}
+
+        # Chains starting from crossroad nodes
+        for node, node_neighbors in neighbors.items():
+            if len(node_neighbors) == 2:
+                continue
+            for direction in node_neighbors:
+                if (node, direction) in self._start:
+                    continue
+                chain = [node, direction]
+                while len(neighbors[chain[-1]]) == 2:
+                    a, b = neighbors[chain[-1]]
+                    chain.append(b if a == chain[-2] else a)
+                self._add_chain(chain, cyclic=False)
+
+        # Cycles made of degree 2 nodes only
+        for node, node_neighbors in neighbors.items():
+            if len(node_neighbors) != 2 or node in self._position:
+                continue
+            chain = [node, node_neighbors[0]]
+            while chain[-1] != node:
+                a, b = neighbors[chain[-1]]
+                chain.append(b if a == chain[-2] else a)
+            self._add_chain(chain[:-1], cyclic=True)
+
+    def _add_chain(self, chain: List[int], cyclic: bool) -> None:
+        chain_idx = len(self.chains)
+        self.chains.append(chain)
+        self.cyclic.append(cyclic)
+        if cyclic:
+            for position, node in enumerate(chain):
+                self._position[node] = (chain_idx, position)
+        else:
+            self._start[(chain[0], chain[1])] = (chain_idx, True)
+            self._start[(chain[-1], chain[-2])] = (chain_idx, False)
+            for position in range(1, len(chain) - 1):
+                self._position[chain[position]] = (chain_idx, position)
+
+    def is_valid(self, G: nx.Graph) -> bool:
+        """Cheap check that the graph has not been modified since the index was built."""
+        return self.signature == (G.number_of_nodes(), G.number_of_edges())
+
+    def locate(self, node: int, direction: int) -> Tuple[int, int, bool]:
+        """Find the chain followed when leaving a node in a given direction.
+
+        Args:
+            node (int): The starting node.
+            direction (int): A neighbor of the starting node.
+
+        Raises:
+            ValueError: If the direction node is not a neighbor of the starting node.
+
+        Returns:
+            Tuple[int, int, bool]: The index of the chain, the position of the node in the chain,
+                and whether the chain is followed forward (by increasing positions).
+        """
+        if (node, direction) in self._start:
+            chain_idx, forward = self._start[(node, direction)]
+            return chain_idx, 0 if forward else len(self.chains[chain_idx]) - 1, forward
+
+        if node in self._position:
+            chain_idx, position = self._position[node]
+            chain = self.chains[chain_idx]
+            if chain[(position + 1) % len(chain)] == direction:
+                return chain_idx, position, True
+            if chain[position - 1] == direction:
+                return chain_idx, position, False
+
+        raise ValueError(f"The node {direction} should be a neighbor of the node {node}.")
+
+    def path(self, node: int, direction: int, max_length: Optional[int] = None) -> List[int]:
+        """Return the nodes met when leaving a node in a given direction and following degree 2
+        nodes, until a crossroad node is reached. In a cycle of degree 2 nodes, the path stops when
+        coming back to the starting node, unless max_length is longer than the cycle, in which case
+        the path keeps going around the cycle.
+
+        Args:
+            node (int): The starting node.
+            direction (int): A neighbor of the starting node.
+            max_length (Optional[int], optional): The maximum number of nodes of the path. Defaults
+                to None.
+
+        Returns:
+            List[int]: The nodes of the path, starting with node and direction.
+        """
+        chain_idx, position, forward = self.locate(node, direction)
+        chain = self.chains[chain_idx]
+
+        if self.cyclic[chain_idx]:
+            n = len(chain)
+            length = n + 1 if max_length is None else max_length
+            step = 1 if forward else -1
+            return [chain[(position + step * i) % n] for i in range(length)]
+
+        if forward:
+            end = len(chain) if max_length is None else min(len(chain), position + max_length)
+            return chain[position:end]
+        start = -1 if max_length is None else max(-1, position - max_length)
+        return chain[position:start:-1] if start >= 0 else chain[position::-1]
+
+    def min_distance(self, G: nx.Graph, node: int, direction: int) -> float:
+        """Return the minimum "dist" attribute along the path from a node in a given direction.
+        The value is cached for paths that cover a whole chain."""
+        chain_idx, position, _ = self.locate(node, direction)
+        if position not in (0, len(self.chains[chain_idx]) - 1) or self.cyclic[chain_idx]:
+            return min(G.nodes[x]["dist"] for x in self.path(node, direction))
+        if chain_idx not in self._min_distance:
+            self._min_distance[chain_idx] = min(G.nodes[x]["dist"] for x in self.chains[chain_idx])
+        return self._min_distance[chain_idx]
+
+    def length(self, G: nx.Graph, node: int, direction: int) -> float:
+        """Return the length of the path from a node in a given direction.
+        The value is cached for paths that cover a whole chain."""
+        chain_idx, position, _ = self.locate(node, direction)
+        if position not in (0, len(self.chains[chain_idx]) - 1) or self.cyclic[chain_idx]:
+            return _polyline_length(G, self.path(node, direction))
+        if chain_idx not in self._length:
+            self._length[chain_idx] = _polyline_length(G, self.chains[chain_idx])
+        return self._length[chain_idx]
+
+
+def _polyline_length(G: nx.Graph, nodes: List[int]) -> float:
+    pos = np.array([G.nodes[n]["pos"] for n in nodes])
+    return float(np.linalg.norm(pos[1:] - pos[:-1], axis=1).sum())
+
+
+def get_chain_index(G: nx.Graph) -> ChainIndex:
+    """Return the chain index of a graph, building it if the graph has none yet or if the graph was
+    modified since the index was built.
+
+    Args:
+        G (nx.Graph): The graph to index.
+
+    Returns:
+        ChainIndex: The chain index of the graph.
+    """
+    index = _CHAIN_INDICES.get(G)
+    if index is None or not index.is_valid(G):
+        index = ChainIndex(G)
+        _CHAIN_INDICES[G] = index
+    return index
+
+
+def invalidate_chain_index(G: nx.Graph) -> None:
+    """Drop the chain index of a graph. This should be called after modifying the edges of a graph
+    in a way that keeps its number of nodes and edges, which get_chain_index cannot detect."""
+    _CHAIN_INDICES.pop(G, None)
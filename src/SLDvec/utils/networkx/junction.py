@@ -0,0 +1,199 @@
+import weakref
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+from SLDvec import NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION
+from SLDvec.utils.networkx.chain import get_chain_index
+
+# The junction table of each graph, dropped automatically when the graph is garbage collected
+_JUNCTION_TABLES: "weakref.WeakKeyDictionary[nx.Graph, JunctionTable]" = weakref.WeakKeyDictionary()
+
+
+def compute_tangents(G: nx.Graph, pairs: List[Tuple[int, int]]) -> np.ndarray:
+    """Compute the tangents to the curve at many nodes at once, see get_tangent.
+
+    Args:
+        G (nx.Graph): The graph representing the curve to consider.
+        pairs (List[Tuple[int, int]]): The (node, node_dir) pairs for which to compute the tangent.
+
+    Returns:
+        np.ndarray: The normalized tangents, of shape (len(pairs), 2).
+    """
+    index = get_chain_index(G)
+    paths = [
+        index.path(node, node_dir, max_length=NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION)
+        for node, node_dir in pairs
+    ]
+
+    # Paths stop early at crossroads, so they are stacked by length
+    by_length = defaultdict(list)
+    for i, path in enumerate(paths):
+        by_length[len(path)].append(i)
+
+    tangents = np.zeros((len(pairs), 2))
+    for rows in by_length.values():
+        pos = np.array([[G.nodes[n]["pos"] for n in paths[i]] for i in rows], dtype=float)
+        avg_tangent = np.mean(pos[:, 1:] - pos[:, :-1], axis=1)
+        tangents[rows] = avg_tangent / np.linalg.norm(avg_tangent, axis=1)[:, None]
+    return tangents
+
+
+def _to_positive_angles(vectors: np.ndarray) -> np.ndarray:
+    """Angles of vectors to the x-axis, between 0 and 2pi."""
+    angles = np.arctan2(vectors[..., 1], vectors[..., 0])
+    angles[angles < 0] += 2 * np.pi
+    return angles
+
+
+class JunctionTable:
+    """Geometric descriptors of all the crossroad nodes (nodes with 3 neighbors or more) of a graph.
+
+    All the descriptors are computed in one vectorized pass when the table is built, crossroad nodes
+    of the same degree being stacked together:
+    - the outgoing tangent in the direction of each neighbor (see get_tangent),
+    - the neighbors sorted by increasing angle of the vector to them, for the clockwise order,
+    - for degree 3 nodes, the neighbors sorted by increasing angle of their tangent with the angles
+      between them (Y shape), and the foot and bar directions of the T shape,
+    - for degree 4 nodes, the pairs of most continuous neighbors.
+
+    The table is only valid as long as the graph is not modified. Use get_junction_table to get the
+    table of a graph, which builds it again when the number of nodes or edges changed, and
+    invalidate_junction_table after other edits.
+
+    Attributes:
+        tangents (Dict[Tuple[int, int], np.ndarray]): The tangent of each (node, node_dir) pair.
+        clockwise (Dict[int, Tuple[np.ndarray, np.ndarray]]): The neighbors of each node sorted by
+            increasing angle, and these angles in degrees.
+        Y_shape (Dict[int, Tuple[np.ndarray, np.ndarray]]): The neighbors of each degree 3 node
+            sorted by increasing angle of their tangent, and the angles between consecutive
+            neighbors in degrees.
+        T_foot (Dict[int, int]): The direction of the foot of the T of each degree 3 node.
+        T_bar (Dict[int, List[int]]): The directions of the bar of the T of each degree 3 node.
+        tangent_order (Dict[int, Dict[int, int]]): The most continuous neighbor of each neighbor of
+            each degree 4 node.
+    """
+
+    def __init__(self, G: nx.Graph):
+        self.signature = (G.number_of_nodes(), G.number_of_edges())
+        self.tangents: Dict[Tuple[int, int], np.ndarray] = {}
+        self.clockwise: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.Y_shape: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.T_foot: Dict[int, int] = {}
+        self.T_bar: Dict[int, List[int]] = {}
+        self.tangent_order: Dict[int, Dict[int, int]] = {}
+
+        by_degree = defaultdict(list)
+        for node, degree in G.degree():
+            if degree > 2:
+                by_degree[degree].append(node)
+
+        for degree, nodes in by_degree.items():
+            neighbors = np.array([list(G.neighbors(node)) for node in nodes])
+            pairs = [(node, n) for node, row in zip(nodes, neighbors.tolist()) for n in row]
+            tangents = compute_tangents(G, pairs)
+            tangents.flags.writeable = False
+            for pair, tangent in zip(pairs, tangents):
+                self.tangents[pair] = tangent
+            tangents = tangents.reshape(len(nodes), degree, 2)
+
+            order = self._add_clockwise_order(G, nodes, neighbors)
+            if degree == 3:
+                self._add_Y_shape(nodes, neighbors, tangents)
+                self._add_T_shape(nodes, neighbors, tangents)
+            if degree == 4:
+                sorted_neighbors = np.take_along_axis(neighbors, order, axis=1)
+                sorted_tangents = np.take_along_axis(tangents, order[:, :, None], axis=1)
+                self._add_tangent_pairs(nodes, sorted_neighbors, sorted_tangents)
+
+    def _add_clockwise_order(
+        self, G: nx.Graph, nodes: List[int], neighbors: np.ndarray
+    ) -> np.ndarray:
+        node_pos = np.array([G.nodes[node]["pos"] for node in nodes], dtype=float)
+        neighbors_pos = np.array([[G.nodes[n]["pos"] for n in row] for row in neighbors.tolist()])
+        vector_to_neighbors = neighbors_pos - node_pos[:, None, :]
+        vector_to_neighbors = (
+            vector_to_neighbors / np.linalg.norm(vector_to_neighbors, axis=2)[:, :, None]
+        )
+
+        angles = _to_positive_angles(vector_to_neighbors)
+        order = np.argsort(angles, axis=1)
+        sorted_neighbors = np.take_along_axis(neighbors, order, axis=1)
+        sorted_angles = np.degrees(np.take_along_axis(angles, order, axis=1))
+        for i, node in enumerate(nodes):
+            self.clockwise[node] = (sorted_neighbors[i], sorted_angles[i])
+        return order
+
+    def _add_Y_shape(self, nodes: List[int], neighbors: np.ndarray, tangents: np.ndarray) -> None:
+        angles = _to_positive_angles(tangents)
+        order = np.argsort(angles, axis=1)
+        sorted_neighbors = np.take_along_axis(neighbors, order, axis=1)
+        angles = np.degrees(np.take_along_axis(angles, order, axis=1))
+
+        angle01 = angles[:, 1] - angles[:, 0]
+        angle12 = angles[:, 2] - angles[:, 1]
+        angle20 = 360 - (angles[:, 2] - angles[:, 0])
+        between = np.stack([angle01, angle12, angle20], axis=1)
+        for i, node in enumerate(nodes):
+            self.Y_shape[node] = (sorted_neighbors[i], between[i])
+
+    def _add_T_shape(self, nodes: List[int], neighbors: np.ndarray, tangents: np.ndarray) -> None:
+        # Cosine between all the tangents, the two most opposite ones form the bar of the T
+        cosines = np.einsum("kid,kjd->kij", tangents, tangents)
+        idx = np.argmin(cosines.reshape(len(nodes), -1), axis=1)
+        bar_i, bar_j = np.unravel_index(idx, (3, 3))
+        for node, row, i, j in zip(nodes, neighbors.tolist(), bar_i.tolist(), bar_j.tolist()):
+            other = [x for x in range(3) if x not in [i, j]][0]
+            self.T_foot[node] = row[other]
+            self.T_bar[node] = [row[i], row[j]]
+
+    def _add_tangent_pairs(
+        self, nodes: List[int], sorted_neighbors: np.ndarray, sorted_tangents: np.ndarray
+    ) -> None:
+        # There are two possible pairs of non-crossing neighbors in the clockwise order. The most
+        # continuous one has the smallest angle between the two branches.
+        pairs_options = [[[0, 1], [2, 3]], [[0, 3], [1, 2]]]
+        angles = np.arctan2(sorted_tangents[..., 1], sorted_tangents[..., 0])
+        angle_measure = []
+        for pairs in pairs_options:
+            angle_diff = np.abs(angles[:, [a for a, _ in pairs]] - angles[:, [b for _, b in pairs]])
+            angle_diff = np.where(angle_diff > np.pi, 2 * np.pi - angle_diff, angle_diff)
+            angle_diff = np.degrees(angle_diff)
+            angle_measure.append(angle_diff[:, 0] + angle_diff[:, 1])
+        choice = np.where(angle_measure[0] > angle_measure[1], 0, 1)
+
+        for node, row, option in zip(nodes, sorted_neighbors.tolist(), choice):
+            self.tangent_order[node] = {}
+            for a, b in pairs_options[option]:
+                self.tangent_order[node][row[a]] = row[b]
+                self.tangent_order[node][row[b]] = row[a]
+
+    def is_valid(self, G: nx.Graph) -> bool:
+        """Cheap check that the graph has not been modified since the table was built."""
+        return self.signature == (G.number_of_nodes(), G.number_of_edges())
+
+
+def get_junction_table(G: nx.Graph) -> JunctionTable:
+    """Return the junction table of a graph, building it if the graph has none yet or if the number
+    of nodes or edges of the graph changed since the table was built.
+
+    Args:
+        G (nx.Graph): The graph to describe. Each node should have a "pos" attribute.
+
+    Returns:
+        JunctionTable: The junction table of the graph.
+    """
+    table = _JUNCTION_TABLES.get(G)
+    if table is None or not table.is_valid(G):
+        table = JunctionTable(G)
+        _JUNCTION_TABLES[G] = table
+    return table
+
+
+def invalidate_junction_table(G: nx.Graph) -> None:
+    """Drop the junction table of a graph. This should be called after moving nodes or modifying
+    the edges of a graph in a way that keeps its number of nodes and edges, which get_junction_table
+    cannot detect."""
+    _JUNCTION_TABLES.pop(G, None)
@@ -4,6 +4,8 @@ from typing import List
 import networkx as nx
 import numpy as np
 
+from SLDvec.utils.networkx.cache import invalidate_graph_indices
+
 
 def merge_branch(G: nx.Graph, nodes: List[int]) -> int:
     """Creates a new node and merges the nodes in the list of nodes into it.
@@ -93,4 +95,5 @@ def merge_branch(G: nx.Graph, nodes: List[int]) -> int:
         G.graph["ghost"][G.nodes[node]["uuid"]] = G.nodes[new_node_idx]["uuid"]
         G.remove_node(node)
 
+    invalidate_graph_indices(G)
     return new_node_idx
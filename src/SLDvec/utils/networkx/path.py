@@ -1,9 +1,13 @@
-from typing import List
+from typing import List, Optional
 
 import networkx as nx
 
+from SLDvec.utils.networkx.chain import ChainIndex, get_chain_index
 
-def get_path_from_degree_1_node_to_crossroad(G: nx.Graph, node: int) -> List[int]:
+
+def get_path_from_degree_1_node_to_crossroad(
+    G: nx.Graph, node: int, index: Optional[ChainIndex] = None
+) -> List[int]:
     """Find the path from a node with a single neighbor to the closest crossroad node (node with 3
     or more neighbors).
     If there the path is a loop, the function will return the loop.
@@ -12,6 +16,8 @@ def get_path_from_degree_1_node_to_crossroad(G: nx.Graph, node: int) -> List[int
     Args:
         G (nx.Graph): The graph to analyze.
         node (int): The node with only one neighbor to start from.
+        index (Optional[ChainIndex], optional): The chain index of the graph, to pass when calling
+            this function many times on the same graph. Defaults to get_chain_index(G).
 
     Raises:
         ValueError: If the original node has more than one neighbor.
@@ -24,26 +30,14 @@ def get_path_from_degree_1_node_to_crossroad(G: nx.Graph, node: int) -> List[int
     if len(neighbors) != 1:
         raise ValueError(f"The node {node} should have only one neighbor.")
 
-    # Initialize the path to the crossroad with the node and its neighbor
-    original_node = node
-    path_to_crossroad = [node]
-    node = neighbors[0]
-    path_to_crossroad.append(node)
-
-    # Follow the path until a crossroad is found or the path is a loop
-    neighbors = list(G.neighbors(node))
-    while len(neighbors) == 2 and node != original_node:
-        for n in neighbors:
-            if n not in path_to_crossroad:
-                path_to_crossroad.append(n)
-                node = n
-                neighbors = list(G.neighbors(n))
-                break
+    # The path follows the chain of degree 2 nodes starting with the single neighbor
+    index = index if index is not None else get_chain_index(G)
+    return index.path(node, neighbors[0])
 
-    return path_to_crossroad
 
-
-def get_path_to_crossroad_node(G: nx.Graph, node: int, direction: int) -> List[int]:
+def get_path_to_crossroad_node(
+    G: nx.Graph, node: int, direction: int, index: Optional[ChainIndex] = None
+) -> List[int]:
     """Find the path between a given node and the closest crossroad node, in a given node direction.
     A crossroad is a node with 3 or more neighbors, or a dead end.
 
@@ -51,6 +45,8 @@ def get_path_to_crossroad_node(G: nx.Graph, node: int, direction: int) -> List[i
         G (nx.Graph): The graph to analyze.
         node (int): The starting node.
         direction (int): The direction node, it should be a node adjacent to the starting node.
+        index (Optional[ChainIndex], optional): The chain index of the graph, to pass when calling
+            this function many times on the same graph. Defaults to get_chain_index(G).
 
     Raises:
         ValueError: If the direction node is not a neighbor of the starting node.
@@ -59,23 +55,19 @@ def get_path_to_crossroad_node(G: nx.Graph, node: int, direction: int) -> List[i
         List[int]: A list of nodes from the starting node to the non-route node.
     """
     # Check that the direction node is a neighbor of the starting node
-    if direction not in G.neighbors(node):
+    if not G.has_edge(node, direction):
         raise ValueError(f"The node {direction} should be a neighbor of the node {node}.")
 
-    # Initialize the path to the non-route node with the node and the direction node
-    path_to_crossroad = [node, direction]
-
-    # Follow the path until a crossroad node is found or the path is a loop
-    neighbors = list(G.neighbors(direction))
-    while len(neighbors) == 2:
-        for n in neighbors:
-            if n not in path_to_crossroad:
-                path_to_crossroad.append(n)
-                neighbors = list(G.neighbors(n))
-                break
-
-        if len(path_to_crossroad) > 1 and any([n == path_to_crossroad[0] for n in neighbors]):
-            # Avoid infinite loop in the case the path is a loop
-            path_to_crossroad.append(path_to_crossroad[0])
-            break
+    # Follow the chain of degree 2 nodes until a crossroad node is found or the path is a loop
+    index = index if index is not None else get_chain_index(G)
+    path_to_crossroad = index.path(node, direction)
+
+    # If the crossroad node is also a neighbor of the starting node, the path is closed back to the
+    # starting node, as a loop would be
+    if (
+        len(path_to_crossroad) > 2
+        and path_to_crossroad[-1] != node
+        and G.has_edge(path_to_crossroad[-1], node)
+    ):
+        path_to_crossroad.append(node)
     return path_to_crossroad
@@ -0,0 +1,117 @@
+import weakref
+from typing import Collection, Dict, List
+
+import networkx as nx
+import numpy as np
+from scipy.spatial import cKDTree
+
+# The spatial index of each graph, dropped automatically when the graph is garbage collected
+_SPATIAL_INDICES: "weakref.WeakKeyDictionary[nx.Graph, SpatialIndex]" = weakref.WeakKeyDictionary()
+
+# Relative margin added to the radius of the tree queries, so that rounding differences between
+# the tree and NumPy never drop a point that is strictly inside the radius
+_RADIUS_MARGIN = 1e-9
+
+
+class SpatialIndex:
+    """KD-tree over the "pos" attribute of the nodes of a graph.
+
+    The index answers the radius and nearest node queries that previously scanned every node of the
+    graph, in O(log N) plus the size of the answer. Distances are computed again with NumPy on the
+    candidates returned by the tree, so that the results are exactly the ones of a full scan.
+
+    The index is only valid as long as no node is added, removed or moved. Use get_spatial_index to
+    get the index of a graph, which builds it again when needed.
+
+    Attributes:
+        nodes (np.ndarray): The nodes of the graph, in the order of G.nodes.
+        positions (np.ndarray): The positions of the nodes, of shape (N, 2).
+    """
+
+    def __init__(self, G: nx.Graph):
+        self.signature = (G.number_of_nodes(), G.number_of_edges())
+        self.nodes = np.array(list(G.nodes()))
+        self.positions = np.array([pos for _, pos in G.nodes(data="pos")], dtype=float)
+        self.positions = self.positions.reshape(len(self.nodes), 2)
+        self._row: Dict[int, int] = {node: row for row, node in enumerate(self.nodes.tolist())}
+        self._tree = cKDTree(self.positions) if len(self.nodes) > 0 else None
+
+    def is_valid(self, G: nx.Graph) -> bool:
+        """Cheap check that the graph has not been modified since the index was built."""
+        return self.signature == (G.number_of_nodes(), G.number_of_edges())
+
+    def rows_within_radius(self, pos: np.ndarray, radius: float) -> np.ndarray:
+        """Return the rows of the nodes strictly closer than radius to a position (L2 norm).
+
+        Args:
+            pos (np.ndarray): The center of the query.
+            radius (float): The radius of the query.
+
+        Returns:
+            np.ndarray: The rows of the nodes in the disk, in increasing order.
+        """
+        if self._tree is None or not radius > 0:
+            return np.zeros(0, dtype=int)
+        candidates = self._tree.query_ball_point(pos, radius * (1 + _RADIUS_MARGIN))
+        candidates = np.sort(np.array(candidates, dtype=int))
+        l2_norm = np.linalg.norm(self.positions[candidates] - pos[None, :], axis=1)
+        return candidates[l2_norm < radius]
+
+    def within_radius(self, pos: np.ndarray, radius: float) -> List[int]:
+        """Return the nodes strictly closer than radius to a position (L2 norm), in the order of
+        G.nodes."""
+        return self.nodes[self.rows_within_radius(pos, radius)].tolist()
+
+    def nearest_distance(self, pos: np.ndarray, excluded: Collection[int]) -> float:
+        """Return the Chebyshev distance (maximum of the absolute coordinate differences) from a
+        position to the closest node that is not excluded. If all the nodes are excluded, return the
+        Chebyshev distance to the farthest node instead.
+
+        Args:
+            pos (np.ndarray): The position to measure the distance from.
+            excluded (Collection[int]): The nodes to ignore.
+
+        Returns:
+            float: The distance to the closest node that is not excluded.
+        """
+        n_nodes = len(self.nodes)
+        excluded_rows = np.zeros(n_nodes, dtype=bool)
+        excluded_rows[[self._row[node] for node in excluded if node in self._row]] = True
+
+        if not excluded_rows.all():
+            # Look at more and more neighbors, until one of them is not excluded
+            k = 16
+            while True:
+                k = min(k, n_nodes)
+                _, rows = self._tree.query(pos, k=k, p=np.inf)
+                rows = np.atleast_1d(rows)
+                allowed = rows[~excluded_rows[rows]]
+                if len(allowed) > 0:
+                    return np.min(np.max(np.abs(self.positions[allowed] - pos), axis=1))
+                k *= 4
+
+        return np.max(np.max(np.abs(self.positions - pos), axis=1))
+
+
+def get_spatial_index(G: nx.Graph) -> SpatialIndex:
+    """Return the spatial index of a graph, building it if the graph has none yet or if the graph
+    was modified since the index was built.
+
+    Args:
+        G (nx.Graph): The graph to index. Each node should have a "pos" attribute.
+
+    Returns:
+        SpatialIndex: The spatial index of the graph.
+    """
+    index = _SPATIAL_INDICES.get(G)
+    if index is None or not index.is_valid(G):
+        index = SpatialIndex(G)
+        _SPATIAL_INDICES[G] = index
+    return index
+
+
+def invalidate_spatial_index(G: nx.Graph) -> None:
+    """Drop the spatial index of a graph. This should be called after moving nodes of a graph, or
+    after modifying it in a way that keeps its number of nodes and edges, which get_spatial_index
+    cannot detect."""
+    _SPATIAL_INDICES.pop(G, None)
@@ -1,18 +1,19 @@
-from typing import List
+from typing import List, Optional
 
 import networkx as nx
-import numpy as np
 
-from .tangent import get_tangent
+from .junction import JunctionTable, get_junction_table
 
 
-def find_T_foot_direction(node: int, G: nx.Graph) -> int:
+def find_T_foot_direction(node: int, G: nx.Graph, table: Optional[JunctionTable] = None) -> int:
     """Given a degree 3 node in a graph representing a T-shape intersection of a line drawing, find
     the direction of the foot of the T intersection.
 
     Args:
         node (int): The degree 3 T-shape node for which to find the direction of the foot.
         G (nx.Graph): The graph to analyze.
+        table (Optional[JunctionTable], optional): The junction table of the graph, to pass when
+            calling this function many times on the same graph. Defaults to get_junction_table(G).
 
     Raises:
         ValueError: If the node does not have 3 neighbors.
@@ -26,29 +27,23 @@ def find_T_foot_direction(node: int, G: nx.Graph) -> int:
     if len(neighbors) != 3:
         raise ValueError(f"The node {node} should have 3 neighbors.")
 
-    tangents = {n: get_tangent(G, node, n) for n in neighbors}
+    # The foot is the neighbor that is the less aligned with the others, computed for all degree 3
+    # nodes at once in the junction table
+    table = table if table is not None else get_junction_table(G)
+    return table.T_foot[node]
 
-    # Compute the cosine distance between all the tangents
-    cosines = np.zeros([len(neighbors), len(neighbors)])
-    for i, n1 in enumerate(neighbors):
-        for j, n2 in enumerate(neighbors):
-            cosines[i, j] = np.dot(tangents[n1], tangents[n2])
 
-    # Find the neighbors that is the less aligned with the others (in opposite directions)
-    idx = np.argmin(cosines)
-    i, j = np.unravel_index(idx, cosines.shape)
-    other = [x for x in range(3) if x not in [i, j]][0]
-
-    return neighbors[other]
-
-
-def find_T_bar_directions(node: int, G: nx.Graph) -> List[int]:
+def find_T_bar_directions(
+    node: int, G: nx.Graph, table: Optional[JunctionTable] = None
+) -> List[int]:
     """Given a degree 3 node in a graph representing a T-shape intersection of a line drawing, find
     the directions of the two bars of the T intersection.
 
     Args:
         node (int): The degree 3 T-shape node for which to find the directions of the bars.
         G (nx.Graph): The graph to analyze.
+        table (Optional[JunctionTable], optional): The junction table of the graph, to pass when
+            calling this function many times on the same graph. Defaults to get_junction_table(G).
 
     Raises:
         ValueError: If the node does not have 3 neighbors.
@@ -61,16 +56,7 @@ def find_T_bar_directions(node: int, G: nx.Graph) -> List[int]:
     if len(neighbors) != 3:
         raise ValueError(f"The node {node} should have 3 neighbors.")
 
-    tangents = {n: get_tangent(G, node, n) for n in neighbors}
-
-    # Compute the cosine distance between all the tangents
-    cosines = np.zeros([len(neighbors), len(neighbors)])
-    for i, n1 in enumerate(neighbors):
-        for j, n2 in enumerate(neighbors):
-            cosines[i, j] = np.dot(tangents[n1], tangents[n2])
-
-    # Find the two neighbors that are the most aligned (in opposite directions)
-    idx = np.argmin(cosines)
-    i, j = np.unravel_index(idx, cosines.shape)
-
-    return [neighbors[i], neighbors[j]]
+    # The bar is made of the two neighbors that are the most aligned (in opposite directions),
+    # computed for all degree 3 nodes at once in the junction table
+    table = table if table is not None else get_junction_table(G)
+    return list(table.T_bar[node])
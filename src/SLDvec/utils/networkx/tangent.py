@@ -1,39 +1,32 @@
+from typing import Optional
+
 import networkx as nx
 import numpy as np
 
-from SLDvec import NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION
+from SLDvec.utils.networkx.junction import JunctionTable, compute_tangents, get_junction_table
 
 
-def get_tangent(G: nx.Graph, node: int, node_dir: int) -> np.array:
+def get_tangent(
+    G: nx.Graph, node: int, node_dir: int, table: Optional[JunctionTable] = None
+) -> np.array:
     """Compute the tangent to the curve at a given node, in a given direction.
     The tangent is computed as the average of the difference between the positions of the nodes
-    in the direction of the node_dir.
+    in the direction of the node_dir. Note that this method emphasizes more the direction of the
+    longest segment.
 
     Args:
         G (nx.Graph): The graph representing the curve to consider.
         node (int): The node for which to compute the tangent.
         node_dir (int): The node in the direction of which to compute the tangent.
+        table (Optional[JunctionTable], optional): The junction table of the graph, to pass when
+            calling this function many times on the same graph. Defaults to get_junction_table(G).
 
     Returns:
         np.array: A 2D vector representing the tangent.
     """
-    # Find a list of nodes starting from node in the direction of the node_dir
-    node_branch = [node, node_dir]
-    current = node_dir
-    while G.degree[current] == 2 and len(node_branch) < NUMBER_ADJACENT_NODE_TANGENT_COMPUTATION:
-        neighbors = list(G.neighbors(current))
-        neighbors.remove(node_branch[-2])
-        current = neighbors[0]
-        node_branch.append(current)
-
-    # Get the positions of all these nodes and computes the local tangent
-    pos = np.array([G.nodes[n]["pos"] for n in node_branch])
-    tangents = pos[1:] - pos[:-1]
-
-    # Compute the tangent of the node of interest as the average of the local tangents, and
-    # normalize the results. Note that this method emphasizes more the direction of the longest
-    # segment.
-    avg_tangent = np.mean(tangents, axis=0)
-    norm_avg_tangent = avg_tangent / np.linalg.norm(avg_tangent)
-
-    return norm_avg_tangent
+    # The tangents of the crossroad nodes are all computed at once in the junction table
+    table = table if table is not None else get_junction_table(G)
+    tangents = table.tangents
+    if (node, node_dir) in tangents:
+        return tangents[(node, node_dir)]
+    return compute_tangents(G, [(node, node_dir)])[0]
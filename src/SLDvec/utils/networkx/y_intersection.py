@@ -1,12 +1,14 @@
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import networkx as nx
 import numpy as np
 
-from SLDvec.utils.networkx import get_tangent
+from SLDvec.utils.networkx.junction import JunctionTable, get_junction_table
 
 
-def get_opposite_angle(G: nx.Graph, node: int) -> Dict[int, float]:
+def get_opposite_angle(
+    G: nx.Graph, node: int, table: Optional[JunctionTable] = None
+) -> Dict[int, float]:
     # Check that the node has 3 neighbors, and find these neighbors
     neighbors = list(G.neighbors(node))
     if len(neighbors) != 3:
@@ -14,28 +16,23 @@ def get_opposite_angle(G: nx.Graph, node: int) -> Dict[int, float]:
             f"The node {node} should have 3 neighbors for it to be a Y intersection node."
         )
 
-    # Compute all three outgoing tangents, and the angles they form with the x-axis (between 0 and
-    # 2*pi)
-    neighbors_tangent = np.array([get_tangent(G, node, n) for n in neighbors])
-    angles = np.arctan2(neighbors_tangent[:, 1], neighbors_tangent[:, 0])
-    angles[angles < 0] += 2 * np.pi
-
-    # Sort the neighbors by increasing angles, convert the angles to degrees
-    neighbor_order = np.argsort(angles)
-    angles = np.degrees(angles[neighbor_order])
-    order = np.array(neighbors)[neighbor_order]
+    # The neighbors sorted by increasing angle of their tangent, and the angles between them
+    table = table if table is not None else get_junction_table(G)
+    order, (angle01, angle12, angle20) = table.Y_shape[node]
 
     # Compute the angles between the neighbors
     opposite_angle = {
-        order[0]: angles[2] - angles[1],
-        order[1]: 360 - (angles[2] - angles[0]),
-        order[2]: angles[1] - angles[0],
+        order[0]: angle12,
+        order[1]: angle20,
+        order[2]: angle01,
     }
 
     return opposite_angle
 
 
-def get_Y_shape_informations(G: nx.Graph, node: int) -> Tuple[np.array, np.array]:
+def get_Y_shape_informations(
+    G: nx.Graph, node: int, table: Optional[JunctionTable] = None
+) -> Tuple[np.array, np.array]:
     """This function returns some informations about a Y intersection node in a graph.
     A Y intersection node is a node with 3 neighbors. The function returns the neighbors in the
     order they are encountered when turning around the node in the clockwise direction, and the
@@ -44,6 +41,8 @@ def get_Y_shape_informations(G: nx.Graph, node: int) -> Tuple[np.array, np.array
     Args:
         G (nx.Graph): The graph to analyze.
         node (int): The degree 3 Y-shape node for which to find the shape information.
+        table (Optional[JunctionTable], optional): The junction table of the graph, to pass when
+            calling this function many times on the same graph. Defaults to get_junction_table(G).
 
     Raises:
         ValueError: If the node does not have 3 neighbors.
@@ -60,32 +59,24 @@ def get_Y_shape_informations(G: nx.Graph, node: int) -> Tuple[np.array, np.array
             f"The node {node} should have 3 neighbors for it to be a Y intersection node."
         )
 
-    # Compute all three outgoing tangents, and the angles they form with the x-axis (between 0 and
-    # 2*pi)
-    neighbors_tangent = np.array([get_tangent(G, node, n) for n in neighbors])
-    angles = np.arctan2(neighbors_tangent[:, 1], neighbors_tangent[:, 0])
-    angles[angles < 0] += 2 * np.pi
-
-    # Sort the neighbors by increasing angles, convert the angles to degrees
-    neighbor_order = np.argsort(angles)
-    angles = np.degrees(angles[neighbor_order])
-    order = np.array(neighbors)[neighbor_order]
-
-    # Compute the angles between the neighbors
-    angle01 = angles[1] - angles[0]
-    angle12 = angles[2] - angles[1]
-    angle20 = 360 - (angles[2] - angles[0])
-
-    return order, np.array([angle01, angle12, angle20])
+    # The outgoing tangents and the angles they form are computed for all degree 3 nodes at once in
+    # the junction table
+    table = table if table is not None else get_junction_table(G)
+    order, angles = table.Y_shape[node]
+    return order.copy(), angles.copy()
 
 
-def get_Y_shape_angle_metric(G: nx.Graph, node: int) -> Tuple[float, float]:
+def get_Y_shape_angle_metric(
+    G: nx.Graph, node: int, table: Optional[JunctionTable] = None
+) -> Tuple[float, float]:
     """Return the maximum angle of a Y intersection node and the difference between the two smallest
     angles.
 
     Args:
         G (nx.Graph): The graph to analyze.
         node (int): The degree 3 Y-shape node for which to find the angle metric.
+        table (Optional[JunctionTable], optional): The junction table of the graph, to pass when
+            calling this function many times on the same graph. Defaults to get_junction_table(G).
 
     Raises:
         ValueError: If the node does not have 3 neighbors.
@@ -94,7 +85,7 @@ def get_Y_shape_angle_metric(G: nx.Graph, node: int) -> Tuple[float, float]:
         Tuple[float, float]: The maximum angle of the Y intersection node, and the difference
             between the two smallest angles.
     """
-    order, angles = get_Y_shape_informations(G, node)
+    order, angles = get_Y_shape_informations(G, node, table)
     angle01, angle12, angle20 = angles[0], angles[1], angles[2]
 
     if angle01 > angle12 and angle01 > angle20:
@@ -109,7 +100,7 @@ def get_Y_shape_angle_metric(G: nx.Graph, node: int) -> Tuple[float, float]:
     return max_angle, diff_small_angle
 
 
-def find_Y_foot_direction(G: nx.Graph, node: int) -> int:
+def find_Y_foot_direction(G: nx.Graph, node: int, table: Optional[JunctionTable] = None) -> int:
     """Given a graph and a degree 3 node, find the direction of the foot of the Y intersection.
     In practice, this function finds the node opposite to the smallest angle formed by the three
     branches.
@@ -117,6 +108,8 @@ def find_Y_foot_direction(G: nx.Graph, node: int) -> int:
     Args:
         G (nx.Graph): The graph to analyze.
         node (int): The degree 3 Y-shape node for which to find the direction of the foot.
+        table (Optional[JunctionTable], optional): The junction table of the graph, to pass when
+            calling this function many times on the same graph. Defaults to get_junction_table(G).
 
     Raises:
         ValueError: If the node does not have 3 neighbors.
@@ -124,7 +117,7 @@ def find_Y_foot_direction(G: nx.Graph, node: int) -> int:
     Returns:
         int: The index of the node in the direction of the foot of the Y intersection.
     """
-    order, angles = get_Y_shape_informations(G, node)
+    order, angles = get_Y_shape_informations(G, node, table)
     angle01, angle12, angle20 = angles[0], angles[1], angles[2]
 
     # Output the node with the smallest opposite angle
@@ -1,20 +1,34 @@
+import gzip
+import io
 from pathlib import Path
-from typing import Tuple
+from typing import IO, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import svgwrite
 
+from SLDvec import SVG_PRECISION
+
+# Style shared by all the strokes, set once on the group containing the paths
+_STROKE_STYLE = {
+    "fill": "none",
+    "stroke": "black",
+    "stroke-linecap": "round",
+    "stroke-linejoin": "round",
+    "stroke-width": 2,
+}
+
 
 def export_svg(
     orig_image_shape: Tuple[int, int], scale_ratio: float, bezier_splines: np.array, save_path: Path
 ):
-    """Export a list of bezier splines to an SVG file.
+    """Export a list of bezier splines to an SVG file, as a svgwrite Drawing. Prefer write_svg,
+    which is faster and writes smaller files.
 
     Args:
         orig_image_shape (Tuple[int, int]): The shape of the original image.
         scale_ratio (float): The ratio by which the bezier splines were scaled.
         bezier_splines (np.array): The list of bezier splines to export, as a list of lists of 4
-            pairs (x-y coordinates).
+            pairs (x-y coordinates). They are not modified.
         save_path (Path): The path to the SVG file to save.
     """
     dwg = svgwrite.Drawing(
@@ -22,9 +36,7 @@ def export_svg(
     )
 
     for i in range(len(bezier_splines)):
-        bezier_splines[i] /= scale_ratio
-
-        beziers = bezier_splines[i]
+        beziers = np.asarray(bezier_splines[i]) / scale_ratio
 
         path = dwg.path()
         path.push("M", *beziers[0][0])  # Move to the beginning of the curve
@@ -35,15 +47,143 @@ def export_svg(
             path.push("Z")  # Close the path
 
         # Set style attributes and add the path to the drawing
-        path.update(
-            {
-                "stroke": "black",
-                "stroke-width": 2,
-                "fill": "none",
-                "stroke-linecap": "round",
-                "stroke-linejoin": "round",
-            }
-        )
+        path.update(_STROKE_STYLE)
         dwg.add(path)
 
     return dwg
+
+
+def format_coordinates(values: np.ndarray, precision: Optional[int]) -> str:
+    """Format an array of coordinates as numbers separated by spaces, in one pass.
+
+    Args:
+        values (np.ndarray): The coordinates to format.
+        precision (Optional[int]): The number of decimals to keep, None to keep the full precision.
+
+    Returns:
+        str: The formatted coordinates, without trailing zeros.
+    """
+    if precision is not None:
+        # Adding 0 turns the negative zeros created by the rounding into positive ones
+        values = np.round(values, precision) + 0.0
+    text = " ".join(map(repr, values.ravel().tolist())) + " "
+    return text.replace(".0 ", " ")[:-1]
+
+
+def path_data(beziers: np.ndarray, precision: Optional[int] = None, relative: bool = False) -> str:
+    """Return the "d" attribute of the SVG path of a stroke.
+
+    Args:
+        beziers (np.ndarray): The Bezier curves of the stroke, of shape (N, 4, 2).
+        precision (Optional[int], optional): The number of decimals of the coordinates, None to keep
+            the full precision. Defaults to None.
+        relative (bool, optional): Whether to write the curves with relative commands, which are
+            shorter when the coordinates are large compared to the curves. Defaults to False.
+
+    Returns:
+        str: The path data.
+    """
+    beziers = np.asarray(beziers, dtype=float)
+    closed = bool((beziers[0][0] == beziers[-1][-1]).all())
+    if precision is not None:
+        beziers = np.round(beziers, precision)
+
+    start = beziers[0, 0]
+    controls = beziers[:, 1:]
+    if relative:
+        # The offsets are taken from the end of the previous curve, which is the current point of
+        # the path, and computed on the rounded coordinates so that rounding errors do not add up
+        current_points = np.concatenate([start[None], controls[:-1, 2]])
+        controls = controls - current_points[:, None]
+
+    move, curve = ("m", "c") if relative else ("M", "C")
+    data = f"{move}{format_coordinates(start, precision)}{curve}"
+    data += format_coordinates(controls, precision)
+    return data + "Z" if closed else data
+
+
+def _svg_chunks(
+    orig_image_shape: Tuple[int, int],
+    scale_ratio: float,
+    bezier_splines: List[np.ndarray],
+    precision: Optional[int],
+    relative: bool,
+) -> Iterator[str]:
+    """Produce the SVG document piece by piece, one path per stroke."""
+    height, width = orig_image_shape[0], orig_image_shape[1]
+    yield (
+        '<?xml version="1.0" encoding="utf-8" ?>\n'
+        f'<svg baseProfile="tiny" height="{height}" version="1.2" width="{width}" '
+        'xmlns="http://www.w3.org/2000/svg">\n'
+    )
+    style = " ".join(f'{key}="{value}"' for key, value in _STROKE_STYLE.items())
+    yield f"<g {style}>\n"
+    for beziers in bezier_splines:
+        if len(beziers) == 0:
+            continue
+        data = path_data(np.asarray(beziers, dtype=float) / scale_ratio, precision, relative)
+        yield f'<path d="{data}"/>\n'
+    yield "</g>\n</svg>\n"
+
+
+def write_svg(
+    orig_image_shape: Tuple[int, int],
+    scale_ratio: float,
+    bezier_splines: List[np.ndarray],
+    output: Union[str, Path, IO],
+    precision: Optional[int] = SVG_PRECISION,
+    relative: bool = False,
+    compress: Optional[bool] = None,
+) -> None:
+    """Write a list of bezier splines to an SVG file or buffer, one path per stroke, without building
+    the document in memory. The bezier splines are not modified.
+
+    Args:
+        orig_image_shape (Tuple[int, int]): The shape of the original image.
+        scale_ratio (float): The ratio by which the bezier splines were scaled.
+        bezier_splines (List[np.ndarray]): The Bezier curves of each stroke, each of shape (N, 4, 2).
+        output (Union[str, Path, IO]): The path of the file to write, or a text or binary buffer.
+        precision (Optional[int], optional): The number of decimals of the coordinates, None to keep
+            the full precision. Defaults to SVG_PRECISION.
+        relative (bool, optional): Whether to write the curves with relative commands. Defaults to
+            False.
+        compress (Optional[bool], optional): Whether to compress the output with gzip (.svgz). If
+            None, the output is compressed when it is a path with the .svgz extension. Defaults to
+            None.
+
+    Raises:
+        ValueError: If the output should be compressed but is a text buffer.
+    """
+    chunks = _svg_chunks(orig_image_shape, scale_ratio, bezier_splines, precision, relative)
+
+    if isinstance(output, io.TextIOBase):
+        if compress:
+            raise ValueError("A compressed SVG can only be written to a binary buffer.")
+        output.writelines(chunks)
+    elif isinstance(output, (str, Path)):
+        if compress is None:
+            compress = Path(output).suffix == ".svgz"
+        with open(output, "wb") as f:
+            _write_binary(f, chunks, compress)
+    else:
+        _write_binary(output, chunks, bool(compress))
+
+
+def _write_binary(f: IO[bytes], chunks: Iterator[str], compress: bool) -> None:
+    if compress:
+        # The modification time is not stored, so that the same drawing gives the same file
+        with gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+            gz.writelines(chunk.encode("utf-8") for chunk in chunks)
+    else:
+        f.writelines(chunk.encode("utf-8") for chunk in chunks)
+
+
+def svg_to_string(
+    orig_image_shape: Tuple[int, int],
+    scale_ratio: float,
+    bezier_splines: List[np.ndarray],
+    precision: Optional[int] = SVG_PRECISION,
+    relative: bool = False,
+) -> str:
+    """Return the SVG document of a list of bezier splines as a string, see write_svg."""
+    return "".join(_svg_chunks(orig_image_shape, scale_ratio, bezier_splines, precision, relative))
@@ -18,10 +18,10 @@ from SLDvec.curve import Spline
 from SLDvec.fitting import fit_all_curves
 from SLDvec.ordering import ModelPredictor, get_predictor, get_stroke_order
 from SLDvec.preprocessing import binarize_image, blur_image, load_image, potrace_vectorize
-from SLDvec.skeleton import get_medial_axis
-from SLDvec.utils.networkx import merge_branch
+from SLDvec.skeleton import get_medial_axis_hierarchy, simplify_medial_axis
+from SLDvec.utils.networkx import invalidate_graph_indices, merge_branch
 from SLDvec.utils.networkx.api import get_graph_data
-from SLDvec.utils.svg import export_svg as export
+from SLDvec.utils.svg import svg_to_string
 
 app = FastAPI()
 
@@ -58,7 +58,10 @@ class AppState:
     blur_image: np.array = None
     binary_image: np.array = None
     binary_threshold: float = None
+    curves: List[Spline] = None
     base_medial_axis: nx.Graph = None
+    base_graph_data: dict = None
+    medial_axis_hierarchy: nx.Graph = None
     simplified_medial_axis: nx.Graph = None
     full_graph: nx.Graph = None
     largest_component_graph: nx.Graph = None
@@ -88,6 +91,7 @@ async def upload_image(file: UploadFile = File(...)):
     app_state.image, app_state.orig_image_shape, app_state.scale_ratio = load_image(
         io.BytesIO(content)
     )
+    app_state.medial_axis_hierarchy = None
 
     # Process image for frontend
     img = Image.fromarray((app_state.image * 255).astype(np.uint8))
@@ -107,6 +111,8 @@ async def update_params(p: PreprocessParams):
     app_state.binary_image, app_state.binary_threshold = binarize_image(
         app_state.blur_image, p.thresh if p.thresh <= 1.0 else None
     )
+    # The medial axis has to be recomputed from the new binary image
+    app_state.medial_axis_hierarchy = None
 
     # Process image for frontend
     blur_img = Image.fromarray((app_state.blur_image * 255).astype(np.uint8))
@@ -132,23 +138,24 @@ async def update_params(p: PreprocessParams):
 async def create_graph(multiple_lines: MultipleLines):
     global app_state
     if app_state.binary_image is not None:
-        curves = potrace_vectorize(app_state.binary_image)
-        base_medial_axis, simplified_medial_axis = get_medial_axis(
-            curves, multiple_lines=multiple_lines.state
-        )
-
-        app_state.base_medial_axis = nx.convert_node_labels_to_integers(base_medial_axis)
-        app_state.simplified_medial_axis = nx.convert_node_labels_to_integers(
-            simplified_medial_axis
+        # The medial axis and its vanishing angles do not depend on multiple_lines, they are only
+        # computed again when the binary image changes
+        if app_state.medial_axis_hierarchy is None:
+            app_state.curves = potrace_vectorize(app_state.binary_image)
+            base_medial_axis, app_state.medial_axis_hierarchy = get_medial_axis_hierarchy(
+                app_state.curves
+            )
+            app_state.base_medial_axis = nx.convert_node_labels_to_integers(base_medial_axis)
+            app_state.base_graph_data = get_graph_data(app_state.base_medial_axis)
+
+        app_state.simplified_medial_axis = simplify_medial_axis(
+            app_state.medial_axis_hierarchy, multiple_lines=multiple_lines.state
         )
 
         graph_data_simplified = get_graph_data(app_state.simplified_medial_axis)
-        graph_data_base = get_graph_data(app_state.base_medial_axis)
+        graph_data_base = app_state.base_graph_data
 
-        control_points = [
-            [np.array([b.P1[0], b.P2[0], b.P3[0], b.P4[0]]).tolist() for b in curve.beziers]
-            for curve in curves
-        ]
+        control_points = [curve.control_points.tolist() for curve in app_state.curves]
 
         app_state.full_graph = copy.deepcopy(app_state.simplified_medial_axis)
         app_state.largest_component_graph = app_state.full_graph.subgraph(
@@ -186,6 +193,7 @@ async def update_graph(selected_nodes: SelectedNodes):
         elif len(ending_nodes) == 1:
             # In that case simply remove all the core nodes (the branch is a dead-end)
             app_state.simplified_medial_axis.remove_nodes_from(core_node)
+            invalidate_graph_indices(app_state.simplified_medial_axis)
 
     # If the selected node is a single node, we split it if it was created by merging several nodes
     elif selected_nodes.selectionType == "node":
@@ -262,7 +270,7 @@ def create_triangle_strip_coor(points, derivative):
 
 
 def sample_vectorization_for_triangle_strip(bezier, im_size, n_points=1000):
-    bezierCurve = Spline(bezier, n=100)
+    bezierCurve = Spline(bezier)
 
     curve_length = bezierCurve.length() / im_size
     n_points = max(int(n_points * curve_length), 20)
@@ -352,14 +360,9 @@ async def update_vectorize(intersection_change: SelectedIntersection):
 async def export_svg():
     global app_state
 
-    dwg = export(
-        app_state.orig_image_shape,
-        app_state.scale_ratio,
-        copy.deepcopy(app_state.bezier_splines),
-        "test.svg",
+    svg_string = svg_to_string(
+        app_state.orig_image_shape, app_state.scale_ratio, app_state.bezier_splines
     )
-
-    svg_string = dwg.tostring()
     return Response(content=svg_string, media_type="image/svg+xml")
 
 
@@ -0,0 +1,338 @@
+import multiprocessing
+import os
+import shutil
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from SLDvec import run as run_image
+from SLDvec.ordering import ModelPredictor, get_predictor
+from SLDvec.utils.export import get_output_suffix
+
+from .manifest import MANIFEST_NAME, Manifest, ManifestEntry, get_run_key
+from .stream import vectorize_bytes
+
+# The intersection predictor of the current worker process. It is loaded once by the pool
+# initializer and reused for every image processed by this worker.
+_worker_predictor: Optional[ModelPredictor] = None
+
+
+@dataclass
+class ImageResult:
+    """A small dataclass to store the outcome of the vectorization of a single image.
+
+    Attributes:
+        image_path (Path): The path to the input image.
+        output_path (Path): The path to the output file.
+        success (bool): Whether the vectorization succeeded.
+        elapsed (float): The time spent vectorizing the image, in seconds.
+        error (Optional[str]): The error message if the vectorization failed.
+        reused (bool): Whether the output was copied from a previous run on an identical image with
+            the same parameters, instead of being computed.
+    """
+
+    image_path: Path
+    output_path: Path
+    success: bool
+    elapsed: float
+    error: Optional[str] = None
+    reused: bool = False
+
+
+def _init_worker(n_threads: int) -> None:
+    """Initialize a worker process: limit the number of torch threads and load the predictor.
+
+    Args:
+        n_threads (int): The number of threads torch is allowed to use in this worker.
+    """
+    global _worker_predictor
+    torch.set_num_threads(n_threads)
+    _worker_predictor = get_predictor()
+
+
+def _vectorize(
+    image_path: Path,
+    output_path: Path,
+    intersection_predictor: ModelPredictor,
+    thresh: Optional[float],
+    multiple_lines: bool,
+    verbose: bool,
+    decimation_tolerance: Optional[float] = None,
+    reduction_tolerance: Optional[float] = None,
+    output_format: str = "svg",
+) -> ImageResult:
+    """Vectorize a single image, catching any error so that it does not stop the batch."""
+    start = time.perf_counter()
+    try:
+        run_image(
+            image_path=image_path,
+            output_path=output_path,
+            intersection_predictor=intersection_predictor,
+            thresh=thresh,
+            multiple_lines=multiple_lines,
+            verbose=verbose,
+            decimation_tolerance=decimation_tolerance,
+            reduction_tolerance=reduction_tolerance,
+            output_format=output_format,
+        )
+    except Exception as e:
+        if not verbose:
+            traceback.print_exc()
+        return ImageResult(image_path, output_path, False, time.perf_counter() - start, str(e))
+    return ImageResult(image_path, output_path, True, time.perf_counter() - start)
+
+
+def _worker_vectorize(
+    image_path: Path,
+    output_path: Path,
+    thresh: Optional[float],
+    multiple_lines: bool,
+    decimation_tolerance: Optional[float],
+    reduction_tolerance: Optional[float],
+    output_format: str,
+) -> ImageResult:
+    """Vectorize a single image in a worker process, using the predictor of the worker."""
+    return _vectorize(
+        image_path,
+        output_path,
+        _worker_predictor,
+        thresh,
+        multiple_lines,
+        verbose=False,
+        decimation_tolerance=decimation_tolerance,
+        reduction_tolerance=reduction_tolerance,
+        output_format=output_format,
+    )
+
+
+def _worker_vectorize_bytes(data: bytes, params: Dict[str, Any]) -> bytes:
+    """Vectorize an encoded image held in memory in a worker process, using the predictor of the
+    worker. See vectorize_bytes for the parameters."""
+    return vectorize_bytes(data, _worker_predictor, **params)
+
+
+def print_summary(results: List[ImageResult], wall_time: float) -> None:
+    """Print the failed images and the throughput of a batch run.
+
+    Args:
+        results (List[ImageResult]): The results of all the processed images.
+        wall_time (float): The total duration of the batch run, in seconds.
+    """
+    failed = [r for r in results if not r.success]
+    reused = [r for r in results if r.reused]
+    latencies = np.array([r.elapsed for r in results if r.success and not r.reused])
+
+    print(f"\nProcessed {len(results)} images in {wall_time:.1f}s")
+    print(f"\t✅ {len(results) - len(failed)} succeeded, ❌ {len(failed)} failed")
+    if reused:
+        print(f"\t♻️  {len(reused)} reused existing outputs")
+    for r in failed:
+        print(f"\t❌ {r.image_path}: {r.error}")
+    if wall_time > 0:
+        print(f"\tThroughput: {len(results) / wall_time:.2f} images/s")
+    if len(latencies) > 0:
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"\tLatency: p50 {p50:.2f}s, p95 {p95:.2f}s")
+
+
+def _record(manifest: Manifest, entry: ManifestEntry) -> None:
+    """Record an entry in the manifest, a failure to write it being reported without stopping the
+    batch. The image is then simply processed again by the next resumed run."""
+    try:
+        manifest.record(entry)
+    except OSError as e:
+        print(f"⚠️  Could not record {entry.image_path} in the manifest: {e}")
+
+
+def _reuse_output(
+    manifest: Manifest, key: str, image_path: Path, output_path: Path
+) -> Optional[ImageResult]:
+    """Copy the output of a previous run with the same key, if there is one, and record it. A
+    failure to copy the output is recorded as a failure of the image."""
+    previous_output = manifest.find_output(key)
+    if previous_output is None:
+        return None
+
+    start = time.perf_counter()
+    try:
+        if previous_output.resolve() != output_path.resolve():
+            shutil.copyfile(previous_output, output_path)
+    except OSError as e:
+        result = ImageResult(image_path, output_path, False, time.perf_counter() - start, str(e))
+        _record(
+            manifest,
+            ManifestEntry(key, str(image_path), str(output_path), "failed", result.elapsed, str(e)),
+        )
+        print(f"❌ Failed to reuse an existing output: {image_path} ({e})")
+        return result
+
+    result = ImageResult(image_path, output_path, True, time.perf_counter() - start, reused=True)
+    _record(
+        manifest, ManifestEntry(key, str(image_path), str(output_path), "reused", result.elapsed)
+    )
+    print(f"♻️  Reused an existing output: {image_path}")
+    return result
+
+
+def run_batch(
+    image_paths: List[Path],
+    output_dir: Path,
+    thresh: Optional[float] = None,
+    multiple_lines: bool = False,
+    jobs: int = 1,
+    decimation_tolerance: Optional[float] = None,
+    reduction_tolerance: Optional[float] = None,
+    output_format: str = "svg",
+    resume: bool = False,
+) -> List[ImageResult]:
+    """Vectorize a list of images, optionally spreading them over several worker processes.
+    A failure on one image is reported but does not stop the processing of the others.
+    Each image is identified by the hash of its content, the parameters and the weights of the
+    intersection predictor (see get_run_key), and the outcome of each image is appended to a
+    manifest in the output folder. Identical images are only vectorized once, their output is
+    copied to the others.
+
+    Args:
+        image_paths (List[Path]): The paths to the input images.
+        output_dir (Path): The folder where to save the outputs.
+        thresh (Optional[float], optional): To set the threshold. Defaults to None.
+        multiple_lines (bool, optional): Wheter the input images contain multiple lines. Defaults
+            to False.
+        jobs (int, optional): The number of worker processes. If 1, the images are processed
+            sequentially in the current process. Defaults to 1.
+        decimation_tolerance (Optional[float], optional): If set, the degree 2 chains of the medial
+            axis are simplified with this tolerance in pixels. Defaults to None.
+        reduction_tolerance (Optional[float], optional): If set, consecutive Bezier curves are
+            merged when the merged curve stays within this tolerance in pixels. Defaults to None.
+        output_format (str, optional): The output format, "svg", "svgz", "npz" or "bin". Defaults
+            to "svg".
+        resume (bool, optional): Whether to skip the images already vectorized by a previous run
+            with the same parameters, according to the manifest, e.g. to resume an interrupted
+            batch. Defaults to False.
+
+    Returns:
+        List[ImageResult]: The outcome of the vectorization of each image, in completion order.
+    """
+    suffix = get_output_suffix(output_format)
+    params = {
+        "thresh": thresh,
+        "multiple_lines": multiple_lines,
+        "decimation_tolerance": decimation_tolerance,
+        "reduction_tolerance": reduction_tolerance,
+        "output_format": output_format,
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = Manifest(output_dir / MANIFEST_NAME, resume=resume)
+    results = []
+    start = time.perf_counter()
+
+    # Only the first image of each key is vectorized, the identical ones wait for its output
+    tasks: List[Tuple[Path, Path, str]] = []
+    duplicates: Dict[str, List[Tuple[Path, Path]]] = {}
+    for image_path in image_paths:
+        output_path = output_dir / image_path.with_suffix(suffix).name
+        try:
+            key = get_run_key(image_path, params)
+        except OSError as e:
+            print(f"❌ Failed to read: {image_path} ({e})")
+            results.append(ImageResult(image_path, output_path, False, 0.0, str(e)))
+            continue
+        if key in duplicates:
+            duplicates[key].append((image_path, output_path))
+            continue
+        result = _reuse_output(manifest, key, image_path, output_path)
+        if result is not None:
+            results.append(result)
+        else:
+            tasks.append((image_path, output_path, key))
+            duplicates[key] = []
+
+    def complete(result: ImageResult, key: str) -> None:
+        """Record the outcome of a vectorized image, and of the identical images waiting for it."""
+        results.append(result)
+        _record(
+            manifest,
+            ManifestEntry(
+                key,
+                str(result.image_path),
+                str(result.output_path),
+                "success" if result.success else "failed",
+                result.elapsed,
+                result.error,
+            ),
+        )
+        for image_path, output_path in duplicates.pop(key):
+            if result.success:
+                results.append(_reuse_output(manifest, key, image_path, output_path))
+            else:
+                # An identical image fails in the same way
+                failed = ImageResult(image_path, output_path, False, 0.0, result.error)
+                results.append(failed)
+                _record(
+                    manifest,
+                    ManifestEntry(
+                        key, str(image_path), str(output_path), "failed", 0.0, failed.error
+                    ),
+                )
+
+    if tasks and jobs <= 1:
+        intersection_predictor = get_predictor()
+        for image_path, output_path, key in tasks:
+            result = _vectorize(
+                image_path,
+                output_path,
+                intersection_predictor,
+                thresh,
+                multiple_lines,
+                verbose=True,
+                decimation_tolerance=decimation_tolerance,
+                reduction_tolerance=reduction_tolerance,
+                output_format=output_format,
+            )
+            complete(result, key)
+    elif tasks:
+        # Each worker gets an equal share of the cores for torch's intra-op parallelism. The spawn
+        # start method is used as forking a process that already initialized torch is unsafe.
+        n_threads = max(1, (os.cpu_count() or 1) // jobs)
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(n_threads,),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _worker_vectorize,
+                    image_path,
+                    output_path,
+                    thresh,
+                    multiple_lines,
+                    decimation_tolerance,
+                    reduction_tolerance,
+                    output_format,
+                ): (image_path, output_path, key)
+                for image_path, output_path, key in tasks
+            }
+            for future in as_completed(futures):
+                image_path, output_path, key = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. crash in a compiled extension)
+                    result = ImageResult(image_path, output_path, False, float("nan"), repr(e))
+                if result.success:
+                    print(
+                        f"✅ Successfully vectorized: {result.image_path} ({result.elapsed:.1f}s)"
+                    )
+                else:
+                    print(f"❌ Failed to vectorize: {result.image_path} ({result.error})")
+                complete(result, key)
+
+    print_summary(results, time.perf_counter() - start)
+    return results
@@ -1,12 +1,25 @@
+import os
+from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
-import uvicorn
 from typing_extensions import Annotated
 
-from SLDvec import run as run_image
-from SLDvec.ordering import get_predictor
+from SLDvec_formats import OUTPUT_SUFFIXES
+
+from .client import Client
+
+# The vectorization modules take seconds to import (torch, timm, numba), so they are imported by
+# the commands that use them, and the submit command starts right away.
+
+
+OutputFormat = Enum("OutputFormat", {name: name for name in OUTPUT_SUFFIXES}, type=str)
+
+FORMAT_HELP = (
+    "Output format: SVG, gzipped SVG, NumPy archive of the Bezier control points, or flat float32 "
+    "binary file of the control points."
+)
 
 app = typer.Typer(
     help="A vectorization command line tool for single line drawing.", add_completion=True
@@ -15,17 +28,85 @@ app = typer.Typer(
 
 @app.command(help="Run the vectorization method on a single file.")
 def run(
-    image_path: Annotated[Path, typer.Argument(help="Path to the input image.")],
+    image_path: Annotated[
+        Path,
+        typer.Argument(help="Path to the input image, or - to read it from the standard input."),
+    ],
     output_path: Annotated[
-        Optional[Path], typer.Option(help="Path to the output SVG file.")
+        Optional[Path],
+        typer.Option(
+            help="Path to the output file. When reading from the standard input, the output is "
+            "written to the standard output by default."
+        ),
     ] = None,
     thresh: Annotated[Optional[float], typer.Option(help="Manually set the threshold.")] = None,
     multiple_lines: Annotated[
         bool, typer.Option(help="If the input drawing contains multiple lines.")
     ] = False,
+    decimate: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Simplify the medial axis with this tolerance in pixels before ordering the "
+            "strokes, for faster processing."
+        ),
+    ] = None,
+    reduce: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Merge consecutive Bezier curves when the merged curve stays within this "
+            "tolerance in pixels."
+        ),
+    ] = None,
+    format: Annotated[OutputFormat, typer.Option(help=FORMAT_HELP)] = OutputFormat.svg,
+    framed: Annotated[
+        bool,
+        typer.Option(
+            help="Read a stream of images from the standard input, each prefixed by its length as "
+            "a big-endian uint32, and write one frame per image: a status byte (0 on success), "
+            "the length of the payload as a big-endian uint32, and the output file or the error "
+            "message."
+        ),
+    ] = False,
 ) -> None:
+    from SLDvec import run as run_image
+    from SLDvec.ordering import get_predictor
+
+    from .stream import run_stream
+
+    if str(image_path) == "-":
+        intersection_predictor = get_predictor()
+        params = dict(
+            thresh=thresh,
+            multiple_lines=multiple_lines,
+            decimation_tolerance=decimate,
+            reduction_tolerance=reduce,
+        )
+        if output_path is None or str(output_path) == "-":
+            n_failed = run_stream(
+                intersection_predictor, framed, output_format=format.value, **params
+            )
+        else:
+            # The output is written to a temporary file, moved into place once the whole input
+            # was processed, so that a failure never leaves an empty or partial output behind
+            tmp_path = output_path.parent / f".{output_path.name}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    n_failed = run_stream(
+                        intersection_predictor,
+                        framed,
+                        output_stream=f,
+                        output_format=format.value,
+                        **params,
+                    )
+                os.replace(tmp_path, output_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        raise typer.Exit(code=1 if n_failed > 0 else 0)
+    if framed:
+        raise typer.BadParameter("Framed input is only read from the standard input, use -.")
+
     if output_path is None:
-        output_path = image_path.with_suffix(".svg")
+        output_path = image_path.with_suffix(OUTPUT_SUFFIXES[format.value])
 
     intersection_predictor = get_predictor()
     run_image(
@@ -34,6 +115,9 @@ def run(
         intersection_predictor=intersection_predictor,
         thresh=thresh,
         multiple_lines=multiple_lines,
+        decimation_tolerance=decimate,
+        reduction_tolerance=reduce,
+        output_format=format.value,
     )
 
 
@@ -45,32 +129,183 @@ def run_folder(
     multiple_lines: Annotated[
         bool, typer.Option(help="If the input drawing contains multiple lines.")
     ] = False,
+    jobs: Annotated[
+        int, typer.Option(help="Number of worker processes used to vectorize the images.", min=1)
+    ] = 1,
+    decimate: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Simplify the medial axis with this tolerance in pixels before ordering the "
+            "strokes, for faster processing."
+        ),
+    ] = None,
+    reduce: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Merge consecutive Bezier curves when the merged curve stays within this "
+            "tolerance in pixels."
+        ),
+    ] = None,
+    format: Annotated[OutputFormat, typer.Option(help=FORMAT_HELP)] = OutputFormat.svg,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            help="Skip the images already vectorized with the same parameters by a previous run "
+            "writing to the same output folder."
+        ),
+    ] = False,
 ):
-    intersection_predictor = get_predictor()
+    from .batch import run_batch
 
     if output_dir is None:
         output_dir = dir / "output"
         output_dir.mkdir(exist_ok=True)
 
-    for image_path in dir.glob("*.png"):
-        output_path = output_dir / image_path.with_suffix(".svg").name
-        run_image(
-            image_path=image_path,
-            output_path=output_path,
-            intersection_predictor=intersection_predictor,
-            thresh=thresh,
-            multiple_lines=multiple_lines,
-        )
+    image_paths = list(dir.glob("*.png")) + list(dir.glob("*.jpg"))
+    run_batch(
+        image_paths=image_paths,
+        output_dir=output_dir,
+        thresh=thresh,
+        multiple_lines=multiple_lines,
+        jobs=jobs,
+        decimation_tolerance=decimate,
+        reduction_tolerance=reduce,
+        output_format=format.value,
+        resume=resume,
+    )
 
-    for image_path in dir.glob("*.jpg"):
-        output_path = output_dir / image_path.with_suffix(".svg").name
-        run_image(
-            image_path=image_path,
-            output_path=output_path,
-            intersection_predictor=intersection_predictor,
-            thresh=thresh,
-            multiple_lines=multiple_lines,
-        )
+
+@app.command(help="Watch a folder and vectorize the images as they arrive.")
+def watch(
+    dir: Annotated[Path, typer.Argument(help="Path to the folder to watch.")],
+    output_dir: Annotated[Optional[Path], typer.Option(help="Path to the output folder.")] = None,
+    interval: Annotated[
+        float, typer.Option(help="Time between two scans of the folder, in seconds.", min=0)
+    ] = 1.0,
+    settle_time: Annotated[
+        float,
+        typer.Option(
+            help="How long an image should stay unchanged before it is vectorized, in seconds.",
+            min=0,
+        ),
+    ] = 1.0,
+    thresh: Annotated[Optional[float], typer.Option(help="Manually set the threshold.")] = None,
+    multiple_lines: Annotated[
+        bool, typer.Option(help="If the input drawing contains multiple lines.")
+    ] = False,
+    decimate: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Simplify the medial axis with this tolerance in pixels before ordering the "
+            "strokes, for faster processing."
+        ),
+    ] = None,
+    reduce: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Merge consecutive Bezier curves when the merged curve stays within this "
+            "tolerance in pixels."
+        ),
+    ] = None,
+    format: Annotated[OutputFormat, typer.Option(help=FORMAT_HELP)] = OutputFormat.svg,
+):
+    from .watch import watch_folder
+
+    if output_dir is None:
+        output_dir = dir / "output"
+        output_dir.mkdir(exist_ok=True)
+
+    watch_folder(
+        dir=dir,
+        output_dir=output_dir,
+        interval=interval,
+        settle_time=settle_time,
+        thresh=thresh,
+        multiple_lines=multiple_lines,
+        decimation_tolerance=decimate,
+        reduction_tolerance=reduce,
+        output_format=format.value,
+    )
+
+
+@app.command(help="Run a daemon vectorizing the images sent by the submit command.")
+def serve(
+    socket: Annotated[
+        Optional[Path], typer.Option(help="Path of the Unix socket to listen on.")
+    ] = None,
+    port: Annotated[
+        Optional[int], typer.Option(help="Localhost TCP port to listen on, instead of a socket.")
+    ] = None,
+    jobs: Annotated[
+        int, typer.Option(help="Number of images vectorized at the same time.", min=1)
+    ] = 1,
+):
+    if (socket is None) == (port is None):
+        raise typer.BadParameter("Set either --socket or --port.")
+
+    from .server import serve as serve_daemon
+
+    serve_daemon(socket_path=socket, port=port, jobs=jobs)
+
+
+@app.command(help="Send images to a daemon started with the serve command.")
+def submit(
+    image_paths: Annotated[List[Path], typer.Argument(help="Paths to the input images.")],
+    socket: Annotated[
+        Optional[Path], typer.Option(help="Path of the Unix socket of the daemon.")
+    ] = None,
+    port: Annotated[
+        Optional[int], typer.Option(help="Localhost TCP port of the daemon, instead of a socket.")
+    ] = None,
+    output_dir: Annotated[
+        Optional[Path],
+        typer.Option(help="Path to the output folder. Defaults to the folder of each image."),
+    ] = None,
+    thresh: Annotated[Optional[float], typer.Option(help="Manually set the threshold.")] = None,
+    multiple_lines: Annotated[
+        bool, typer.Option(help="If the input drawing contains multiple lines.")
+    ] = False,
+    decimate: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Simplify the medial axis with this tolerance in pixels before ordering the "
+            "strokes, for faster processing."
+        ),
+    ] = None,
+    reduce: Annotated[
+        Optional[float],
+        typer.Option(
+            help="Merge consecutive Bezier curves when the merged curve stays within this "
+            "tolerance in pixels."
+        ),
+    ] = None,
+    format: Annotated[OutputFormat, typer.Option(help=FORMAT_HELP)] = OutputFormat.svg,
+):
+    if (socket is None) == (port is None):
+        raise typer.BadParameter("Set either --socket or --port.")
+
+    suffix = OUTPUT_SUFFIXES[format.value]
+    n_failed = 0
+    with Client(socket_path=socket, port=port) as client:
+        for image_path in image_paths:
+            success, payload = client.vectorize(
+                image_path,
+                output_format=format.value,
+                thresh=thresh,
+                multiple_lines=multiple_lines,
+                decimation_tolerance=decimate,
+                reduction_tolerance=reduce,
+            )
+            if success:
+                output_path = (output_dir or image_path.parent) / image_path.with_suffix(
+                    suffix
+                ).name
+                output_path.write_bytes(payload)
+                print(f"✅ Successfully vectorized: {image_path}")
+            else:
+                print(f"❌ Failed to vectorize: {image_path} ({payload.decode('utf-8')})")
+                n_failed += 1
+    raise typer.Exit(code=1 if n_failed > 0 else 0)
 
 
 @app.command(help="Launch the GUI for the vectorization method.")
@@ -80,5 +315,7 @@ def gui(
     reload: Annotated[bool, typer.Option(help="Enable auto-reload on code changes")] = True,
 ):
     """Launch the web-based GUI interface"""
+    import uvicorn
+
     # Assuming your FastAPI app is in a module named 'webapp'
     uvicorn.run("SLDvec_app.main:app", host=host, port=port, reload=reload, log_level="info")
@@ -0,0 +1,59 @@
+import json
+import socket
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .framing import STATUS_SUCCESS, read_output_frame, write_input_frame
+
+
+class Client:
+    """A client of the vectorization daemon, sending the jobs on a single connection."""
+
+    def __init__(self, socket_path: Optional[Path] = None, port: Optional[int] = None):
+        """Connect to the daemon.
+
+        Args:
+            socket_path (Optional[Path], optional): The path of the Unix socket of the daemon.
+                Defaults to None.
+            port (Optional[int], optional): The localhost TCP port of the daemon, if socket_path is
+                not set. Defaults to None.
+
+        Raises:
+            ValueError: If neither socket_path nor port is set.
+        """
+        if socket_path is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(str(socket_path))
+        elif port is not None:
+            self.socket = socket.create_connection(("127.0.0.1", port))
+        else:
+            raise ValueError("Either a socket path or a port is needed.")
+        self.file = self.socket.makefile("rwb")
+
+    def vectorize(self, image: Union[bytes, Path], **params) -> Tuple[bool, bytes]:
+        """Send a job to the daemon and wait for its result.
+
+        Args:
+            image (Union[bytes, Path]): The encoded image, or the path to the image.
+            **params: The parameters of the job, see JOB_PARAMETERS.
+
+        Returns:
+            Tuple[bool, bytes]: Whether the vectorization succeeded, and the content of the output
+                file or the UTF-8 error message.
+        """
+        if isinstance(image, Path):
+            image = image.read_bytes()
+        write_input_frame(self.file, json.dumps(params).encode("utf-8"))
+        write_input_frame(self.file, image)
+        status, payload = read_output_frame(self.file)
+        return status == STATUS_SUCCESS, payload
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,96 @@
+import struct
+from typing import IO, Iterator, Tuple
+
+# Header of an input frame: the length of the content that follows (an encoded image, or the header
+# of a job sent to the daemon), as a big-endian uint32
+INPUT_FRAME_HEADER = struct.Struct(">I")
+# Header of an output frame: the status (0 for success, 1 for failure) and the length of the
+# payload that follows (the output file, or the UTF-8 error message), as a big-endian uint8 and
+# uint32
+OUTPUT_FRAME_HEADER = struct.Struct(">BI")
+STATUS_SUCCESS = 0
+STATUS_FAILURE = 1
+
+
+def _read_exactly(stream: IO[bytes], size: int) -> bytes:
+    """Read exactly size bytes from a stream, unless the stream ends first."""
+    chunks = []
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frames(stream: IO[bytes]) -> Iterator[bytes]:
+    """Read the length-prefixed frames of a stream, until the stream ends.
+
+    Args:
+        stream (IO[bytes]): The binary stream to read.
+
+    Raises:
+        EOFError: If the stream ends in the middle of a frame.
+
+    Yields:
+        bytes: The content of each frame.
+    """
+    while True:
+        header = _read_exactly(stream, INPUT_FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < INPUT_FRAME_HEADER.size:
+            raise EOFError("The stream ended in the middle of a frame header.")
+        (length,) = INPUT_FRAME_HEADER.unpack(header)
+        data = _read_exactly(stream, length)
+        if len(data) < length:
+            raise EOFError(f"The stream ended after {len(data)} of the {length} bytes of a frame.")
+        yield data
+
+
+def write_input_frame(stream: IO[bytes], data: bytes) -> None:
+    """Write a length-prefixed frame to a stream, as read by read_frames.
+
+    Args:
+        stream (IO[bytes]): The binary stream to write to.
+        data (bytes): The content of the frame.
+    """
+    stream.write(INPUT_FRAME_HEADER.pack(len(data)))
+    stream.write(data)
+    stream.flush()
+
+
+def read_output_frame(stream: IO[bytes]) -> Tuple[int, bytes]:
+    """Read an output frame written by write_frame.
+
+    Args:
+        stream (IO[bytes]): The binary stream to read.
+
+    Raises:
+        EOFError: If the stream ends before the end of the frame.
+
+    Returns:
+        Tuple[int, bytes]: The status and the payload of the frame.
+    """
+    header = _read_exactly(stream, OUTPUT_FRAME_HEADER.size)
+    if len(header) < OUTPUT_FRAME_HEADER.size:
+        raise EOFError("The stream ended before the frame header.")
+    status, length = OUTPUT_FRAME_HEADER.unpack(header)
+    payload = _read_exactly(stream, length)
+    if len(payload) < length:
+        raise EOFError(f"The stream ended after {len(payload)} of the {length} bytes of a frame.")
+    return status, payload
+
+
+def write_frame(stream: IO[bytes], status: int, payload: bytes) -> None:
+    """Write an output frame to a stream and flush it, so that the reader gets it right away.
+
+    Args:
+        stream (IO[bytes]): The binary stream to write to.
+        status (int): STATUS_SUCCESS or STATUS_FAILURE.
+        payload (bytes): The output file, or the UTF-8 error message on failure.
+    """
+    stream.write(OUTPUT_FRAME_HEADER.pack(status, len(payload)))
+    stream.write(payload)
+    stream.flush()
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from SLDvec import MODEL_PATH
+
+MANIFEST_NAME = "manifest.jsonl"
+
+# Size of the blocks read when hashing a file
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_model_checksum() -> str:
+    """Return the SHA-256 hex digest of the weights of the intersection predictor."""
+    return hash_file(Path(MODEL_PATH))
+
+
+def get_run_key(image_path: Path, params: Dict[str, Any]) -> str:
+    """Return the key identifying the vectorization of an image with some parameters: the hash of
+    the content of the image, of the parameters and of the weights of the intersection predictor.
+    Two runs with the same key give the same output, whatever the name of the image.
+
+    Args:
+        image_path (Path): The path to the input image.
+        params (Dict[str, Any]): The parameters of the vectorization, that can be serialized to
+            JSON.
+
+    Returns:
+        str: The key, as an hex digest.
+    """
+    description = {"image": hash_file(image_path), "model": get_model_checksum(), **params}
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """A small dataclass to store one line of the manifest of a batch run.
+
+    Attributes:
+        key (str): The key of the run, see get_run_key.
+        image_path (str): The path to the input image.
+        output_path (str): The path to the output file.
+        status (str): "success", "failed", or "reused" when the output was copied from a previous
+            run with the same key.
+        elapsed (float): The time spent on the image, in seconds.
+        error (Optional[str]): The error message if the vectorization failed.
+        timestamp (float): When the entry was recorded, as a Unix timestamp.
+    """
+
+    key: str
+    image_path: str
+    output_path: str
+    status: str
+    elapsed: float
+    error: Optional[str] = None
+    timestamp: float = 0.0
+
+
+class Manifest:
+    """The manifest of the batch runs writing to an output folder, stored as one JSON line per
+    processed image. It is only appended to and flushed after every line, so that an interrupted
+    batch loses at most the line being written, and the runs can be resumed from it.
+    """
+
+    def __init__(self, path: Path, resume: bool = True):
+        """Open the manifest. The file is created when the first entry is recorded.
+
+        Args:
+            path (Path): The path to the manifest file.
+            resume (bool, optional): Whether the outputs recorded by the previous runs can be
+                reused. If False, only the outputs of the current run are. Defaults to True.
+        """
+        self.path = path
+        # The latest successful output of each key
+        self.outputs: Dict[str, Path] = {}
+        # The key of the latest run writing to each output path
+        self._output_keys: Dict[Path, str] = {}
+        if not path.exists():
+            return
+
+        with open(path, "r") as f:
+            content = f.read()
+        if content and not content.endswith("\n"):
+            # Terminate the line cut by an interruption, so that the next entry starts a new line
+            with open(path, "a") as f:
+                f.write("\n")
+        if not resume:
+            return
+
+        for line in content.splitlines():
+            try:
+                entry = ManifestEntry(**json.loads(line))
+            except (json.JSONDecodeError, TypeError):
+                continue  # A line cut by an interruption
+            self._track(entry)
+
+    def _track(self, entry: ManifestEntry) -> None:
+        """Update the outputs with an entry. The name of an output only depends on the name of the
+        image and the output format, so a later run with other parameters or another content
+        overwrites it, even if it fails: the key of the previous run at this path is forgotten.
+        """
+        output_path = Path(entry.output_path)
+        previous_key = self._output_keys.pop(output_path, None)
+        if previous_key is not None and self.outputs.get(previous_key) == output_path:
+            del self.outputs[previous_key]
+        if entry.status != "failed":
+            self.outputs[entry.key] = output_path
+            self._output_keys[output_path] = entry.key
+
+    def find_output(self, key: str) -> Optional[Path]:
+        """Return an existing output of a run with this key, or None if there is none."""
+        output_path = self.outputs.get(key)
+        if output_path is not None and output_path.exists():
+            return output_path
+        return None
+
+    def record(self, entry: ManifestEntry) -> None:
+        """Append an entry to the manifest and write it to the disk."""
+        entry.timestamp = time.time()
+        self._track(entry)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(asdict(entry)) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
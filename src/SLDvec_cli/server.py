@@ -0,0 +1,219 @@
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from SLDvec.utils.export import get_output_suffix
+
+from .batch import _init_worker, _worker_vectorize_bytes
+from .framing import STATUS_FAILURE, STATUS_SUCCESS, read_frames, write_frame
+from .stream import make_warm_up_image
+
+# The parameters a job can set, with the type of their value (None being always allowed)
+JOB_PARAMETERS = {
+    "output_format": str,
+    "thresh": float,
+    "multiple_lines": bool,
+    "decimation_tolerance": float,
+    "reduction_tolerance": float,
+}
+
+
+def parse_job_header(header: bytes) -> Dict[str, Any]:
+    """Parse the JSON header of a job and check its parameters.
+
+    Args:
+        header (bytes): The UTF-8 JSON object of the parameters of the job (see JOB_PARAMETERS).
+
+    Raises:
+        ValueError: If the header is not a JSON object, or if a parameter is unknown or invalid.
+
+    Returns:
+        Dict[str, Any]: The parameters of the job.
+    """
+    params = json.loads(header.decode("utf-8"))
+    if not isinstance(params, dict):
+        raise ValueError("The job header should be a JSON object.")
+    for key, value in params.items():
+        if key not in JOB_PARAMETERS:
+            raise ValueError(
+                f"Unknown job parameter {key!r}, expected one of {list(JOB_PARAMETERS)}."
+            )
+        expected_type = JOB_PARAMETERS[key]
+        if value is not None and not isinstance(value, expected_type):
+            if expected_type is float and isinstance(value, int) and not isinstance(value, bool):
+                continue
+            raise ValueError(f"The job parameter {key!r} should be a {expected_type.__name__}.")
+    get_output_suffix(params.get("output_format", "svg"))
+    return params
+
+
+class _WorkerPool:
+    """The worker processes of the daemon. Each worker loads the intersection predictor and
+    compiles the jitted functions once at startup, on a small drawing. If a worker dies (e.g. a
+    crash in a compiled extension, or killed when out of memory), the whole pool is unusable, so it
+    is replaced by a new one and the job is tried again once.
+    """
+
+    def __init__(self, jobs: int):
+        """Start and warm up the workers.
+
+        Args:
+            jobs (int): The number of worker processes.
+        """
+        self.jobs = jobs
+        # Each worker gets an equal share of the cores for torch's intra-op parallelism
+        self.n_threads = max(1, (os.cpu_count() or 1) // jobs)
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        # The spawn start method is used as forking a process that already initialized torch is
+        # unsafe
+        executor = ProcessPoolExecutor(
+            max_workers=self.jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.n_threads,),
+        )
+        print("⏳ Warming up the workers...")
+        warm_up_image = make_warm_up_image()
+        warm_up = [
+            executor.submit(_worker_vectorize_bytes, warm_up_image, {}) for _ in range(self.jobs)
+        ]
+        try:
+            wait(warm_up)
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+        for future in warm_up:
+            if future.exception() is not None:
+                print(f"⚠️  The warm up of a worker failed: {future.exception()}")
+        return executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken pool, unless another job already did."""
+        with self._lock:
+            if self._executor is broken:
+                print("⚠️  A worker died, restarting the workers...")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._start()
+
+    def vectorize(self, image: bytes, params: Dict[str, Any]) -> bytes:
+        """Vectorize an encoded image in a worker, see vectorize_bytes.
+
+        Raises:
+            BrokenProcessPool: If a worker died again while the job was tried a second time.
+        """
+        executor = self._executor
+        try:
+            return executor.submit(_worker_vectorize_bytes, image, params).result()
+        except BrokenProcessPool:
+            self._restart(executor)
+        return self._executor.submit(_worker_vectorize_bytes, image, params).result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Handle the jobs sent on a connection, one after the other. Each job is a frame holding the
+    JSON header of the job followed by a frame holding the encoded image (see read_frames), and is
+    answered by an output frame (see write_frame)."""
+
+    def handle(self):
+        frames = read_frames(self.rfile)
+        try:
+            for header in frames:
+                image = next(frames, None)
+                if image is None:
+                    return
+                try:
+                    params = parse_job_header(header)
+                    output = self.server.pool.vectorize(image, params)
+                except Exception as e:
+                    traceback.print_exc()
+                    message = f"{type(e).__name__}: {e}"
+                    write_frame(self.wfile, STATUS_FAILURE, message.encode("utf-8"))
+                else:
+                    write_frame(self.wfile, STATUS_SUCCESS, output)
+        except (EOFError, ConnectionError):
+            pass  # The client went away
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Remove the socket file left by a daemon that did not stop cleanly.
+
+    Raises:
+        RuntimeError: If a daemon is still listening on the socket.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            socket_path.unlink()
+        else:
+            raise RuntimeError(f"A daemon is already listening on {socket_path}.")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(socket_path: Optional[Path] = None, port: Optional[int] = None, jobs: int = 1) -> None:
+    """Run the vectorization daemon until it is interrupted.
+    The jobs are run by a pool of worker processes that load the intersection predictor and compile
+    the jitted functions once at startup, so that each job only pays for its own vectorization. The
+    connections are served concurrently, but at most jobs images are vectorized at the same time,
+    the others waiting for a free worker. If a worker dies, the workers are restarted and its job
+    is tried again once.
+
+    Args:
+        socket_path (Optional[Path], optional): The path of the Unix socket to listen on. Defaults
+            to None.
+        port (Optional[int], optional): The localhost TCP port to listen on, if socket_path is not
+            set. Defaults to None.
+        jobs (int, optional): The number of worker processes. Defaults to 1.
+
+    Raises:
+        ValueError: If neither socket_path nor port is set.
+    """
+    if socket_path is None and port is None:
+        raise ValueError("Either a socket path or a port is needed.")
+
+    # The address is bound first, so that a daemon already running is detected before the warm up
+    if socket_path is not None:
+        if socket_path.exists():
+            _remove_stale_socket(socket_path)
+        server = _UnixServer(str(socket_path), _JobHandler)
+        address = str(socket_path)
+    else:
+        server = _TCPServer(("127.0.0.1", port), _JobHandler)
+        address = f"127.0.0.1:{port}"
+
+    pool = None
+    try:
+        pool = _WorkerPool(jobs)
+        server.pool = pool
+        print(f"✅ Listening on {address} with {jobs} worker(s)")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if pool is not None:
+            pool.shutdown()
+        if socket_path is not None and socket_path.exists():
+            socket_path.unlink()
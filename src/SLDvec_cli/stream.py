@@ -0,0 +1,112 @@
+import io
+import sys
+import traceback
+from contextlib import redirect_stdout
+from typing import IO, Optional
+
+import imageio.v3 as iio
+import numpy as np
+from skimage.draw import circle_perimeter, line
+
+from SLDvec import run as run_image
+from SLDvec.ordering import ModelPredictor
+
+from .framing import STATUS_FAILURE, STATUS_SUCCESS, read_frames, write_frame
+
+
+def make_warm_up_image() -> bytes:
+    """Return a small drawing (a circle crossed by a line), encoded as PNG, that the long running
+    commands vectorize once at startup, so that the first image does not pay for the compilation of
+    the jitted functions."""
+    image = np.full((200, 200), 255, dtype=np.uint8)
+    for offset in range(-2, 3):
+        image[circle_perimeter(100, 100, 60 + offset, shape=image.shape)] = 0
+        image[line(20, 30 + offset, 180, 170 + offset)] = 0
+    return iio.imwrite("<bytes>", image, extension=".png")
+
+
+def vectorize_bytes(
+    data: bytes, intersection_predictor: ModelPredictor, output_format: str = "svg", **kwargs
+) -> bytes:
+    """Vectorize an encoded image held in memory.
+
+    Args:
+        data (bytes): The encoded image, in any format readable by load_image.
+        intersection_predictor (ModelPredictor): The model to use for intersection classification.
+        output_format (str, optional): The output format, "svg", "svgz", "npz" or "bin". Defaults
+            to "svg".
+        **kwargs: The other parameters of the vectorization, see SLDvec.run.
+
+    Returns:
+        bytes: The content of the output file.
+    """
+    output = io.BytesIO()
+    run_image(
+        image_path=io.BytesIO(data),
+        output_path=output,
+        intersection_predictor=intersection_predictor,
+        verbose=False,
+        output_format=output_format,
+        **kwargs,
+    )
+    return output.getvalue()
+
+
+def run_stream(
+    intersection_predictor: ModelPredictor,
+    framed: bool = False,
+    input_stream: Optional[IO[bytes]] = None,
+    output_stream: Optional[IO[bytes]] = None,
+    output_format: str = "svg",
+    **kwargs,
+) -> int:
+    """Vectorize the images read from a binary stream and write the outputs to another one, by
+    default the standard input and output.
+    Without framing, the whole input is a single image and an error is raised if it fails. With
+    framing, the input is a sequence of frames (see read_frames), and an output frame is written for
+    each of them (see write_frame), a failure on one image being reported in its frame without
+    stopping the others. The same process, predictor and compiled functions are reused for all the
+    images.
+    While the images are processed, anything printed is redirected to the standard error, so that
+    the output stream only contains the outputs.
+
+    Args:
+        intersection_predictor (ModelPredictor): The model to use for intersection classification.
+        framed (bool, optional): Whether the input is a sequence of length-prefixed images.
+            Defaults to False.
+        input_stream (Optional[IO[bytes]], optional): The stream to read. Defaults to the standard
+            input.
+        output_stream (Optional[IO[bytes]], optional): The stream to write. Defaults to the standard
+            output.
+        output_format (str, optional): The output format, "svg", "svgz", "npz" or "bin". Defaults
+            to "svg".
+        **kwargs: The other parameters of the vectorization, see SLDvec.run.
+
+    Returns:
+        int: The number of images that failed.
+    """
+    input_stream = input_stream if input_stream is not None else sys.stdin.buffer
+    output_stream = output_stream if output_stream is not None else sys.stdout.buffer
+
+    if not framed:
+        with redirect_stdout(sys.stderr):
+            output = vectorize_bytes(
+                input_stream.read(), intersection_predictor, output_format, **kwargs
+            )
+        output_stream.write(output)
+        output_stream.flush()
+        return 0
+
+    n_failed = 0
+    for data in read_frames(input_stream):
+        try:
+            with redirect_stdout(sys.stderr):
+                output = vectorize_bytes(data, intersection_predictor, output_format, **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            message = f"{type(e).__name__}: {e}"
+            write_frame(output_stream, STATUS_FAILURE, message.encode("utf-8"))
+            n_failed += 1
+        else:
+            write_frame(output_stream, STATUS_SUCCESS, output)
+    return n_failed
@@ -0,0 +1,175 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from SLDvec.ordering import get_predictor
+from SLDvec.utils.export import get_output_suffix
+
+from .batch import _vectorize
+from .stream import make_warm_up_image, vectorize_bytes
+
+# The signature of a file, that changes whenever the file is written: its size and its
+# modification time in nanoseconds
+Signature = Tuple[int, int]
+
+
+class FolderWatcher:
+    """Detect the images of a folder that are new or changed, by polling the folder.
+    An image is reported once its signature (see Signature) has not changed for settle_time
+    seconds, so that the images still being copied into the folder are not read before they are
+    complete.
+    """
+
+    def __init__(
+        self, dir: Path, settle_time: float = 1.0, patterns: Tuple[str, ...] = ("*.png", "*.jpg")
+    ):
+        """Initialize the watcher, no image being processed yet.
+
+        Args:
+            dir (Path): The folder to watch.
+            settle_time (float, optional): How long the signature of an image should stay the same
+                before it is reported, in seconds. Defaults to 1.0.
+            patterns (Tuple[str, ...], optional): The patterns of the names of the images.
+                Defaults to ("*.png", "*.jpg").
+        """
+        self.dir = dir
+        self.settle_time = settle_time
+        self.patterns = patterns
+        # The current signature of each image and since when it has not changed
+        self.pending: Dict[Path, Tuple[Signature, float]] = {}
+        # The signature of each image when it was last reported
+        self.processed: Dict[Path, Signature] = {}
+
+    def scan(self) -> Dict[Path, Signature]:
+        """Return the current signature of each image of the folder."""
+        signatures = {}
+        for pattern in self.patterns:
+            for path in self.dir.glob(pattern):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue  # Removed since the listing
+                signatures[path] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def mark_processed(self, path: Path, signature: Signature) -> None:
+        """Record that an image was processed, so that it is only reported again if it changes."""
+        self.processed[path] = signature
+
+    def poll(self) -> List[Tuple[Path, Signature]]:
+        """Scan the folder and return the images ready to be processed: the images that are new or
+        changed since they were last processed, and whose signature has not changed for
+        settle_time seconds. An image is only returned once for each signature.
+
+        Returns:
+            List[Tuple[Path, Signature]]: The ready images and their signatures, the oldest first.
+        """
+        now = time.monotonic()
+        signatures = self.scan()
+
+        ready = []
+        pending = {}
+        for path, signature in signatures.items():
+            if self.processed.get(path) == signature:
+                continue
+            previous_signature, since = self.pending.get(path, (None, now))
+            if previous_signature != signature:
+                since = now
+            if signature[0] > 0 and now - since >= self.settle_time:
+                ready.append((path, signature))
+                self.processed[path] = signature
+            else:
+                pending[path] = (signature, since)
+        self.pending = pending
+
+        # Forget the removed images, so that they are processed again if they come back
+        self.processed = {p: s for p, s in self.processed.items() if p in signatures}
+        return sorted(ready, key=lambda item: item[1][1])
+
+
+def watch_folder(
+    dir: Path,
+    output_dir: Path,
+    interval: float = 1.0,
+    settle_time: float = 1.0,
+    thresh: Optional[float] = None,
+    multiple_lines: bool = False,
+    decimation_tolerance: Optional[float] = None,
+    reduction_tolerance: Optional[float] = None,
+    output_format: str = "svg",
+) -> None:
+    """Vectorize the images of a folder as they arrive, until interrupted.
+    The folder is polled every interval seconds (see FolderWatcher), and the new or changed images
+    are vectorized one after the other with the same predictor, loaded once, and the jitted
+    functions, compiled at startup on a small drawing. The images whose output is newer than the
+    image are considered already vectorized. Each output is written to a temporary file and renamed
+    once complete, so that the readers of the output folder never see a partial file. An image that
+    fails, including when its output cannot be written, is only tried again if it changes.
+
+    Args:
+        dir (Path): The folder to watch.
+        output_dir (Path): The folder where to save the outputs.
+        interval (float, optional): The time between two scans of the folder, in seconds. Defaults
+            to 1.0.
+        settle_time (float, optional): How long an image should stay unchanged before it is
+            vectorized, in seconds. Defaults to 1.0.
+        thresh (Optional[float], optional): To set the threshold. Defaults to None.
+        multiple_lines (bool, optional): Wheter the input images contain multiple lines. Defaults
+            to False.
+        decimation_tolerance (Optional[float], optional): If set, the degree 2 chains of the medial
+            axis are simplified with this tolerance in pixels. Defaults to None.
+        reduction_tolerance (Optional[float], optional): If set, consecutive Bezier curves are
+            merged when the merged curve stays within this tolerance in pixels. Defaults to None.
+        output_format (str, optional): The output format, "svg", "svgz", "npz" or "bin". Defaults
+            to "svg".
+    """
+    suffix = get_output_suffix(output_format)
+    intersection_predictor = get_predictor()
+    print("⏳ Warming up...")
+    try:
+        vectorize_bytes(make_warm_up_image(), intersection_predictor)
+    except Exception as e:
+        print(f"⚠️  The warm up failed: {e}")
+    watcher = FolderWatcher(dir, settle_time=settle_time)
+
+    for image_path, signature in watcher.scan().items():
+        output_path = output_dir / image_path.with_suffix(suffix).name
+        if output_path.exists() and output_path.stat().st_mtime_ns >= signature[1]:
+            watcher.mark_processed(image_path, signature)
+
+    print(f"👀 Watching {dir} for new images...")
+    try:
+        while True:
+            for image_path, _ in watcher.poll():
+                output_path = output_dir / image_path.with_suffix(suffix).name
+                tmp_path = output_dir / f".{output_path.stem}.{os.getpid()}.tmp{suffix}"
+                result = _vectorize(
+                    image_path,
+                    tmp_path,
+                    intersection_predictor,
+                    thresh,
+                    multiple_lines,
+                    verbose=False,
+                    decimation_tolerance=decimation_tolerance,
+                    reduction_tolerance=reduction_tolerance,
+                    output_format=output_format,
+                )
+                success, error = result.success, result.error
+                if success:
+                    try:
+                        os.replace(tmp_path, output_path)
+                    except OSError as e:
+                        # E.g. a full disk or a removed output folder, the next images may succeed
+                        success, error = False, f"{type(e).__name__}: {e}"
+                if success:
+                    print(f"✅ Successfully vectorized: {image_path} ({result.elapsed:.1f}s)")
+                else:
+                    try:
+                        tmp_path.unlink(missing_ok=True)
+                    except OSError:
+                        pass
+                    print(f"❌ Failed to vectorize: {image_path} ({error})")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,6 @@
+# The available output formats and the extension of their files, see SLDvec.utils.export. They are
+# kept out of the SLDvec package, whose import loads torch, timm and numba, so that the CLI can
+# declare its options without it
+OUTPUT_SUFFIXES = {"svg": ".svg", "svgz": ".svgz", "npz": ".npz", "bin": ".sldv"}
+
+__all__ = ["OUTPUT_SUFFIXES"]